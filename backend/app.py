@@ -1,115 +1,223 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, send_file, stream_with_context
 from flask_cors import CORS
-import bcrypt
-from db import get_connection
-from datetime import datetime
+import base64
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import zlib
+import auth
+import db
+import events
+import jobs
+import metrics
+import migrate
+import passwords
+import serialization
+from cache import TTLCache, Generations
+from stats import dashboard_stats
+from search_index import employee_index, ensure_loaded, fulltext_query
+from leave_index import leave_index, ensure_leave_index
+from db import get_db, PoolExhausted
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from werkzeug.test import EnvironBuilder
 
 app = Flask(__name__)
-CORS(app, resources={r"/*": {"origins": "*"}}, methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"])
+CORS(app, resources={r"/*": {"origins": "*"}}, methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"])
+db.init_app(app)
+metrics.init_app(app)
+serialization.init_app(app)
+events.init_app(app)
+jobs.init_app(app)
 
 @app.after_request
 def after_request(response):
     response.headers.add("Access-Control-Allow-Origin", "*")
-    response.headers.add("Access-Control-Allow-Headers", "Content-Type,Authorization")
+    response.headers.add("Access-Control-Allow-Headers", "Content-Type,Authorization,If-Match,If-None-Match")
+    response.headers.add("Access-Control-Expose-Headers", "ETag")
     response.headers.add("Access-Control-Allow-Methods", "GET,POST,PUT,PATCH,DELETE,OPTIONS")
     return response
 
 
+@app.errorhandler(PoolExhausted)
+def pool_exhausted(e):
+    print("DB pool exhausted:", e)
+    return jsonify({"error": "Server busy, try again"}), 503
+
+
+@app.errorhandler(passwords.HashPoolSaturated)
+def hash_pool_saturated(e):
+    return jsonify({"status": "fail", "message": "Too many login attempts in progress, try again"}), 503, {"Retry-After": "1"}
+
+
+@app.get("/pool/stats")
+def pool_stats():
+    return jsonify({**db.get_pool().stats(), "hash_pool": passwords.get_hash_pool().stats()})
+
+
+def rehash_password(store, username, password):
+    # stored cost differs from BCRYPT_ROUNDS: upgrade it now that we have the plaintext
+    try:
+        new_hash = passwords.hash_password(password)
+    except passwords.HashPoolSaturated:
+        return  # not urgent; the next login will try again
+    store.execute("UPDATE users SET password=%s WHERE username=%s", (new_hash.decode("utf-8"), username))
+    store.commit()
+
+
+@app.get("/metrics")
+def metrics_view():
+    pool = db.get_pool().stats()
+    gauges = [
+        ("db_pool_open_connections", "Open pooled connections", pool["open"]),
+        ("db_pool_in_use_connections", "Connections checked out", pool["in_use"]),
+        ("db_pool_wait_seconds_max", "Longest wait for a connection", pool["wait_max_ms"] / 1000),
+        ("db_pool_exhausted_total", "Checkouts that timed out", pool["exhausted"]),
+        ("cache_master_data_hits_total", "Master-data cache hits", master_cache.hits),
+        ("cache_master_data_misses_total", "Master-data cache misses", master_cache.misses),
+    ]
+    return app.response_class(metrics.registry.render(gauges), mimetype="text/plain; version=0.0.4")
+
+
+@app.get("/metrics/slow-queries")
+def slow_queries_view():
+    return jsonify(metrics.registry.recent_slow())
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    return jsonify({
+        "master_data": master_cache.stats(),
+        "employee_counts": employee_count_cache.stats(),
+        "profiles": auth.profile_cache.stats(),
+    })
+
+
+@app.get("/events")
+def event_stream():
+    # Change feed as Server-Sent Events; ?entity=employee,leave narrows it.
+    # This holds a thread per subscriber for the life of the page, so it is
+    # off under gunicorn (EVENTS_THREADED=0) and /events is routed to asgi.py,
+    # which streams it from the event loop.
+    if not events.EVENTS_THREADED:
+        return jsonify({"error": "The change feed is served by the ASGI server (uvicorn asgi:application)"}), 503
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    entities = events.entity_filter(request.args.get("entity"))
+    return Response(events.stream(last_event_id, entities), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.get("/events/stats")
+def event_stats():
+    return jsonify(events.bus.stats())
+
+
 @app.post("/login")
 def login():
     data = request.get_json()
     username = data.get("username")
     password = data.get("password").encode("utf-8")
 
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute("SELECT password, full_name, email, phone FROM users WHERE username=%s", (username,))
-    row = cur.fetchone()
+    store = get_db()
+    row = store.fetch_one("SELECT password, full_name, email, phone FROM users WHERE username=%s", (username,))
 
     if not row:
         return jsonify({"status": "fail"}), 401
 
-    stored_hash = row[0].encode("utf-8")
+    stored_hash = row["password"].encode("utf-8")
+
+    if passwords.check_password(password, stored_hash):
+        if passwords.needs_rehash(stored_hash):
+            rehash_password(store, username, password)
 
-    if bcrypt.checkpw(password, stored_hash):
-        # For demo: return username as token. Replace with JWT later.
-        token = username
+        user = {
+            "username": username,
+            "full_name": row["full_name"],
+            "email": row["email"],
+            "phone": row["phone"],
+        }
+        auth.store_profile(user)
+        token = auth.issue_token(user)
         return jsonify({"status": "success", "token": token})
     else:
         return jsonify({"status": "fail"}), 401
 
 @app.get("/me")
 def me():
-    # Expect header: Authorization: Bearer <token>
-    auth_header = request.headers.get("Authorization", "")
-    if not auth_header.startswith("Bearer "):
-        return jsonify({"status": "fail", "message": "Missing token"}), 401
-
-    token = auth_header.split(" ", 1)[1]
-    # For demo token == username
-    username = token
-
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT username, full_name, email, phone FROM users WHERE username=%s", (username,))
-    row = cur.fetchone()
+    claims = auth.request_claims()
+    if claims is None:
+        return jsonify({"status": "fail", "message": "Missing or invalid token"}), 401
+
+    cache_generations.check(get_db)
+    user = auth.cached_profile(claims)
+    if user is None:
+        user = get_db().fetch_one(
+            "SELECT username, full_name, email, phone FROM users WHERE username=%s", (claims["username"],)
+        )
+        if not user:
+            return jsonify({"status": "fail", "message": "User not found"}), 404
 
-    if not row:
-        return jsonify({"status": "fail", "message": "User not found"}), 404
-
-    user = {
-        "username": row[0],
-        "full_name": row[1],
-        "email": row[2],
-        "phone": row[3],
-    }
+        auth.store_profile(user)
     return jsonify({"status": "success", "user": user})
 
 @app.put("/profile/update")
 def update_profile():
-    auth_header = request.headers.get("Authorization", "")
-    if not auth_header.startswith("Bearer "):
-        return jsonify({"status": "fail", "message": "Missing token"}), 401
+    claims = auth.request_claims()
+    if claims is None:
+        return jsonify({"status": "fail", "message": "Missing or invalid token"}), 401
 
-    token = auth_header.split(" ", 1)[1]
-    username = token  # demo token = username
+    username = claims["username"]
 
     data = request.get_json()
     full_name = data.get("full_name")
     email = data.get("email")
     phone = data.get("phone")
 
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute("""
+    store = get_db()
+    store.execute("""
         UPDATE users 
         SET full_name=%s, email=%s, phone=%s
         WHERE username=%s
     """, (full_name, email, phone, username))
+    store.commit()
+
+    user = {"username": username, "full_name": full_name, "email": email, "phone": phone}
+    auth.profile_changed(user)
+    cache_generations.bump(store, "profiles")
 
-    conn.commit()
+    # the old token's claims are now stale; hand back a fresh one
+    return jsonify({"status": "success", "message": "Profile updated successfully", "token": auth.issue_token(user)})
 
-    return jsonify({"status": "success", "message": "Profile updated successfully"})
+
+def wants_async():
+    # ?async=1 on the heavy endpoints: queue a job and answer 202 right away
+    return request.args.get("async") in ("1", "true")
+
+
+def job_accepted(job_id):
+    response = jsonify({"job_id": job_id, "status": "queued", "status_url": f"/jobs/{job_id}"})
+    response.status_code = 202
+    response.headers["Location"] = f"/jobs/{job_id}"
+    return response
 
 
 @app.get("/dashboard/stats")
-def dashboard_stats():
-    data = {
-        "total_users": 1200,
-        "today_sales": 34,
-        "total_revenue": 98000,
-        "pending_tasks": 12,
-        "monthly_sales": [5000, 7000, 9000, 7500, 8500, 10000, 11000],
-        "users_per_month": [50, 80, 120, 90, 140, 160, 200],
-        "revenue_split": [
-            {"name": "Product A", "value": 40000},
-            {"name": "Product B", "value": 30000},
-            {"name": "Product C", "value": 28000}
-        ]
-    }
-    return jsonify(data)
+def dashboard_stats_view():
+    refresh = request.args.get("refresh") in ("1", "true")
+    if refresh and wants_async():
+        return job_accepted(jobs.submit("dashboard.refresh"))
+    return jsonify(dashboard_stats.snapshot(get_db(), refresh=refresh))
+
+
+@jobs.task("dashboard.refresh")
+def refresh_dashboard_job(job):
+    # recomputes the copy in the process running the job; other workers
+    # catch up on their own max-age
+    return dashboard_stats.snapshot(get_db(), refresh=True)
 
 # @app.get("/employees")
 # def get_employees():
@@ -154,96 +262,428 @@ def dashboard_stats():
 #         print("Pagination error:", e)
 #         return jsonify({"error": "Server error"}), 500
 
-@app.get("/employees")
-def get_employees():
-    try:
-        page = int(request.args.get("page", 1))
-        limit = int(request.args.get("limit", 10))
-        offset = (page - 1) * limit
+EMPLOYEE_COLUMNS = "emp_id, emp_name, emp_email, emp_phone, emp_designation, created_at"
+EMPLOYEE_SORT_COLUMNS = {"emp_id", "emp_name", "emp_email", "emp_phone", "emp_designation", "created_at"}
+EMPLOYEE_FULLTEXT = "MATCH(emp_name, emp_email, emp_designation)"
+SEARCH_MODES = ("like", "fulltext", "ngram")
 
-        # new: get search params
-        q = request.args.get("q", "").strip()  # general search string
-        # Or you can use specific filters: name, email, designation
-        name = request.args.get("name", "").strip()
-        email = request.args.get("email", "").strip()
-        designation = request.args.get("designation", "").strip()
+# Each gunicorn worker holds its own copy of the caches below; a write also
+# bumps the cache's row in cache_generations, so the other workers drop
+# theirs within CACHE_SYNC_INTERVAL seconds.
+CACHE_SYNC_INTERVAL = float(os.environ.get("CACHE_SYNC_INTERVAL", 1))
+cache_generations = Generations(interval=CACHE_SYNC_INTERVAL)
+cache_generations.watch("profiles", auth.profiles_changed)
 
-        conn = get_connection()
-        cur = conn.cursor(dictionary=True)
+# COUNT(*) results keyed by filter, so paging through a listing doesn't re-count every time
+employee_count_cache = TTLCache(ttl=30)
+cache_generations.watch("employee_counts", lambda changed_at: employee_count_cache.clear())
+# every employee write bumps it, so it also covers the search index
+cache_generations.watch("employee_counts", lambda changed_at: employee_index.invalidate())
 
-        # Build WHERE clause parts
-        where_clauses = []
-        params = []
 
-        if q:
-            where_clauses.append(
-                "(emp_name LIKE %s OR emp_email LIKE %s OR emp_designation LIKE %s)"
-            )
-            likeq = f"%{q}%"
-            params.extend([likeq, likeq, likeq])
+def employee_counts_changed(store):
+    employee_count_cache.clear()
+    cache_generations.bump(store, "employee_counts")
 
-        else:
-            if name:
-                where_clauses.append("emp_name LIKE %s")
-                params.append(f"%{name}%")
-            if email:
-                where_clauses.append("emp_email LIKE %s")
-                params.append(f"%{email}%")
-            if designation:
-                where_clauses.append("emp_designation LIKE %s")
-                params.append(f"%{designation}%")
+
+# leave_index: another worker's leave write marks this worker's copy stale
+cache_generations.watch("leaves", lambda changed_at: leave_index.mark_stale())
+
+
+def leaves_changed(store):
+    cache_generations.bump(store, "leaves")
+
+
+def employee_filters(args):
+    # Build WHERE clause parts from q / name / email / designation
+    where_clauses = []
+    params = []
+
+    q = args.get("q", "").strip()  # general search string
+    name = args.get("name", "").strip()
+    email = args.get("email", "").strip()
+    designation = args.get("designation", "").strip()
+
+    if q and args.get("search_mode") == "fulltext":
+        where_clauses.append(f"{EMPLOYEE_FULLTEXT} AGAINST (%s IN BOOLEAN MODE)")
+        params.append(fulltext_query(q))
+
+    elif q:
+        where_clauses.append(
+            "(emp_name LIKE %s OR emp_email LIKE %s OR emp_designation LIKE %s)"
+        )
+        likeq = f"%{q}%"
+        params.extend([likeq, likeq, likeq])
+
+    else:
+        if name:
+            where_clauses.append("emp_name LIKE %s")
+            params.append(f"%{name}%")
+        if email:
+            where_clauses.append("emp_email LIKE %s")
+            params.append(f"%{email}%")
+        if designation:
+            where_clauses.append("emp_designation LIKE %s")
+            params.append(f"%{designation}%")
+
+    return where_clauses, params
+
+
+def employee_page_sql(where_clauses, sort_by, direction, offset=False):
+    # SELECT for one /employees page; migrate.py verifies the same text
+    where_sql = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
+    return f"""
+    SELECT {EMPLOYEE_COLUMNS}
+    FROM employee_master
+    {where_sql}
+    ORDER BY {sort_by} {direction.upper()}, emp_id {direction.upper()}
+    LIMIT %s{" OFFSET %s" if offset else ""}
+    """
+
+
+def employee_sort(args):
+    sort_by = args.get("sort_by", "emp_id")
+    order = args.get("order", "desc").lower()
+
+    # Whitelist columns:
+    if sort_by not in EMPLOYEE_SORT_COLUMNS:
+        sort_by = "emp_id"
+    if order not in ("asc", "desc"):
+        order = "desc"
+    return sort_by, order
+
+
+def encode_cursor(row, sort_by, order):
+    # the sort travels with the position: a cursor only means something in
+    # the ordering it was taken from
+    value = row[sort_by]
+    if isinstance(value, datetime):
+        value = value.isoformat(sep=" ")
+    raw = json.dumps([sort_by, order, value, row["emp_id"]], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token, sort_by, order):
+    # ValueError for a token that doesn't decode or was issued for another
+    # sort_by / order
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        cursor_sort, cursor_order, value, emp_id = json.loads(raw)
+        emp_id = int(emp_id)
+    except (ValueError, TypeError):
+        raise ValueError("not a cursor from this listing")
+    if (cursor_sort, cursor_order) != (sort_by, order):
+        raise ValueError(f"cursor was issued for sort_by={cursor_sort}&order={cursor_order}")
+    return value, emp_id
+
+
+def keyset_condition(sort_by, direction, value, emp_id):
+    # Rows strictly after (value, emp_id) when walking `sort_by` in `direction`.
+    # MariaDB sorts NULLs first, so a NULL sort value is the lowest key.
+    if sort_by == "emp_id":
+        op = "<" if direction == "desc" else ">"
+        return f"emp_id {op} %s", [emp_id]
+
+    if direction == "desc":
+        if value is None:
+            return f"({sort_by} IS NULL AND emp_id < %s)", [emp_id]
+        return (
+            f"({sort_by} < %s OR {sort_by} IS NULL OR ({sort_by} = %s AND emp_id < %s))",
+            [value, value, emp_id],
+        )
+    if value is None:
+        return f"({sort_by} IS NOT NULL OR ({sort_by} IS NULL AND emp_id > %s))", [emp_id]
+    return f"({sort_by} > %s OR ({sort_by} = %s AND emp_id > %s))", [value, value, emp_id]
+
+
+def listing(rows):
+    # ?format=columns sends column names once plus arrays of values
+    if request.args.get("format") == "columns":
+        return serialization.columnar(rows)
+    return rows
+
+
+def employee_total(store, where_sql, params, mode):
+    if mode == "none":
+        return None
+
+    if mode == "approx" and not where_sql:
+        total = store.approx_count("employee_master")
+        if total is not None:
+            return total
+
+    key = (where_sql, tuple(params))
+    if mode in ("cached", "approx"):
+        cache_generations.check(lambda: store)
+        total = employee_count_cache.get(key)
+        if total is not None:
+            return total
+
+    total = store.fetch_value(f"SELECT COUNT(*) FROM employee_master {where_sql}", params)
+    employee_count_cache.set(key, total)
+    return total
+
+
+def fulltext_unavailable(store):
+    # MATCH ... AGAINST needs MariaDB's FULLTEXT index; search_mode=ngram works everywhere
+    return jsonify({"error": f"search_mode=fulltext is not available on the {store.backend.name} backend"}), 400
+
+
+def search_employees_ranked(store, q, mode, page, limit):
+    # Relevance-ordered page of search hits; returns (rows, total).
+    offset = (page - 1) * limit
+
+    if mode == "ngram":
+        cache_generations.check(lambda: store)
+        hits = ensure_loaded(store).search(q)
+        page_hits = hits[offset:offset + limit]
+        if not page_hits:
+            return [], len(hits)
+        ids = [emp_id for emp_id, _ in page_hits]
+        placeholders = ", ".join(["%s"] * len(ids))
+        rows = store.fetch_all(f"""
+          SELECT {EMPLOYEE_COLUMNS}
+          FROM employee_master
+          WHERE emp_id IN ({placeholders})
+        """, ids)
+        by_id = {row["emp_id"]: row for row in rows}
+        return [by_id[i] for i in ids if i in by_id], len(hits)
+
+    # fulltext
+    ft = fulltext_query(q)
+    total = store.fetch_value(
+        f"SELECT COUNT(*) FROM employee_master WHERE {EMPLOYEE_FULLTEXT} AGAINST (%s IN BOOLEAN MODE)", [ft]
+    )
+    rows = store.fetch_all(f"""
+      SELECT {EMPLOYEE_COLUMNS}
+      FROM employee_master
+      WHERE {EMPLOYEE_FULLTEXT} AGAINST (%s IN BOOLEAN MODE)
+      ORDER BY {EMPLOYEE_FULLTEXT} AGAINST (%s IN BOOLEAN MODE) DESC, emp_id DESC
+      LIMIT %s OFFSET %s
+    """, [ft, ft, limit, offset])
+    return rows, total
+
+
+@app.get("/employees")
+def get_employees():
+    try:
+        limit = int(request.args.get("limit", 10))
+        after = request.args.get("after")
+        before = request.args.get("before")
+        # keyset mode when a cursor is given or explicitly requested
+        keyset = bool(after or before) or request.args.get("paginate") == "cursor"
+
+        q = request.args.get("q", "").strip()
+        search_mode = request.args.get("search_mode", "like")
+        if search_mode not in SEARCH_MODES:
+            return jsonify({"error": f"search_mode must be one of {', '.join(SEARCH_MODES)}"}), 400
+        store = get_db()
+        if q and search_mode == "fulltext" and not store.supports_fulltext:
+            return fulltext_unavailable(store)
+
+        # fulltext / ngram searches rank by relevance unless another sort is asked for;
+        # the ngram index can only rank, so it always does
+        ranked = bool(q) and not keyset and (
+            search_mode == "ngram"
+            or (search_mode == "fulltext" and request.args.get("sort_by", "relevance") == "relevance")
+        )
+        if ranked:
+            page = int(request.args.get("page", 1))
+            rows, total = search_employees_ranked(store, q, search_mode, page, limit)
+            return jsonify({
+                "data": listing(rows),
+                "total": total,
+                "page": page,
+                "limit": limit
+            })
+        if q and search_mode == "ngram":
+            return jsonify({"error": "search_mode=ngram does not support cursor pagination"}), 400
+
+        where_clauses, params = employee_filters(request.args)
+        sort_by, order = employee_sort(request.args)
+
+        count_mode = request.args.get("count", "none" if keyset else "exact")
+        if count_mode not in ("exact", "cached", "approx", "none"):
+            count_mode = "exact"
 
         where_sql = ""
         if where_clauses:
             where_sql = "WHERE " + " AND ".join(where_clauses)
 
-        # Total count query
-        count_sql = f"SELECT COUNT(*) AS total FROM employee_master {where_sql}"
-        cur.execute(count_sql, params)
-        total = cur.fetchone()["total"]
-
-        # Data fetch with limit & offset
-        # sql = f"""
-        #   SELECT emp_id, emp_name, emp_email, emp_phone, emp_designation, created_at
-        #   FROM employee_master
-        #   {where_sql}
-        #   ORDER BY emp_id DESC
-        #   LIMIT %s OFFSET %s
-        # """
-        # After you compute where_sql & params and before building final SQL:
-        sort_by = request.args.get("sort_by", "emp_id")
-        order = request.args.get("order", "desc").lower()
-
-        # Whitelist columns:
-        allowed_cols = {"emp_id", "emp_name", "emp_email", "emp_phone", "emp_designation", "created_at"}
-        if sort_by not in allowed_cols:
-            sort_by = "emp_id"
-        if order not in ("asc", "desc"):
-            order = "desc"
-
-        sql = f"""
-        SELECT emp_id, emp_name, emp_email, emp_phone, emp_designation, created_at
-        FROM employee_master
-        {where_sql}
-        ORDER BY {sort_by} {order.upper()}
-        LIMIT %s OFFSET %s
-        """
-
-        params_for_data = params + [limit, offset]
-        cur.execute(sql, params_for_data)
-        rows = cur.fetchall()
+        total = employee_total(store, where_sql, params, count_mode)
+
+        if not keyset:
+            page = int(request.args.get("page", 1))
+            offset = (page - 1) * limit
+
+            sql = employee_page_sql(where_clauses, sort_by, order, offset=True)
+            rows = store.fetch_all(sql, params + [limit, offset])
+
+            return jsonify({
+                "data": listing(rows),
+                "total": total,
+                "page": page,
+                "limit": limit
+            })
+
+        # Keyset: seek past the cursor row via the (sort_by, emp_id) index
+        # instead of reading and discarding OFFSET rows.
+        try:
+            cursor = decode_cursor(before or after, sort_by, order) if (before or after) else None
+        except ValueError as e:
+            return jsonify({"error": f"Invalid cursor: {e}"}), 400
+
+        # walking backwards (`before`) reads in the opposite order, then flips
+        direction = order
+        if before:
+            direction = "asc" if order == "desc" else "desc"
+
+        seek_clauses = list(where_clauses)
+        seek_params = list(params)
+        if cursor:
+            cond, cond_params = keyset_condition(sort_by, direction, *cursor)
+            seek_clauses.append(cond)
+            seek_params.extend(cond_params)
+        # one extra row tells us whether another page exists
+        rows = store.fetch_all(employee_page_sql(seek_clauses, sort_by, direction), seek_params + [limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if before:
+            rows.reverse()
+
+        next_cursor = prev_cursor = None
+        if rows:
+            if before:
+                next_cursor = encode_cursor(rows[-1], sort_by, order)
+                prev_cursor = encode_cursor(rows[0], sort_by, order) if has_more else None
+            else:
+                next_cursor = encode_cursor(rows[-1], sort_by, order) if has_more else None
+                prev_cursor = encode_cursor(rows[0], sort_by, order) if after else None
 
         return jsonify({
-            "data": rows,
+            "data": listing(rows),
             "total": total,
-            "page": page,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
         })
 
     except Exception as e:
         print("Error in /employees:", e)
         return jsonify({"error": "Server error"}), 500
 
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FIELDS = ["emp_id", "emp_name", "emp_email", "emp_phone", "emp_designation", "created_at"]
+
+
+def encode_csv(batches):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(EXPORT_FIELDS)
+    for batch in batches:
+        writer.writerows(batch)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+def encode_ndjson(batches):
+    for batch in batches:
+        lines = [app.json.dumps(dict(zip(EXPORT_FIELDS, row))) for row in batch]
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def gzip_stream(chunks):
+    z = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        out = z.compress(chunk)
+        if out:
+            yield out
+    yield z.flush()
+
+
+def export_body(store, args, fmt, batch_size, compress, wrap_batches=None):
+    where_clauses, params = employee_filters(args)
+    sort_by, order = employee_sort(args)
+    where_sql = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
+    sql = f"""
+    SELECT {EMPLOYEE_COLUMNS}
+    FROM employee_master
+    {where_sql}
+    ORDER BY {sort_by} {order.upper()}, emp_id {order.upper()}
+    """
+
+    batches = store.stream(sql, params, batch_size)
+    if wrap_batches is not None:
+        batches = wrap_batches(batches)
+    body = encode_csv(batches) if fmt == "csv" else encode_ndjson(batches)
+    if compress:
+        body = gzip_stream(body)
+    return body
+
+
+@app.get("/employees/export")
+def export_employees():
+    fmt = request.args.get("format", "csv").lower()
+    if fmt not in ("csv", "ndjson"):
+        return jsonify({"error": "format must be csv or ndjson"}), 400
+    try:
+        batch_size = max(1, min(int(request.args.get("batch_size", EXPORT_BATCH_SIZE)), 10000))
+    except ValueError:
+        return jsonify({"error": "batch_size must be an integer"}), 400
+    compress = request.args.get("gzip") in ("1", "true")
+
+    store = get_db()
+    if request.args.get("q", "").strip() and request.args.get("search_mode") == "fulltext" \
+            and not store.supports_fulltext:
+        return fulltext_unavailable(store)
+
+    if wants_async():
+        # written to a file; fetched from /jobs/<id>/artifact when done
+        return job_accepted(jobs.submit("employees.export", {
+            "args": request.args.to_dict(), "fmt": fmt, "batch_size": batch_size, "compress": compress,
+        }))
+
+    body = export_body(store, request.args, fmt, batch_size, compress)
+    if fmt == "csv":
+        mimetype, filename = "text/csv", "employees_export.csv"
+    else:
+        mimetype, filename = "application/x-ndjson", "employees_export.ndjson"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+
+    # stream_with_context keeps the request (and its pooled connection) alive
+    # until the generator is exhausted
+    return Response(stream_with_context(body), mimetype=mimetype, headers=headers)
+
+
+@jobs.task("employees.export")
+def export_employees_job(job, args, fmt="csv", batch_size=EXPORT_BATCH_SIZE, compress=False):
+    if fmt not in ("csv", "ndjson"):
+        raise jobs.JobFailed("format must be csv or ndjson")
+    if not isinstance(args, dict):
+        raise jobs.JobFailed("args must be an object of query parameters")
+    rows = 0
+
+    def counted(batches):
+        nonlocal rows
+        for batch in batches:
+            yield batch
+            rows += len(batch)
+            job.progress(message=f"{rows} rows written")
+
+    filename = "employees_export.csv" if fmt == "csv" else "employees_export.ndjson"
+    if compress:
+        filename += ".gz"
+    with open(job.artifact_path(filename), "wb") as f:
+        for chunk in export_body(get_db(), args, fmt, batch_size, compress, counted):
+            f.write(chunk)
+    return {"rows": rows, "format": fmt, "filename": filename}
+
+
 @app.post("/employees")
 def add_employee():
     data = request.get_json()
@@ -252,82 +692,379 @@ def add_employee():
     phone = data.get("emp_phone")
     desig = data.get("emp_designation")
 
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("""
+    store = get_db()
+    store.execute("""
         INSERT INTO employee_master (emp_name, emp_email, emp_phone, emp_designation)
         VALUES (%s, %s, %s, %s)
     """, [name, email, phone, desig])
-    conn.commit()
+    store.commit()
+    employee_counts_changed(store)
+    dashboard_stats.employee_added()
+    employee_index.add(store.lastrowid, data)
+    events.publish("employee", "created", fetch_employee(store, store.lastrowid))
 
     return jsonify({"status": "success"})
 
+BULK_BATCH_SIZE = 500
+BULK_MAX_ERRORS = 1000  # cap the size of the error report
+BULK_FIELDS = ("emp_name", "emp_email", "emp_phone", "emp_designation")
+EMAIL_RE = re.compile(r"^[^\s@]+@[^\s@]+\.[^\s@]+$")
+
+
+def validate_employee(row):
+    # same rules as the form in EmployeeMaster.jsx
+    errors = {}
+    if not isinstance(row, dict):
+        return {"row": "Expected an object"}
+    for field in BULK_FIELDS:
+        value = row.get(field)
+        if value is None or not str(value).strip():
+            errors[field] = f"{field} is required"
+    email = str(row.get("emp_email") or "").strip()
+    if email and not EMAIL_RE.match(email):
+        errors["emp_email"] = "Invalid email"
+    return errors
+
+
+def bulk_source():
+    # Rows are parsed lazily so an uploaded CSV is never held in memory whole
+    if "file" in request.files:
+        stream = io.TextIOWrapper(request.files["file"].stream, encoding="utf-8-sig", newline="")
+        return csv.DictReader(stream)
+    if request.mimetype == "text/csv":
+        stream = io.TextIOWrapper(request.stream, encoding="utf-8-sig", newline="")
+        return csv.DictReader(stream)
+    data = bulk_json()
+    return None if data is None else iter(data)
+
+
+def bulk_json():
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get("employees")
+    return data if isinstance(data, list) else None
+
+
+def bulk_job_params():
+    # like bulk_source, but an uploaded CSV is saved for the worker to read
+    if "file" in request.files or request.mimetype == "text/csv":
+        path = jobs.job_queue.upload_path(".csv")
+        if "file" in request.files:
+            request.files["file"].save(path)
+        else:
+            with open(path, "wb") as f:
+                shutil.copyfileobj(request.stream, f)
+        return {"csv_path": path}
+    data = bulk_json()
+    return None if data is None else {"employees": data}
+
+
+def insert_employee_batch(store, batch, report):
+    # batch: [(row_number, params)], one transaction per batch
+    sql = """
+        INSERT INTO employee_master (emp_name, emp_email, emp_phone, emp_designation)
+        VALUES (%s, %s, %s, %s)
+    """
+    try:
+        store.execute_many(sql, [params for _, params in batch])
+        store.commit()
+        report["inserted"] += len(batch)
+        return
+    except Exception:
+        store.rollback()
+
+    # something in the batch was rejected: retry row by row to report which
+    for row_number, params in batch:
+        try:
+            store.execute(sql, params)
+            store.commit()
+            report["inserted"] += 1
+        except Exception as e:
+            store.rollback()
+            add_bulk_error(report, row_number, {"row": str(e)})
+
+
+def add_bulk_error(report, row_number, errors):
+    report["failed"] += 1
+    if len(report["errors"]) < BULK_MAX_ERRORS:
+        report["errors"].append({"row": row_number, "errors": errors})
+
+
+def import_employees(store, rows, batch_size, on_batch=None):
+    report = {"inserted": 0, "failed": 0, "errors": []}
+    batch = []
+    try:
+        for row_number, row in enumerate(rows, start=1):
+            errors = validate_employee(row)
+            if errors:
+                add_bulk_error(report, row_number, errors)
+                continue
+            batch.append((row_number, [str(row[f]).strip() for f in BULK_FIELDS]))
+            if len(batch) >= batch_size:
+                insert_employee_batch(store, batch, report)
+                batch = []
+                if on_batch is not None:
+                    on_batch(report, row_number)
+        if batch:
+            insert_employee_batch(store, batch, report)
+    except (csv.Error, UnicodeDecodeError) as e:
+        report["error"] = f"Could not parse CSV: {e}"
+    finally:
+        if report["inserted"]:
+            employee_counts_changed(store)
+            dashboard_stats.employee_added(count=report["inserted"])
+            # ids of executemany rows aren't known; reload the index on next search
+            employee_index.invalidate()
+            # no ids either: subscribers reload their employee lists
+            events.publish("employee", "bulk_created", {"inserted": report["inserted"]})
+    return report
+
+
+@app.post("/employees/bulk")
+def bulk_add_employees():
+    try:
+        batch_size = max(1, min(int(request.args.get("batch_size", BULK_BATCH_SIZE)), 10000))
+    except ValueError:
+        return jsonify({"error": "batch_size must be an integer"}), 400
+
+    if wants_async():
+        params = bulk_job_params()
+        if params is None:
+            return jsonify({"error": "Send a JSON array of employees or a CSV file"}), 400
+        return job_accepted(jobs.submit("employees.bulk_import", {**params, "batch_size": batch_size}))
+
+    rows = bulk_source()
+    if rows is None:
+        return jsonify({"error": "Send a JSON array of employees or a CSV file"}), 400
+
+    report = import_employees(get_db(), rows, batch_size)
+    if "error" in report:
+        return jsonify(report), 400
+    status = 201 if report["inserted"] and not report["failed"] else 200
+    if not report["inserted"] and report["failed"]:
+        status = 400
+    return jsonify(report), status
+
+
+# one attempt: a retry would insert the batches that already went through again
+@jobs.task("employees.bulk_import", max_attempts=1)
+def bulk_import_job(job, employees=None, csv_path=None, batch_size=BULK_BATCH_SIZE):
+    if csv_path is None:
+        rows, total, f = iter(employees or []), len(employees or []), None
+    else:
+        uploads = os.path.realpath(jobs.job_queue.upload_dir)
+        if os.path.dirname(os.path.realpath(csv_path)) != uploads:
+            raise jobs.JobFailed("csv_path must be a file uploaded through /employees/bulk")
+        f = open(csv_path, encoding="utf-8-sig", newline="")
+        rows, total = csv.DictReader(f), None
+
+    def on_batch(report, row_number):
+        job.progress(row_number / total if total else None,
+                     f"{report['inserted']} inserted, {report['failed']} failed")
+
+    try:
+        return import_employees(get_db(), rows, batch_size, on_batch)
+    finally:
+        if f is not None:
+            f.close()
+            os.remove(csv_path)
+
+
+EMPLOYEE_EDITABLE = ("emp_name", "emp_email", "emp_phone", "emp_designation")
+
+
+# Optimistic concurrency: employee and leave rows carry a `version` that every
+# write bumps. It is served as the ETag, so a client sends it back in If-Match
+# and a write based on a stale read gets 412 instead of overwriting.
+def versioned(payload, version, status=200):
+    response = jsonify(payload)
+    response.status_code = status
+    response.set_etag(str(version))
+    return response
+
+
+def if_match_versions():
+    # versions named in If-Match, or None without a precondition. Weak tags
+    # count too: compress_response weakens the ETags it compresses.
+    if not request.if_match or request.if_match.star_tag:
+        return None
+    return {int(tag) for tag in request.if_match.as_set(include_weak=True) if tag.isdigit()}
+
+
+def version_conflict(current):
+    if current is None:
+        return jsonify({"message": "Not found"}), 404
+    payload = {"message": "Modified by someone else; reload and retry", "current": current}
+    return versioned(payload, current["version"], 412)
+
+
+def changed_columns(row, values):
+    # only the columns that differ, so a retried or no-op write touches nothing
+    return {col: value for col, value in values.items() if row[col] != value}
+
+
+def versioned_update(store, table, key_column, row, changes):
+    # One UPDATE guarded by the version that was read: a concurrent writer in
+    # between makes it match no row instead of being silently overwritten.
+    # Returns the new version, or None on conflict.
+    versions = if_match_versions()
+    if versions is not None and row["version"] not in versions:
+        return None
+    assignments = ", ".join(f"{col}=%s" for col in changes)
+    updated = store.execute(
+        f"UPDATE {table} SET {assignments}, version=version+1, updated_at=NOW() "
+        f"WHERE {key_column}=%s AND version=%s",
+        [*changes.values(), row[key_column], row["version"]],
+    )
+    if not updated:
+        store.rollback()
+        return None
+    store.commit()
+    return row["version"] + 1
+
+
+def versioned_delete(store, table, key_column, row):
+    # False when If-Match names a version other than the current one
+    versions = if_match_versions()
+    if versions is None:
+        store.execute(f"DELETE FROM {table} WHERE {key_column}=%s", [row[key_column]])
+    else:
+        if row["version"] not in versions:
+            return False
+        deleted = store.execute(f"DELETE FROM {table} WHERE {key_column}=%s AND version=%s",
+                                [row[key_column], row["version"]])
+        if not deleted:
+            store.rollback()
+            return False
+    store.commit()
+    return True
+
+
+def fetch_employee(store, emp_id):
+    return store.fetch_one("SELECT * FROM employee_master WHERE emp_id=%s", [emp_id])
+
+
 @app.get("/employees/<int:emp_id>")
 def get_single_employee(emp_id):
-    conn = get_connection()
-    cur = conn.cursor(dictionary=True)
-    cur.execute("SELECT * FROM employee_master WHERE emp_id=%s", [emp_id])
-    data = cur.fetchone()
-    return jsonify(data)
+    data = fetch_employee(get_db(), emp_id)
+    if data is None:
+        return jsonify({"message": "Employee not found"}), 404
+    return versioned(data, data["version"]).make_conditional(request)
+
+
+def write_employee(emp_id, partial):
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"message": "Expected a JSON object"}), 400
+    fields = [f for f in EMPLOYEE_EDITABLE if f in data]
+    if not partial and len(fields) < len(EMPLOYEE_EDITABLE):
+        missing = ", ".join(f for f in EMPLOYEE_EDITABLE if f not in data)
+        return jsonify({"message": f"Missing {missing}"}), 400
+
+    store = get_db()
+    row = fetch_employee(store, emp_id)
+    if row is None:
+        return jsonify({"message": "Employee not found"}), 404
+
+    changes = changed_columns(row, {f: data[f] for f in fields})
+    if not changes:
+        # already in the requested state (e.g. a retry of a write that went
+        # through): no UPDATE, no version bump, even if If-Match is now stale
+        return versioned({"status": "success", "changed": False}, row["version"])
+
+    version = versioned_update(store, "employee_master", "emp_id", row, changes)
+    if version is None:
+        return version_conflict(fetch_employee(store, emp_id))
+
+    employee_counts_changed(store)
+    employee_index.add(emp_id, {**row, **changes})
+    events.publish("employee", "updated", {**row, **changes, "version": version})
+    return versioned({"status": "success", "changed": True}, version)
 
 
 @app.put("/employees/<int:emp_id>")
 def update_employee(emp_id):
-    data = request.get_json()
+    return write_employee(emp_id, partial=False)
 
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("""
-        UPDATE employee_master
-        SET emp_name=%s, emp_email=%s, emp_phone=%s, emp_designation=%s
-        WHERE emp_id=%s
-    """, [
-        data["emp_name"],
-        data["emp_email"],
-        data["emp_phone"],
-        data["emp_designation"],
-        emp_id
-    ])
-    conn.commit()
 
-    return jsonify({"status": "success"})
+@app.patch("/employees/<int:emp_id>")
+def patch_employee(emp_id):
+    return write_employee(emp_id, partial=True)
+
 
 @app.delete("/employees/<int:emp_id>")
 def delete_employee(emp_id):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM employee_master WHERE emp_id=%s", [emp_id])
-    conn.commit()
+    store = get_db()
+    row = store.fetch_one("SELECT emp_id, created_at, version FROM employee_master WHERE emp_id=%s", [emp_id])
+    if row is None:
+        # already gone: a retried delete is a no-op
+        return jsonify({"status": "deleted"})
+    if not versioned_delete(store, "employee_master", "emp_id", row):
+        return version_conflict(fetch_employee(store, emp_id))
+    employee_counts_changed(store)
+    # the cascade also removed the employee's leaves: recount everything
+    dashboard_stats.mark_stale()
+    employee_index.remove(emp_id)
+    leave_index.remove_employee(emp_id)
+    leaves_changed(store)
+    events.publish("employee", "deleted", {"emp_id": emp_id})
     return jsonify({"status": "deleted"})
 
 
+MASTER_CACHE_TTL = 300
+
+# Designation / department lists and single rows, keyed ("designations", id-or-None).
+# Entries hold the serialised body and its ETag; write handlers drop the namespace.
+master_cache = TTLCache(ttl=MASTER_CACHE_TTL, maxsize=512)
+for namespace in ("designations", "departments"):
+    cache_generations.watch(namespace, lambda changed_at, namespace=namespace: master_cache.drop(namespace))
+
+
+def master_data_changed(store, namespace):
+    master_cache.drop(namespace)
+    cache_generations.bump(store, namespace)
+
+
+def cached_json(key, load):
+    # load() returns the payload, or None for 404 (not cached)
+    cache_generations.check(get_db)
+    entry = master_cache.get(key)
+    if entry is None:
+        payload = load()
+        if payload is None:
+            return jsonify({"message": "Not found"}), 404
+        body = app.json.dumps(payload)
+        entry = (body, hashlib.sha1(body.encode("utf-8")).hexdigest())
+        master_cache.set(key, entry)
+
+    body, etag = entry
+    response = app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"  # always revalidate, usually to a 304
+    return response.make_conditional(request)
+
+
 # --- GET all designations ---
 @app.get("/designations")
 def get_designations():
-    conn = get_connection()
-    cur = conn.cursor(dictionary=True)
-    cur.execute("""
-      SELECT desig_id, title, description, created_at
-      FROM designation_master
-      ORDER BY desig_id DESC
-    """)
-    rows = cur.fetchall()
-    return jsonify(rows)
+    def load():
+        return get_db().fetch_all("""
+          SELECT desig_id, title, description, created_at
+          FROM designation_master
+          ORDER BY desig_id DESC
+        """)
+    return cached_json(("designations", None), load)
 
 # --- GET single designation by id ---
 @app.get("/designations/<int:desig_id>")
 def get_single_designation(desig_id):
-    conn = get_connection()
-    cur = conn.cursor(dictionary=True)
-    cur.execute("""
-      SELECT desig_id, title, description, created_at
-      FROM designation_master
-      WHERE desig_id = %s
-    """, (desig_id,))
-    row = cur.fetchone()
-    if not row:
-        return jsonify({"message": "Not found"}), 404
-    return jsonify(row)
+    def load():
+        return get_db().fetch_one("""
+          SELECT desig_id, title, description, created_at
+          FROM designation_master
+          WHERE desig_id = %s
+        """, (desig_id,))
+    return cached_json(("designations", desig_id), load)
 
 # --- CREATE new designation ---
 @app.post("/designations")
@@ -339,17 +1076,21 @@ def add_designation():
     if not title:
         return jsonify({"message": "Title is required"}), 400
 
-    conn = get_connection()
-    cur = conn.cursor()
+    store = get_db()
     try:
-        cur.execute("""
+        store.execute("""
           INSERT INTO designation_master (title, description)
           VALUES (%s, %s)
         """, (title, description))
-        conn.commit()
+        store.commit()
+        master_data_changed(store, "designations")
+        dashboard_stats.designation_added()
     except Exception as e:
-        conn.rollback()
+        store.rollback()
         return jsonify({"message": str(e)}), 400
+    events.publish("designation", "created", store.fetch_one(
+        "SELECT desig_id, title, description, created_at FROM designation_master WHERE desig_id = %s",
+        (store.lastrowid,)))
 
     return jsonify({"message": "Designation added"}), 201
 
@@ -363,56 +1104,55 @@ def update_designation(desig_id):
     if not title:
         return jsonify({"message": "Title is required"}), 400
 
-    conn = get_connection()
-    cur = conn.cursor()
+    store = get_db()
     try:
-        cur.execute("""
+        store.execute("""
           UPDATE designation_master
           SET title = %s, description = %s
           WHERE desig_id = %s
         """, (title, description, desig_id))
-        conn.commit()
+        store.commit()
+        master_data_changed(store, "designations")
     except Exception as e:
-        conn.rollback()
+        store.rollback()
         return jsonify({"message": str(e)}), 400
+    events.publish("designation", "updated", {"desig_id": desig_id, "title": title, "description": description})
 
     return jsonify({"message": "Designation updated"})
 
 # --- DELETE designation ---
 @app.delete("/designations/<int:desig_id>")
 def delete_designation(desig_id):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM designation_master WHERE desig_id = %s", (desig_id,))
-    conn.commit()
+    store = get_db()
+    deleted = store.execute("DELETE FROM designation_master WHERE desig_id = %s", (desig_id,))
+    store.commit()
+    master_data_changed(store, "designations")
+    if deleted:
+        dashboard_stats.designation_added(-deleted)
+        events.publish("designation", "deleted", {"desig_id": desig_id})
     return jsonify({"message": "Designation deleted"})
 
 # --- GET all departments ---
 @app.get("/departments")
 def get_departments():
-    conn = get_connection()
-    cur = conn.cursor(dictionary=True)
-    cur.execute("""
-      SELECT dept_id, dept_name, description, created_at
-      FROM department_master
-      ORDER BY dept_id DESC
-    """)
-    return jsonify(cur.fetchall())
+    def load():
+        return get_db().fetch_all("""
+          SELECT dept_id, dept_name, description, created_at
+          FROM department_master
+          ORDER BY dept_id DESC
+        """)
+    return cached_json(("departments", None), load)
 
 # --- GET single department ---
 @app.get("/departments/<int:dept_id>")
 def get_department(dept_id):
-    conn = get_connection()
-    cur = conn.cursor(dictionary=True)
-    cur.execute("""
-      SELECT dept_id, dept_name, description, created_at
-      FROM department_master
-      WHERE dept_id = %s
-    """, (dept_id,))
-    row = cur.fetchone()
-    if not row:
-        return jsonify({"message":"Not found"}), 404
-    return jsonify(row)
+    def load():
+        return get_db().fetch_one("""
+          SELECT dept_id, dept_name, description, created_at
+          FROM department_master
+          WHERE dept_id = %s
+        """, (dept_id,))
+    return cached_json(("departments", dept_id), load)
 
 # --- CREATE department ---
 @app.post("/departments")
@@ -423,17 +1163,21 @@ def add_department():
     if not name:
         return jsonify({"message":"Name is required"}), 400
 
-    conn = get_connection()
-    cur = conn.cursor()
+    store = get_db()
     try:
-        cur.execute(
+        store.execute(
           "INSERT INTO department_master (dept_name, description) VALUES (%s, %s)",
           (name, desc)
         )
-        conn.commit()
+        store.commit()
+        master_data_changed(store, "departments")
+        dashboard_stats.department_added()
     except Exception as e:
-        conn.rollback()
+        store.rollback()
         return jsonify({"message": str(e)}), 400
+    events.publish("department", "created", store.fetch_one(
+        "SELECT dept_id, dept_name, description, created_at FROM department_master WHERE dept_id=%s",
+        (store.lastrowid,)))
 
     return jsonify({"message":"Department added"}), 201
 
@@ -446,43 +1190,147 @@ def update_department(dept_id):
     if not name:
         return jsonify({"message":"Name is required"}), 400
 
-    conn = get_connection()
-    cur = conn.cursor()
+    store = get_db()
     try:
-        cur.execute("""
+        store.execute("""
           UPDATE department_master
           SET dept_name=%s, description=%s
           WHERE dept_id=%s
         """, (name, desc, dept_id))
-        conn.commit()
+        store.commit()
+        master_data_changed(store, "departments")
     except Exception as e:
-        conn.rollback()
+        store.rollback()
         return jsonify({"message": str(e)}), 400
+    events.publish("department", "updated", {"dept_id": dept_id, "dept_name": name, "description": desc})
 
     return jsonify({"message":"Department updated"})
 
 # --- DELETE department ---
 @app.delete("/departments/<int:dept_id>")
 def delete_department(dept_id):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM department_master WHERE dept_id=%s", (dept_id,))
-    conn.commit()
+    store = get_db()
+    deleted = store.execute("DELETE FROM department_master WHERE dept_id=%s", (dept_id,))
+    store.commit()
+    master_data_changed(store, "departments")
+    if deleted:
+        dashboard_stats.department_added(-deleted)
+        events.publish("department", "deleted", {"dept_id": dept_id})
     return jsonify({"message":"Department deleted"})
 
-@app.get("/leaves")
-def get_leaves():
-    conn = get_connection()
-    cur = conn.cursor(dictionary=True)
-    cur.execute("""
+LEAVES_DEFAULT_LIMIT = 50
+LEAVES_MAX_LIMIT = 500
+# longest leave the database holds (chk_leave_span, migration 006); bounds the
+# start_date range the /leaves?start_date= window has to search (idx_leave_dates)
+LEAVE_SPAN_LIMIT = 366
+# longest leave request accepted; may be lowered, not raised past the limit
+LEAVE_MAX_DAYS = min(int(os.environ.get("LEAVE_MAX_DAYS", LEAVE_SPAN_LIMIT)), LEAVE_SPAN_LIMIT)
+
+
+def leave_span_error(start_date, end_date):
+    if start_date > end_date:
+        return "start_date is after end_date"
+    if (end_date - start_date).days >= LEAVE_MAX_DAYS:
+        return f"A leave request cannot span more than {LEAVE_MAX_DAYS} days"
+    return None
+
+
+def parse_iso_date(value):
+    # '2025-11-28' or '2025-11-28T18:30:00.000Z' -> date
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
+
+
+def parse_date_arg(name, args=None):
+    value = (request.args if args is None else args).get(name)
+    if not value:
+        return None
+    return parse_iso_date(value)
+
+
+def leave_filters(args):
+    # WHERE clause parts for /leaves from emp_id / status / leave_type /
+    # start_date / end_date; ValueError for a bad date
+    where_clauses = []
+    params = []
+    emp_id = args.get("emp_id", type=int)
+    start = parse_date_arg("start_date", args)
+    end = parse_date_arg("end_date", args)
+    if emp_id is not None:
+        where_clauses.append("l.emp_id = %s")
+        params.append(emp_id)
+    for field in ("status", "leave_type"):
+        value = args.get(field, "").strip()
+        if value:
+            where_clauses.append(f"l.{field} = %s")
+            params.append(value)
+    # leaves overlapping the [start_date, end_date] window; no stored leave is
+    # longer than LEAVE_SPAN_LIMIT, so its start_date lies in a bounded range
+    if start:
+        where_clauses.append("l.start_date > %s AND l.end_date >= %s")
+        params += [start - timedelta(days=LEAVE_SPAN_LIMIT), start]
+    if end:
+        where_clauses.append("l.start_date <= %s")
+        params.append(end)
+    return where_clauses, params
+
+
+def leave_page_sql(where_clauses, direction="DESC"):
+    # SELECT for one /leaves page; migrate.py verifies the same text
+    where_sql = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
+    return f"""
       SELECT l.leave_id, l.emp_id, e.emp_name, l.leave_type,
              l.start_date, l.end_date, l.reason, l.status,
              l.applied_at, l.updated_at
       FROM leave_requests l
       JOIN employee_master e ON e.emp_id = l.emp_id
-      ORDER BY l.leave_id DESC
-    """)
-    return jsonify(cur.fetchall())
+      {where_sql}
+      ORDER BY l.leave_id {direction}
+      LIMIT %s
+    """
+
+
+@app.get("/leaves")
+def get_leaves():
+    # Keyset pagination on leave_id (newest first): `after` = last leave_id of the
+    # previous page, `before` = first leave_id of the next one.
+    try:
+        limit = max(1, min(int(request.args.get("limit", LEAVES_DEFAULT_LIMIT)), LEAVES_MAX_LIMIT))
+        after = request.args.get("after", type=int)
+        before = request.args.get("before", type=int)
+        where_clauses, params = leave_filters(request.args)
+    except ValueError:
+        return jsonify({"message": "Invalid query parameter"}), 400
+
+    direction = "DESC"
+    if before is not None:
+        where_clauses.append("l.leave_id > %s")
+        params.append(before)
+        direction = "ASC"
+    elif after is not None:
+        where_clauses.append("l.leave_id < %s")
+        params.append(after)
+
+    rows = get_db().fetch_all(leave_page_sql(where_clauses, direction), params + [limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if before is not None:
+        rows.reverse()
+
+    next_cursor = prev_cursor = None
+    if rows:
+        if before is not None:
+            next_cursor = rows[-1]["leave_id"]
+            prev_cursor = rows[0]["leave_id"] if has_more else None
+        else:
+            next_cursor = rows[-1]["leave_id"] if has_more else None
+            prev_cursor = rows[0]["leave_id"] if after is not None else None
+
+    return jsonify({
+        "data": listing(rows),
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+    })
 
 # @app.post("/leaves")
 # def apply_leave():
@@ -515,43 +1363,460 @@ def apply_leave():
     reason = data.get("reason", "")
 
     try:
-        # convert ISO string to date (or datetime) object
-        start_dt = datetime.fromisoformat(start.replace("Z", "+00:00"))
-        end_dt = datetime.fromisoformat(end.replace("Z", "+00:00"))
+        # convert ISO string to date object
+        start_date = parse_iso_date(start)
+        end_date = parse_iso_date(end)
     except Exception as e:
         return jsonify({"message": "Invalid date format"}), 400
-
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("""
+    error = leave_field_error({"leave_type": leave_type}) or leave_span_error(start_date, end_date)
+    if error:
+        return jsonify({"message": error}), 400
+    try:
+        emp_id = int(emp_id)
+    except (TypeError, ValueError):
+        return jsonify({"message": "emp_id must be a number"}), 400
+
+    store = get_db()
+    # the employee's row lock serialises overlap check + insert per employee
+    if not store.lock_row("employee_master", "emp_id", emp_id):
+        store.rollback()
+        return jsonify({"message": "Employee not found"}), 404
+    overlaps = overlapping_leaves(store, emp_id, start_date, end_date)
+    if overlaps and not data.get("allow_overlap"):
+        store.rollback()
+        return jsonify({"message": "Overlaps an existing leave request", "overlaps": overlaps}), 409
+
+    store.execute("""
       INSERT INTO leave_requests (emp_id, leave_type, start_date, end_date, reason)
       VALUES (%s, %s, %s, %s, %s)
-    """, (emp_id, leave_type, start_dt.date(), end_dt.date(), reason))
-    conn.commit()
-    return jsonify({"message":"Leave applied"}), 201
+    """, (emp_id, leave_type, start_date, end_date, reason))
+    store.commit()
+    leave_id = store.lastrowid
+    dashboard_stats.leave_added(leave_type)
+    leave_index.add({"leave_id": leave_id, "emp_id": emp_id, "leave_type": leave_type,
+                     "start_date": start_date, "end_date": end_date, "status": "pending"})
+    leaves_changed(store)
+    events.publish("leave", "created", fetch_leave(store, leave_id))
+    # allow_overlap=true still records it, flagged
+    return jsonify({"message": "Leave applied", "leave_id": leave_id, "overlaps": overlaps}), 201
+
+
+def overlapping_leaves(store, emp_id, start, end, exclude=None):
+    # The employee's live (not rejected) leaves sharing a day with [start, end].
+    # Checked against the database rather than leave_index so every worker
+    # sees the others' inserts; idx_leave_emp_dates keeps it a short range scan.
+    # Callers hold the employee's row (store.lock_row) until they write.
+    sql = """
+      SELECT leave_id, leave_type, start_date, end_date, status
+      FROM leave_requests
+      WHERE emp_id = %s AND start_date <= %s AND end_date >= %s AND status <> 'rejected'
+    """
+    params = [emp_id, end, start]
+    if exclude is not None:
+        sql += " AND leave_id <> %s"
+        params.append(exclude)
+    return store.fetch_all(sql + " ORDER BY start_date", params)
+
+
+LEAVE_EDITABLE = ("leave_type", "start_date", "end_date", "reason", "status")
+LEAVE_STATUSES = ("pending", "approved", "rejected")
+
+
+def leave_field_error(values):
+    # leave_type is NOT NULL and status one of LEAVE_STATUSES; checked here so
+    # a bad value is a 400, not an IntegrityError
+    if "leave_type" in values and not (isinstance(values["leave_type"], str) and values["leave_type"].strip()):
+        return "leave_type must not be empty"
+    if "status" in values and values["status"] not in LEAVE_STATUSES:
+        return f"status must be one of {', '.join(LEAVE_STATUSES)}"
+    return None
+
+
+def fetch_leave(store, leave_id):
+    return store.fetch_one("""
+      SELECT l.*, e.emp_name
+      FROM leave_requests l
+      LEFT JOIN employee_master e ON e.emp_id = l.emp_id
+      WHERE l.leave_id = %s
+    """, (leave_id,))
+
+
+@app.get("/leaves/<int:leave_id>")
+def get_leave(leave_id):
+    row = fetch_leave(get_db(), leave_id)
+    if row is None:
+        return jsonify({"message": "Leave not found"}), 404
+    return versioned(row, row["version"]).make_conditional(request)
+
+
+def write_leave(leave_id, fields, required):
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"message": "Expected a JSON object"}), 400
+    values = {f: data[f] for f in fields if f in data}
+    missing = [f for f in required if not values.get(f)]
+    if missing:
+        return jsonify({"message": f"Missing {', '.join(missing)}"}), 400
+    try:
+        for f in ("start_date", "end_date"):
+            if f in values:
+                values[f] = parse_iso_date(values[f])
+    except (TypeError, ValueError, AttributeError):
+        return jsonify({"message": "Invalid date format"}), 400
+    field_error = leave_field_error(values)
+    if field_error:
+        return jsonify({"message": field_error}), 400
+
+    store = get_db()
+    row = fetch_leave(store, leave_id)
+    if row is None:
+        return jsonify({"message": "Leave not found"}), 404
+    span_error = leave_span_error(values.get("start_date", row["start_date"]), values.get("end_date", row["end_date"]))
+    if span_error:
+        return jsonify({"message": span_error}), 400
+
+    changes = changed_columns(row, values)
+    if not changes:
+        # e.g. a second click on Approve: nothing to write
+        return versioned({"message": "Leave unchanged", "changed": False}, row["version"])
+
+    new = {**row, **changes}
+    moved = "start_date" in changes or "end_date" in changes or row["status"] == "rejected"
+    if moved and new["status"] != "rejected" and not data.get("allow_overlap"):
+        # held until versioned_update commits, like apply_leave
+        store.lock_row("employee_master", "emp_id", row["emp_id"])
+        overlaps = overlapping_leaves(store, row["emp_id"], new["start_date"], new["end_date"], exclude=leave_id)
+        if overlaps:
+            store.rollback()
+            return jsonify({"message": "Overlaps an existing leave request", "overlaps": overlaps}), 409
+
+    version = versioned_update(store, "leave_requests", "leave_id", row, changes)
+    if version is None:
+        return version_conflict(fetch_leave(store, leave_id))
+
+    dashboard_stats.leave_changed(row["leave_type"], row["status"], new["status"], new["leave_type"])
+    leave_index.update(new)
+    leaves_changed(store)
+    events.publish("leave", "updated", {**new, "version": version})
+    return versioned({"message": "Leave updated", "changed": True}, version)
 
 
 @app.put("/leaves/<int:leave_id>")
 def update_leave(leave_id):
-    data = request.get_json()
     # You may allow employee to update before approval, or admin to approve/reject
-    status = data.get("status")  # 'approved' or 'rejected'
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("""
-      UPDATE leave_requests SET status=%s, updated_at=NOW() WHERE leave_id=%s
-    """, (status, leave_id))
-    conn.commit()
-    return jsonify({"message":"Leave status updated"})
+    return write_leave(leave_id, ("status",), required=("status",))  # 'approved' or 'rejected'
+
+
+@app.patch("/leaves/<int:leave_id>")
+def patch_leave(leave_id):
+    return write_leave(leave_id, LEAVE_EDITABLE, required=())
+
 
 @app.delete("/leaves/<int:leave_id>")
 def delete_leave(leave_id):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM leave_requests WHERE leave_id=%s", (leave_id,))
-    conn.commit()
-    return jsonify({"message":"Leave deleted"})
+    store = get_db()
+    old = store.fetch_one("SELECT leave_id, leave_type, status, version FROM leave_requests WHERE leave_id=%s",
+                          (leave_id,))
+    if old is None:
+        return jsonify({"message": "Leave deleted"})
+    if not versioned_delete(store, "leave_requests", "leave_id", old):
+        return version_conflict(fetch_leave(store, leave_id))
+    dashboard_stats.leave_removed(old["leave_type"], old["status"])
+    leave_index.remove(leave_id)
+    leaves_changed(store)
+    events.publish("leave", "deleted", {"leave_id": leave_id})
+    return jsonify({"message": "Leave deleted"})
+
+
+LEAVE_BULK_CHUNK = 500
+
+
+def check_bulk_leave_params(status, leave_ids, filters):
+    # ValueError for bad input
+    if status not in LEAVE_STATUSES:
+        raise ValueError(f"status must be one of {', '.join(LEAVE_STATUSES)}")
+    if leave_ids is None and not filters:
+        raise ValueError("Give leave_ids or a filter")
+    if leave_ids is not None and not (isinstance(leave_ids, list) and all(isinstance(i, int) for i in leave_ids)):
+        raise ValueError("leave_ids must be a list of numbers")
+    if filters is not None and (not isinstance(filters, dict) or set(filters) - {"status", "leave_type", "emp_id"}):
+        raise ValueError("filter may only use status, leave_type and emp_id")
+
+
+def bulk_leave_rows(store, status, leave_ids=None, filters=None):
+    # Leaves to move to `status`. Rejected ones are only reopened one at a
+    # time (PUT /leaves/<id>), where overlaps are checked.
+    check_bulk_leave_params(status, leave_ids, filters)
+    filters = filters or {}
+    where = ["status <> %s"]
+    params = [status]
+    if status != "rejected":
+        where.append("status <> 'rejected'")
+    for field in ("status", "leave_type", "emp_id"):
+        if filters.get(field) is not None:
+            where.append(f"{field} = %s")
+            params.append(filters[field])
+
+    sql = ("SELECT leave_id, emp_id, leave_type, start_date, end_date, status, version "
+           "FROM leave_requests WHERE " + " AND ".join(where))
+    if leave_ids is None:
+        return store.fetch_all(sql + " ORDER BY leave_id", params)
+    rows = []
+    for i in range(0, len(leave_ids), LEAVE_BULK_CHUNK):
+        chunk = leave_ids[i:i + LEAVE_BULK_CHUNK]
+        rows += store.fetch_all(sql + f" AND leave_id IN ({', '.join(['%s'] * len(chunk))}) ORDER BY leave_id",
+                                params + chunk)
+    return rows
+
+
+def set_leave_statuses(store, status, rows, on_chunk=None):
+    # One version-guarded UPDATE per row, one commit per chunk; rows changed
+    # since they were read are skipped, as a single PUT would get a 412.
+    report = {"matched": len(rows), "updated": 0, "skipped": 0}
+    for i in range(0, len(rows), LEAVE_BULK_CHUNK):
+        chunk = rows[i:i + LEAVE_BULK_CHUNK]
+        updated = store.execute_many(
+            "UPDATE leave_requests SET status=%s, version=version+1, updated_at=NOW() "
+            "WHERE leave_id=%s AND version=%s",
+            [(status, row["leave_id"], row["version"]) for row in chunk],
+        )
+        store.commit()
+        if updated != len(chunk):
+            # find out which of them went through
+            ids = [row["leave_id"] for row in chunk]
+            current = {r["leave_id"]: r for r in store.fetch_all(
+                f"SELECT leave_id, status, version FROM leave_requests "
+                f"WHERE leave_id IN ({', '.join(['%s'] * len(ids))})", ids)}
+            chunk = [row for row in chunk
+                     if row["leave_id"] in current
+                     and current[row["leave_id"]]["version"] == row["version"] + 1
+                     and current[row["leave_id"]]["status"] == status]
+
+        for row in chunk:
+            dashboard_stats.leave_changed(row["leave_type"], row["status"], status)
+            leave_index.update({**row, "status": status})
+            events.publish("leave", "updated", {"leave_id": row["leave_id"], "status": status,
+                                                "version": row["version"] + 1})
+        if chunk:
+            leaves_changed(store)
+        report["updated"] += len(chunk)
+        if on_chunk is not None:
+            on_chunk(report, min(i + LEAVE_BULK_CHUNK, len(rows)))
+    report["skipped"] = report["matched"] - report["updated"]
+    return report
+
+
+@app.post("/leaves/bulk-status")
+def bulk_leave_status():
+    # {"status": "approved", "leave_ids": [1, 2]} or {"status": "approved", "filter": {"status": "pending"}}
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"message": "Expected a JSON object"}), 400
+    params = {"status": data.get("status"), "leave_ids": data.get("leave_ids"), "filters": data.get("filter")}
+
+    try:
+        check_bulk_leave_params(**params)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    if wants_async():
+        return job_accepted(jobs.submit("leaves.bulk_status", params))
+
+    store = get_db()
+    rows = bulk_leave_rows(store, **params)
+    return jsonify(set_leave_statuses(store, params["status"], rows))
+
+
+@jobs.task("leaves.bulk_status")
+def bulk_leave_status_job(job, status, leave_ids=None, filters=None):
+    # safe to retry: rows already at `status` no longer match
+    store = get_db()
+    try:
+        rows = bulk_leave_rows(store, status, leave_ids, filters)
+    except ValueError as e:
+        raise jobs.JobFailed(str(e))
+
+    def on_chunk(report, done):
+        job.progress(done / len(rows), f"{report['updated']} of {len(rows)} updated")
+
+    return set_leave_statuses(store, status, rows, on_chunk)
+
+
+CALENDAR_MAX_DAYS = 366
+
+
+def employee_names(store, emp_ids, chunk=500):
+    names = {}
+    ids = list(emp_ids)
+    for i in range(0, len(ids), chunk):
+        part = ids[i:i + chunk]
+        rows = store.fetch_all(
+            f"SELECT emp_id, emp_name FROM employee_master WHERE emp_id IN ({', '.join(['%s'] * len(part))})", part
+        )
+        names.update((row["emp_id"], row["emp_name"]) for row in rows)
+    return names
+
+
+@app.get("/leaves/calendar")
+def leave_calendar():
+    # ?start_date=2026-03-01&end_date=2026-03-31[&emp_id=1,2,3][&status=approved,pending]
+    try:
+        start = parse_date_arg("start_date") or date.today().replace(day=1)
+        end = parse_date_arg("end_date") or start + timedelta(days=30)
+        emp_ids = request.args.get("emp_id")
+        emp_ids = {int(i) for i in emp_ids.split(",") if i.strip()} if emp_ids else None
+    except ValueError:
+        return jsonify({"message": "Invalid query parameter"}), 400
+    if end < start or (end - start).days >= CALENDAR_MAX_DAYS:
+        return jsonify({"message": f"Window must be 1 to {CALENDAR_MAX_DAYS} days"}), 400
+    statuses = set(request.args.get("status", "approved,pending").split(","))
+
+    store = get_db()
+    cache_generations.check(lambda: store)
+    rows = ensure_leave_index(store).window(start, end, emp_ids, statuses)
+    names = employee_names(store, {r["emp_id"] for r in rows})
+
+    # people away per day: +1 / -1 at each clipped interval's edges
+    width = (end - start).days + 1
+    delta = [0] * (width + 1)
+    for r in rows:
+        r["emp_name"] = names.get(r["emp_id"])
+        delta[max((r["start_date"] - start).days, 0)] += 1
+        delta[min((r["end_date"] - start).days, width - 1) + 1] -= 1
+    days, away = [], 0
+    for i in range(width):
+        away += delta[i]
+        days.append({"date": start + timedelta(days=i), "away": away})
+
+    return jsonify({"start_date": start, "end_date": end, "data": listing(rows), "days": days})
+
+
+@app.get("/employees/<int:emp_id>/leave-balance")
+def leave_balance(emp_id):
+    year = request.args.get("year", date.today().year, type=int)
+    if not 1 <= year <= 9999:
+        return jsonify({"message": "Invalid year"}), 400
+    store = get_db()
+    if store.fetch_value("SELECT emp_id FROM employee_master WHERE emp_id=%s", [emp_id]) is None:
+        return jsonify({"message": "Employee not found"}), 404
+    cache_generations.check(lambda: store)
+    index = ensure_leave_index(store)
+    return jsonify({
+        "emp_id": emp_id,
+        "year": year,
+        "balances": index.balance(emp_id, year),
+        "leaves": index.employee_leaves(emp_id, date(year, 1, 1), date(year, 12, 31)),
+    })
+
+
+def job_view(job):
+    view = {k: job[k] for k in ("id", "kind", "status", "attempts", "max_attempts",
+                                "progress", "message", "result", "error")}
+    for k in ("created_at", "started_at", "finished_at"):
+        view[k] = datetime.fromtimestamp(job[k]) if job[k] else None
+    if job["status"] == "queued" and job["attempts"]:
+        view["retry_at"] = datetime.fromtimestamp(job["run_after"])
+    if job["artifact"]:
+        view["artifact_url"] = f"/jobs/{job['id']}/artifact"
+    return view
+
+
+@app.post("/jobs")
+def create_job():
+    # {"kind": "employees.export", "params": {"args": {"q": "dev"}, "fmt": "ndjson"}}
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get("params", {}), dict):
+        return jsonify({"message": "Expected {kind, params}"}), 400
+    try:
+        job_id = jobs.submit(data.get("kind"), data.get("params"), data.get("max_attempts"))
+    except ValueError as e:
+        return jsonify({"message": str(e), "kinds": sorted(jobs.TASKS)}), 400
+    return job_accepted(job_id)
+
+
+@app.get("/jobs/<job_id>")
+def get_job(job_id):
+    job = jobs.job_queue.get(job_id)
+    if job is None:
+        return jsonify({"message": "Job not found"}), 404
+    return jsonify(job_view(job))
+
+
+@app.get("/jobs/<job_id>/artifact")
+def get_job_artifact(job_id):
+    job = jobs.job_queue.get(job_id)
+    if job is None or not job["artifact"] or not os.path.exists(job["artifact"]):
+        return jsonify({"message": "No artifact for this job"}), 404
+    filename = os.path.basename(job["artifact"]).split("-", 1)[1]
+    return send_file(os.path.abspath(job["artifact"]), as_attachment=True, download_name=filename)
+
+
+BATCH_MAX_REQUESTS = 20
+BATCH_THREADS = 4
+# only forwarded to sub-requests; everything else comes from the batch item
+BATCH_FORWARD_HEADERS = ("Authorization", "Accept-Language")
+
+batch_executor = ThreadPoolExecutor(max_workers=BATCH_THREADS, thread_name_prefix="batch")
+
+
+def run_sub_request(item, headers):
+    path = item.get("path", "")
+    method = item.get("method", "GET").upper()
+    result = {"id": item.get("id", path)}
+    if method != "GET":
+        return {**result, "status": 405, "body": {"message": "Only GET requests can be batched"}}
+    if not path.startswith("/") or path.split("?", 1)[0].rstrip("/") in ("/batch", "/employees/export", "/events"):
+        return {**result, "status": 400, "body": {"message": "Path cannot be batched"}}
+
+    sub_headers = dict(headers)
+    sub_headers.update(item.get("headers") or {})
+    # the body is embedded in the batch's JSON, so it must come back uncompressed
+    sub_headers = {k: v for k, v in sub_headers.items() if k.lower() != "accept-encoding"}
+    environ = EnvironBuilder(path=path, method="GET", headers=sub_headers).get_environ()
+
+    # Run inside the current app context when there is one, so every
+    # sub-request shares the request's pooled connection (g._db)
+    with app.request_context(environ):
+        try:
+            response = app.full_dispatch_request()
+            if response.direct_passthrough or response.is_streamed:
+                # files and streams (job artifacts, exports) don't fit in a JSON envelope
+                response.close()
+                return {**result, "status": 400, "body": {"message": "Streamed responses cannot be batched"}}
+            body = response.get_json(silent=True)
+            if body is None and response.status_code != 304:
+                body = response.get_data(as_text=True)
+        except Exception as e:
+            print("Error in /batch sub-request:", path, e)
+            return {**result, "status": 500, "body": {"error": "Server error"}}
+        result.update(status=response.status_code, body=body)
+        if response.headers.get("ETag"):
+            result["etag"] = response.headers["ETag"]
+    return result
+
+
+@app.post("/batch")
+def batch():
+    # {"requests": [{"id": "emp", "path": "/employees/5"}, ...], "concurrent": false}
+    data = request.get_json(silent=True) or {}
+    items = data.get("requests")
+    if not isinstance(items, list) or not items:
+        return jsonify({"message": "requests must be a non-empty list"}), 400
+    if len(items) > BATCH_MAX_REQUESTS:
+        return jsonify({"message": f"At most {BATCH_MAX_REQUESTS} requests per batch"}), 400
+    if not all(isinstance(item, dict) for item in items):
+        return jsonify({"message": "Each request must be an object"}), 400
+
+    headers = {h: request.headers[h] for h in BATCH_FORWARD_HEADERS if h in request.headers}
+
+    if data.get("concurrent"):
+        # worker threads have no app context, so each borrows its own connection
+        responses = list(batch_executor.map(lambda item: run_sub_request(item, headers), items))
+    else:
+        responses = [run_sub_request(item, headers) for item in items]
+
+    return jsonify({"responses": responses})
 
 
 if __name__ == "__main__":
+    migrate.startup_check()
     app.run(host="0.0.0.0", port=5000, debug=True)
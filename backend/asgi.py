@@ -0,0 +1,231 @@
+"""ASGI entry point for the API.
+
+    uvicorn asgi:application --host 0.0.0.0 --port 8000
+
+Connections are accepted and parked on the event loop, so thousands of slow
+or idle clients cost no threads.  Each request's Flask view (and its
+blocking database calls) runs on a bounded thread-offload executor sized to
+the DB pool, so at most ``ASGI_WORKER_THREADS`` requests touch the database
+at once and the rest wait on the loop instead of in the pool.  Every route of
+app.py (/employees, /designations, /departments, /leaves, ...) is served
+unchanged, except GET /events: the change feed is streamed straight from the
+event loop, so idle subscribers hold no executor thread at all.
+"""
+import asyncio
+import io
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from urllib.parse import parse_qs
+
+import auth
+import db
+import events
+import migrate
+from app import app as flask_app
+
+auth.require_secret_key()
+
+ASGI_WORKER_THREADS = int(os.environ.get("ASGI_WORKER_THREADS", db.POOL_MAX_SIZE))
+ASGI_MAX_BODY = int(os.environ.get("ASGI_MAX_BODY", 64 * 1024 * 1024))
+STREAM_QUEUE_SIZE = 8  # response chunks buffered ahead of a slow client
+
+_executor = ThreadPoolExecutor(max_workers=ASGI_WORKER_THREADS, thread_name_prefix="asgi-view")
+
+
+def build_environ(scope, body):
+    headers = {}
+    for name, value in scope["headers"]:
+        key = name.decode("latin-1").upper().replace("-", "_")
+        value = value.decode("latin-1")
+        headers[key] = f"{headers[key]},{value}" if key in headers else value
+
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope["query_string"].decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "REMOTE_PORT": str(client[1]),
+        "CONTENT_TYPE": headers.pop("CONTENT_TYPE", ""),
+        "CONTENT_LENGTH": headers.pop("CONTENT_LENGTH", str(len(body))),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for key, value in headers.items():
+        environ[f"HTTP_{key}"] = value
+    return environ
+
+
+class ClientGone(Exception):
+    pass
+
+
+def run_view(environ, loop, queue, cancelled):
+    # Runs on an executor thread: call the Flask app and push the status line
+    # and body chunks to the event loop. Iteration stays on this one thread so
+    # streamed responses keep their request context.
+    def put(item):
+        future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        while True:
+            if cancelled.is_set():
+                future.cancel()
+                raise ClientGone()
+            try:
+                return future.result(timeout=1)
+            except FutureTimeout:
+                continue
+
+    def start_response(status, response_headers, exc_info=None):
+        put(("start", status, response_headers))
+
+    try:
+        body = flask_app.wsgi_app(environ, start_response)
+        try:
+            for chunk in body:
+                if chunk:
+                    put(("body", chunk))
+        finally:
+            if hasattr(body, "close"):
+                body.close()
+    except ClientGone:
+        return
+    finally:
+        if not cancelled.is_set():
+            put(("end",))
+
+
+async def read_body(receive):
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > ASGI_MAX_BODY:
+            return False
+        chunks.append(chunk)
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def send_simple(send, status, body):
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def handle_http(scope, receive, send):
+    body = await read_body(receive)
+    if body is None:
+        return
+    if body is False:
+        await send_simple(send, 413, b'{"error": "Request body too large"}')
+        return
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+    cancelled = threading.Event()
+    task = loop.run_in_executor(_executor, run_view, build_environ(scope, body), loop, queue, cancelled)
+
+    started = False
+    try:
+        while True:
+            item = await queue.get()
+            if item[0] == "start":
+                _, status, headers = item
+                await send({
+                    "type": "http.response.start",
+                    "status": int(status.split(" ", 1)[0]),
+                    "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers],
+                })
+                started = True
+            elif item[0] == "body":
+                await send({"type": "http.response.body", "body": item[1], "more_body": True})
+            else:
+                await send({"type": "http.response.body", "body": b""})
+                break
+        await task
+    except Exception as e:
+        # usually the client went away mid-response; stop the view thread
+        cancelled.set()
+        print("Error in ASGI handler:", e)
+        if not started:
+            await send_simple(send, 500, b'{"error": "Server error"}')
+
+
+async def wait_disconnect(receive):
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def handle_events(scope, receive, send):
+    # same stream as app.event_stream, without a thread per subscriber
+    headers = dict(scope["headers"])
+    query = parse_qs(scope["query_string"].decode("latin-1"))
+    last_event_id = headers.get(b"last-event-id", b"").decode("latin-1") or query.get("last_event_id", [None])[0]
+    entities = events.entity_filter(query.get("entity", [""])[0])
+
+    await send({"type": "http.response.start", "status": 200, "headers": [
+        (b"content-type", b"text/event-stream; charset=utf-8"),
+        (b"cache-control", b"no-cache"),
+        (b"x-accel-buffering", b"no"),
+        (b"access-control-allow-origin", b"*"),
+    ]})
+    disconnected = asyncio.ensure_future(wait_disconnect(receive))
+    seq, chunk = events.start(last_event_id)
+    try:
+        while not disconnected.done():
+            await send({"type": "http.response.body", "body": chunk.encode("utf-8"), "more_body": True})
+            seq, chunks = events.pending(seq, entities)
+            if not chunks:
+                waiter = asyncio.ensure_future(events.bus.wait_async(seq, events.EVENTS_HEARTBEAT))
+                await asyncio.wait({waiter, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+                waiter.cancel()
+                seq, chunks = events.pending(seq, entities)
+            chunk = "".join(chunks) if chunks else ": ping\n\n"
+    except OSError:
+        pass  # client went away mid-send
+    finally:
+        disconnected.cancel()
+
+
+async def handle_lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, migrate.startup_check)
+            except SystemExit as e:
+                await send({"type": "lifespan.startup.failed", "message": str(e)})
+                return
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            _executor.shutdown(wait=False)
+            db.get_pool().close()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "http":
+        if scope["path"] == "/events" and scope["method"] == "GET":
+            await handle_events(scope, receive, send)
+        else:
+            await handle_http(scope, receive, send)
+    elif scope["type"] == "lifespan":
+        await handle_lifespan(receive, send)
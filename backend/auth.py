@@ -0,0 +1,115 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+
+from flask import request
+
+from cache import TTLCache
+
+# the fallback is for the debug server (python app.py) only; production
+# servers call require_secret_key() and refuse to start without a real one
+SECRET_KEY = os.environ.get("APP_SECRET_KEY", "dev-secret-change-me").encode("utf-8")
+TOKEN_TTL = int(os.environ.get("AUTH_TOKEN_TTL", 8 * 3600))     # seconds
+PROFILE_CACHE_TTL = int(os.environ.get("AUTH_PROFILE_CACHE_TTL", 300))
+
+PROFILE_FIELDS = ("username", "full_name", "email", "phone")
+
+# username -> profile dict, refreshed by update_profile
+profile_cache = TTLCache(ttl=PROFILE_CACHE_TTL, maxsize=10000)
+
+# username -> time of the last profile update seen by this process; tokens
+# issued before it carry stale claims
+_profile_updated = {}
+# time of the last profile update made by any process (cache_generations);
+# which user it was isn't shared, so older tokens all go to the database once
+_profiles_changed_at = 0
+_profile_lock = threading.Lock()
+
+
+def require_secret_key():
+    # anyone can sign tokens with the published development key
+    if not os.environ.get("APP_SECRET_KEY"):
+        raise SystemExit("APP_SECRET_KEY is not set; refusing to start outside debug mode")
+
+
+def _b64encode(raw):
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(payload):
+    return _b64encode(hmac.new(SECRET_KEY, payload.encode("ascii"), hashlib.sha256).digest())
+
+
+def issue_token(user):
+    now = time.time()
+    claims = {field: user.get(field) for field in PROFILE_FIELDS}
+    claims["iat"] = now
+    claims["exp"] = int(now) + TOKEN_TTL
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    return f"{payload}.{_sign(payload)}"
+
+
+def verify_token(token):
+    # Returns the claims of a valid, unexpired token, else None. No DB access.
+    try:
+        payload, signature = token.split(".", 1)
+        # non-ASCII input: TypeError from compare_digest, UnicodeEncodeError from _sign
+        if not hmac.compare_digest(signature, _sign(payload)):
+            return None
+        claims = json.loads(_b64decode(payload))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(claims, dict) or claims.get("exp", 0) < time.time():
+        return None
+    return claims
+
+
+def request_claims():
+    # Expect header: Authorization: Bearer <token>
+    auth_header = request.headers.get("Authorization", "")
+    if not auth_header.startswith("Bearer "):
+        return None
+    return verify_token(auth_header.split(" ", 1)[1])
+
+
+def cached_profile(claims):
+    # Profile for a verified token: cache first, then the token's own claims
+    # unless the profile changed after the token was issued. Returns None when
+    # the caller has to go to the database.
+    username = claims["username"]
+    profile = profile_cache.get(username)
+    if profile is not None:
+        return profile
+    with _profile_lock:
+        updated = max(_profile_updated.get(username, 0), _profiles_changed_at)
+    if claims.get("iat", 0) >= updated:
+        profile = {field: claims.get(field) for field in PROFILE_FIELDS}
+        profile_cache.set(username, profile)
+        return profile
+    return None
+
+
+def store_profile(profile):
+    profile_cache.set(profile["username"], profile)
+
+
+def profiles_changed(changed_at):
+    # another worker updated a profile
+    global _profiles_changed_at
+    with _profile_lock:
+        _profiles_changed_at = max(_profiles_changed_at, changed_at)
+    profile_cache.clear()
+
+
+def profile_changed(profile):
+    with _profile_lock:
+        _profile_updated[profile["username"]] = time.time()
+    store_profile(profile)
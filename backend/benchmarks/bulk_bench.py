@@ -0,0 +1,60 @@
+"""Employee insert throughput: one POST per row vs. POST /employees/bulk.
+
+    python benchmarks/bulk_bench.py --api http://127.0.0.1:5000 --rows 2000
+
+Rows use a per-run email domain (``@bench-<ts>.invalid``) so they are easy to
+remove afterwards:  DELETE FROM employee_master WHERE emp_email LIKE '%@bench-%.invalid';
+"""
+import argparse
+import json
+import time
+import urllib.request
+
+
+def post_json(url, payload):
+    req = urllib.request.Request(
+        url, data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"}, method="POST",
+    )
+    with urllib.request.urlopen(req) as resp:
+        return json.load(resp)
+
+
+def make_rows(n, tag):
+    return [{
+        "emp_name": f"Bench Employee {i}",
+        "emp_email": f"bench{i}@bench-{tag}.invalid",
+        "emp_phone": f"900000{i:04d}",
+        "emp_designation": "Benchmark",
+    } for i in range(n)]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--api", default="http://127.0.0.1:5000")
+    ap.add_argument("--rows", type=int, default=2000)
+    ap.add_argument("--single-rows", type=int, default=500,
+                    help="rows to send through the one-by-one path (it is slow)")
+    ap.add_argument("--batch-size", type=int, nargs="+", default=[100, 500, 2000])
+    args = ap.parse_args()
+    base = args.api.rstrip("/")
+    tag = str(int(time.time()))
+
+    rows = make_rows(args.single_rows, tag + "-single")
+    t0 = time.perf_counter()
+    for row in rows:
+        post_json(f"{base}/employees", row)
+    elapsed = time.perf_counter() - t0
+    print(f"single POST       {len(rows):7,d} rows  {elapsed:8.2f} s  {len(rows) / elapsed:10,.0f} rows/s")
+
+    for size in args.batch_size:
+        rows = make_rows(args.rows, f"{tag}-b{size}")
+        t0 = time.perf_counter()
+        report = post_json(f"{base}/employees/bulk?batch_size={size}", rows)
+        elapsed = time.perf_counter() - t0
+        print(f"bulk batch={size:<5d} {report['inserted']:7,d} rows  {elapsed:8.2f} s  "
+              f"{report['inserted'] / elapsed:10,.0f} rows/s  (failed: {report['failed']})")
+
+
+if __name__ == "__main__":
+    main()
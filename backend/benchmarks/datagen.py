@@ -0,0 +1,162 @@
+"""Synthetic data for benchmarks.
+
+    python -m benchmarks.datagen --employees 100000                 # into the configured backend
+    python -m benchmarks.datagen --sqlite bench.db --employees 1000000
+
+Populates users, designation_master, department_master, employee_master and
+leave_requests at the requested scale (10k .. 10M employees).  Generation is
+seeded, so two runs at the same scale produce the same data and benchmark
+results stay comparable.  Benchmark users are ``bench0001`` .. with password
+``bench123``; their emails end in ``@bench.invalid``.  A SQLite file made
+with ``--sqlite`` can be served as is (DB_BACKEND=sqlite SQLITE_PATH=bench.db).
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+import bcrypt
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import storage  # noqa: E402
+
+BENCH_PASSWORD = "bench123"
+DESIGNATIONS = [
+    "Software Engineer", "Senior Software Engineer", "Staff Engineer", "QA Analyst", "QA Lead",
+    "HR Executive", "HR Manager", "Accountant", "Finance Manager", "Sales Executive",
+    "Sales Manager", "Product Manager", "Designer", "DevOps Engineer", "Data Scientist",
+    "Data Engineer", "Support Associate", "Support Lead", "Recruiter", "Office Administrator",
+]
+DEPARTMENTS = ["Engineering", "Quality", "Human Resources", "Finance", "Sales", "Product",
+               "Design", "Operations", "Data", "Support", "Administration", "Legal"]
+LEAVE_TYPES = ["sick", "casual", "earned", "unpaid", "maternity"]
+STATUSES = ["pending", "approved", "approved", "approved", "rejected"]
+SYLLABLES = ["ar", "jun", "pri", "ya", "ra", "hul", "sne", "ha", "vik", "ram", "ani", "ta", "ro",
+             "kav", "mit", "ne", "jo", "mar", "li", "fa", "om", "sa", "da", "vid", "el", "ken",
+             "shar", "ma", "pat", "iy", "er", "red", "dy", "gup", "sin", "gh", "kh", "an", "su",
+             "nil", "de", "vi", "po", "oja", "kum", "na", "ir", "bo", "se", "meh", "rao"]
+
+def name(rnd, parts):
+    return "".join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(*parts))).title()
+
+
+def employees(rnd, n):
+    first_day = datetime(2015, 1, 1)
+    span = (datetime(2026, 1, 1) - first_day).total_seconds()
+    for i in range(1, n + 1):
+        first, last = name(rnd, (2, 3)), name(rnd, (2, 4))
+        yield (
+            f"{first} {last}",
+            f"{first.lower()}.{last.lower()}{i}@bench.invalid",
+            f"9{rnd.randrange(10 ** 9):09d}",
+            rnd.choice(DESIGNATIONS),
+            first_day + timedelta(seconds=int(rnd.random() * span)),
+        )
+
+
+def leaves(rnd, emp_count, n):
+    first_day = date(2015, 1, 1)
+    for _ in range(n):
+        start = first_day + timedelta(days=rnd.randrange(365 * 11))
+        yield (
+            rnd.randint(1, emp_count),
+            rnd.choice(LEAVE_TYPES),
+            start,
+            start + timedelta(days=rnd.choice((0, 0, 1, 1, 2, 4, 9))),
+            "benchmark",
+            rnd.choice(STATUSES),
+        )
+
+
+def batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def insert(store, table, columns, rows, batch_size):
+    marks = ", ".join(["%s"] * len(columns))
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({marks})"
+    total = 0
+    for batch in batched(rows, batch_size):
+        store.execute_many(sql, batch)
+        store.commit()
+        total += len(batch)
+    return total
+
+
+def open_store(sqlite_path=None):
+    # the configured backend (DB_BACKEND etc.), or a SQLite file created with the app's schema
+    if not sqlite_path:
+        return storage.connect()
+    store = storage.connect(storage.create_backend("sqlite", path=sqlite_path))
+    store.execute("PRAGMA synchronous=OFF")  # bulk load only
+    return store
+
+
+def populate(store, employee_count, leaves_per_employee=3, users=100, batch_size=10000,
+             bcrypt_rounds=12, seed=1234, log=print):
+    rnd = random.Random(seed)
+    started = time.perf_counter()
+
+    # one hash for every bench user: same cost per login as a real account
+    password_hash = bcrypt.hashpw(BENCH_PASSWORD.encode(), bcrypt.gensalt(bcrypt_rounds)).decode()
+    n = insert(store, "users", ["username", "password", "full_name", "email", "phone"], (
+        (f"bench{i:04d}", password_hash, f"Bench User {i}", f"bench{i}@bench.invalid", "9000000000")
+        for i in range(1, users + 1)
+    ), batch_size)
+    log(f"users               {n:>12,d}")
+
+    n = insert(store, "designation_master", ["title", "description"],
+               ((t, f"{t} (benchmark)") for t in DESIGNATIONS), batch_size)
+    log(f"designation_master  {n:>12,d}")
+    n = insert(store, "department_master", ["dept_name", "description"],
+               ((d, f"{d} (benchmark)") for d in DEPARTMENTS), batch_size)
+    log(f"department_master   {n:>12,d}")
+
+    base_emp = store.fetch_value("SELECT COALESCE(MAX(emp_id), 0) FROM employee_master")
+    n = insert(
+        store, "employee_master",
+        ["emp_name", "emp_email", "emp_phone", "emp_designation", "created_at"],
+        employees(rnd, employee_count), batch_size,
+    )
+    log(f"employee_master     {n:>12,d}")
+
+    leave_rows = (
+        (base_emp + emp_id, *rest)
+        for emp_id, *rest in leaves(rnd, employee_count, employee_count * leaves_per_employee)
+    )
+    n = insert(
+        store, "leave_requests", ["emp_id", "leave_type", "start_date", "end_date", "reason", "status"],
+        leave_rows, batch_size,
+    )
+    log(f"leave_requests      {n:>12,d}")
+    log(f"done in {time.perf_counter() - started:.1f} s")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--employees", type=int, default=10000)
+    ap.add_argument("--leaves-per-employee", type=int, default=3)
+    ap.add_argument("--users", type=int, default=100)
+    ap.add_argument("--batch-size", type=int, default=10000)
+    ap.add_argument("--bcrypt-rounds", type=int, default=12)
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("--sqlite", metavar="PATH", help="write to this SQLite file instead of DB_BACKEND")
+    args = ap.parse_args()
+
+    store = open_store(args.sqlite)
+    populate(store, args.employees, args.leaves_per_employee, args.users,
+             args.batch_size, args.bcrypt_rounds, args.seed)
+
+
+if __name__ == "__main__":
+    main()
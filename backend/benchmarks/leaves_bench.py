@@ -0,0 +1,106 @@
+"""GET /leaves latency on a large leave history.
+
+    python benchmarks/leaves_bench.py --seed 3000000          # insert synthetic leave rows first
+    python benchmarks/leaves_bench.py --api http://127.0.0.1:5000
+
+Seeding writes straight to the configured database (DB_BACKEND and its connection settings) in
+executemany batches, spread over the existing employee ids.  Each scenario
+is then requested ``--repeat`` times; deep pages follow next_cursor.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import urllib.parse
+import urllib.request
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+LEAVE_TYPES = ["sick", "casual", "earned", "unpaid", "maternity"]
+STATUSES = ["pending", "approved", "rejected"]
+
+
+def seed(rows, batch_size=5000):
+    import db
+
+    store = db.get_db()
+    emp_ids = [r[0] for r in store.fetch_all("SELECT emp_id FROM employee_master", dictionary=False)]
+    if not emp_ids:
+        sys.exit("employee_master is empty; add employees before seeding leaves")
+
+    rnd = random.Random(7)
+    first_day = date(2015, 1, 1)
+    sql = """
+      INSERT INTO leave_requests (emp_id, leave_type, start_date, end_date, reason, status)
+      VALUES (%s, %s, %s, %s, %s, %s)
+    """
+    t0 = time.perf_counter()
+    done = 0
+    while done < rows:
+        batch = []
+        for _ in range(min(batch_size, rows - done)):
+            start = first_day + timedelta(days=rnd.randrange(365 * 11))
+            end = start + timedelta(days=rnd.randrange(10))
+            batch.append((rnd.choice(emp_ids), rnd.choice(LEAVE_TYPES), start, end, "bench", rnd.choice(STATUSES)))
+        store.execute_many(sql, batch)
+        store.commit()
+        done += len(batch)
+    print(f"seeded {done:,} leave rows in {time.perf_counter() - t0:.1f} s")
+    db.release_db(store)
+
+
+def fetch(url):
+    t0 = time.perf_counter()
+    with urllib.request.urlopen(url) as resp:
+        body = json.load(resp)
+    return (time.perf_counter() - t0) * 1000, body
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--api", default="http://127.0.0.1:5000")
+    ap.add_argument("--seed", type=int, default=0, help="leave rows to insert before measuring")
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--depth", type=int, default=200, help="pages to walk for the deep-page scenario")
+    args = ap.parse_args()
+    if args.seed:
+        seed(args.seed)
+
+    base = args.api.rstrip("/") + "/leaves?"
+    scenarios = {
+        "first page": {},
+        "status=pending": {"status": "pending"},
+        "emp_id=1": {"emp_id": 1},
+        "type+status": {"leave_type": "sick", "status": "approved"},
+        "month window": {"start_date": "2020-06-01", "end_date": "2020-06-30"},
+        "emp + window": {"emp_id": 1, "start_date": "2018-01-01", "end_date": "2019-12-31"},
+    }
+    for name, params in scenarios.items():
+        url = base + urllib.parse.urlencode({**params, "limit": 50})
+        samples = [fetch(url)[0] for _ in range(args.repeat)]
+        samples.sort()
+        print(f"{name:16s} p50 {statistics.median(samples):8.2f} ms  "
+              f"p95 {samples[int(len(samples) * 0.95) - 1]:8.2f} ms")
+
+    # walking deep: every page should cost about the same as the first
+    cursor = None
+    timings = []
+    for _ in range(args.depth):
+        params = {"limit": 50}
+        if cursor:
+            params["after"] = cursor
+        ms, body = fetch(base + urllib.parse.urlencode(params))
+        timings.append(ms)
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    print(f"deep walk        {len(timings)} pages, first {timings[0]:.2f} ms, last {timings[-1]:.2f} ms, "
+          f"mean {statistics.mean(timings):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
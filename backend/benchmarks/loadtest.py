@@ -0,0 +1,174 @@
+"""Closed-loop HTTP load generator comparing API servers.
+
+    # sync:  python app.py                                  (port 5000)
+    # async: uvicorn asgi:application --port 8000
+    python benchmarks/loadtest.py --target sync=http://127.0.0.1:5000 \\
+        --target async=http://127.0.0.1:8000 --concurrency 1 10 50 200 --duration 10
+
+Each of ``concurrency`` clients keeps one keep-alive connection and sends the
+next request as soon as the previous answer arrives, cycling through
+``--path`` values.  Reports requests/sec, error count and p50/p90/p99 latency
+per target and concurrency level.  Dependency-free (plain asyncio sockets).
+"""
+import argparse
+import asyncio
+import json
+import time
+import urllib.parse
+
+DEFAULT_PATHS = ["/employees?limit=10", "/designations", "/departments", "/leaves?limit=50"]
+
+
+def percentile(sorted_samples, pct):
+    if not sorted_samples:
+        return 0.0
+    k = max(0, min(len(sorted_samples) - 1, int(round(pct / 100 * len(sorted_samples))) - 1))
+    return sorted_samples[k]
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            k, v = line.split(":", 1)
+            headers[k.strip().lower()] = v.strip()
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        body = bytearray()
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            if size == 0:
+                await reader.readuntil(b"\r\n")
+                break
+            body += await reader.readexactly(size)
+            await reader.readexactly(2)
+        return status, headers, bytes(body)
+    if "content-length" in headers:
+        return status, headers, await reader.readexactly(int(headers["content-length"]))
+    # HTTP/1.0-style: body runs to EOF
+    return status, headers, await reader.read()
+
+
+class Client:
+    def __init__(self, base, headers=None):
+        url = urllib.parse.urlsplit(base)
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.headers = headers or {}
+        self.reader = self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+            self.reader = self.writer = None
+
+    async def request(self, method, path, body=None):
+        if self.writer is None:
+            await self.connect()
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", "Connection: keep-alive"]
+        lines += [f"{k}: {v}" for k, v in self.headers.items()]
+        payload = b""
+        if body is not None:
+            payload = json.dumps(body).encode("utf-8")
+            lines += ["Content-Type: application/json", f"Content-Length: {len(payload)}"]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + payload)
+        await self.writer.drain()
+        status, headers, data = await read_response(self.reader)
+        if headers.get("connection", "").lower() == "close" or "content-length" not in headers and \
+                headers.get("transfer-encoding", "").lower() != "chunked":
+            await self.close()
+        return status, data
+
+
+async def worker(base, requests, deadline, samples, errors, headers, budget):
+    # requests: list of (method, path, body) to cycle through, or a callable
+    # taking the request number and returning one
+    client = Client(base, headers)
+    i = 0
+    try:
+        while time.perf_counter() < deadline:
+            if budget is not None:
+                if budget[0] <= 0:
+                    break
+                budget[0] -= 1
+            if callable(requests):
+                method, path, body = requests(i)
+            else:
+                method, path, body = requests[i % len(requests)]
+            i += 1
+            t0 = time.perf_counter()
+            try:
+                status, _ = await client.request(method, path, body)
+                if status >= 400:
+                    errors.append(status)
+                else:
+                    samples.append(time.perf_counter() - t0)
+            except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+                errors.append(type(e).__name__)
+                await client.close()
+    finally:
+        await client.close()
+
+
+async def run_level(base, requests, concurrency, duration, headers=None, max_requests=None):
+    samples, errors = [], []
+    deadline = time.perf_counter() + duration
+    budget = [max_requests] if max_requests is not None else None
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        worker(base, requests, deadline, samples, errors, headers, budget) for _ in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - started
+    samples.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "errors": len(errors),
+        "rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p90_ms": round(percentile(samples, 90) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--target", action="append", required=True, metavar="NAME=URL")
+    ap.add_argument("--path", action="append", help="GET path to request (repeatable)")
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 200])
+    ap.add_argument("--duration", type=float, default=10, help="seconds per level")
+    ap.add_argument("--token", help="bearer token to send")
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args()
+
+    requests = [("GET", p, None) for p in (args.path or DEFAULT_PATHS)]
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else None
+
+    results = []
+    print(f"{'target':10s} {'conc':>5s} {'req/s':>9s} {'p50 ms':>8s} {'p90 ms':>8s} {'p99 ms':>8s} {'errors':>7s}")
+    for target in args.target:
+        name, _, url = target.partition("=")
+        for c in args.concurrency:
+            r = asyncio.run(run_level(url, requests, c, args.duration, headers))
+            r["target"] = name
+            results.append(r)
+            print(f"{name:10s} {c:5d} {r['rps']:9.1f} {r['p50_ms']:8.2f} {r['p90_ms']:8.2f} "
+                  f"{r['p99_ms']:8.2f} {r['errors']:7d}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Run benchmark scenarios against a live API and compare runs.
+
+    python -m benchmarks.datagen --employees 100000          # once
+    python -m benchmarks.run --api http://127.0.0.1:5000 --out results/today.json
+    python -m benchmarks.run --scenario search --scenario leave_listing \\
+        --compare results/yesterday.json
+
+Results are written as JSON (with the git revision and settings) so later runs
+can be compared; ``--compare`` prints the change in req/s and p99 per
+scenario/variant and exits non-zero when any of them regressed by more than
+``--threshold`` percent.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from benchmarks.scenarios import SCENARIOS
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       cwd=os.path.dirname(__file__)).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results):
+    print(f"{'scenario':16s} {'variant':20s} {'req/s':>9s} {'p50 ms':>8s} {'p90 ms':>8s} {'p99 ms':>8s} {'errors':>7s}")
+    for r in results:
+        print(f"{r['scenario']:16s} {r['variant']:20s} {r['rps']:9.1f} {r['p50_ms']:8.2f} "
+              f"{r['p90_ms']:8.2f} {r['p99_ms']:8.2f} {r['errors']:7d}")
+
+
+def compare(results, baseline, threshold):
+    def key(r):
+        return r["scenario"], r["variant"], r["concurrency"]
+
+    previous = {key(r): r for r in baseline["results"]}
+    regressions = 0
+    print(f"\ncompared with {baseline['meta'].get('git_revision')} ({baseline['meta'].get('started_at')}):")
+    for r in results:
+        old = previous.get(key(r))
+        if not old or not old["rps"] or not old["p99_ms"]:
+            continue
+        rps_delta = (r["rps"] - old["rps"]) / old["rps"] * 100
+        p99_delta = (r["p99_ms"] - old["p99_ms"]) / old["p99_ms"] * 100
+        flag = ""
+        if rps_delta < -threshold or p99_delta > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{r['scenario']:16s} {r['variant']:20s} req/s {rps_delta:+7.1f}%  p99 {p99_delta:+7.1f}%{flag}")
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--api", default="http://127.0.0.1:5000")
+    ap.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                    help="scenario to run (repeatable; default: all)")
+    ap.add_argument("--concurrency", type=int, default=20)
+    ap.add_argument("--duration", type=float, default=10, help="seconds per variant")
+    ap.add_argument("--users", type=int, default=100, help="bench users created by datagen")
+    ap.add_argument("--out", help="write results JSON here")
+    ap.add_argument("--compare", metavar="JSON", help="earlier results to compare with")
+    ap.add_argument("--threshold", type=float, default=10, help="regression threshold in percent")
+    args = ap.parse_args()
+
+    settings = {"concurrency": args.concurrency, "duration": args.duration, "users": args.users}
+    base = args.api.rstrip("/")
+    meta = {
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_revision": git_revision(),
+        "api": base,
+        "python": platform.python_version(),
+        "settings": settings,
+    }
+
+    results = []
+    for name in args.scenario or list(SCENARIOS):
+        print(f"running {name} ...", file=sys.stderr)
+        results.extend(SCENARIOS[name](base, settings))
+    print_results(results)
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Scripted API workloads used by ``python -m benchmarks.run``.
+
+Each scenario takes the base URL and run settings and returns a list of
+result rows (see loadtest.run_level) tagged with ``scenario`` and ``variant``.
+They expect a database populated by ``benchmarks.datagen``.
+"""
+import asyncio
+import base64
+import json
+import random
+import urllib.request
+
+from benchmarks.datagen import BENCH_PASSWORD, DESIGNATIONS
+from benchmarks.loadtest import run_level
+
+SEARCH_TERMS = ["shar", "ram", "vik", "engineer", "devops", "kum", "data", "sales", "anita", "rao"]
+
+
+def _run(base, requests, settings, **kwargs):
+    return asyncio.run(run_level(base, requests, settings["concurrency"], settings["duration"], **kwargs))
+
+
+def _get_json(url):
+    with urllib.request.urlopen(url) as resp:
+        return json.load(resp)
+
+
+def _tag(result, scenario, variant):
+    result.update(scenario=scenario, variant=variant)
+    return result
+
+
+def search(base, settings):
+    results = []
+    for mode in ("like", "fulltext", "ngram"):
+        rnd = random.Random(1)
+
+        def next_request(i, mode=mode, rnd=rnd):
+            return "GET", f"/employees?q={rnd.choice(SEARCH_TERMS)}&search_mode={mode}&limit=20", None
+
+        results.append(_tag(_run(base, next_request, settings), "search", mode))
+    return results
+
+
+def _emp_cursor(emp_id):
+    # app.encode_cursor's format for the default listing: [sort_by, order, value, emp_id]
+    raw = json.dumps(["emp_id", "desc", emp_id, emp_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def deep_pagination(base, settings):
+    limit = 50
+    newest = _get_json(f"{base}/employees?limit=1&count=none&paginate=cursor")["data"]
+    if not newest:
+        return []
+    max_id = newest[0]["emp_id"]
+    results = []
+    for page in settings.get("pages", (1, 100, 1000)):
+        offset_path = f"/employees?limit={limit}&page={page}&count=cached"
+        results.append(_tag(_run(base, [("GET", offset_path, None)], settings), "deep_pagination", f"offset p{page}"))
+        # the cursor that page `page` would follow (emp_id sort, newest first)
+        cursor = _emp_cursor(max_id - (page - 1) * limit + 1)
+        cursor_path = f"/employees?limit={limit}&after={cursor}"
+        results.append(_tag(_run(base, [("GET", cursor_path, None)], settings), "deep_pagination", f"cursor p{page}"))
+    return results
+
+
+def login_storm(base, settings):
+    users = settings.get("users", 100)
+
+    def next_request(i):
+        return "POST", "/login", {"username": f"bench{i % users + 1:04d}", "password": BENCH_PASSWORD}
+
+    return [_tag(_run(base, next_request, settings), "login_storm", "bcrypt")]
+
+
+def leave_listing(base, settings):
+    variants = {
+        "first page": "/leaves?limit=50",
+        "status": "/leaves?limit=50&status=pending",
+        "employee": "/leaves?limit=50&emp_id=42",
+        "window": "/leaves?limit=50&start_date=2020-06-01&end_date=2020-06-30",
+        "columns": "/leaves?limit=500&format=columns",
+    }
+    return [
+        _tag(_run(base, [("GET", path, None)], settings), "leave_listing", name)
+        for name, path in variants.items()
+    ]
+
+
+def bulk_writes(base, settings):
+    rows_per_request = settings.get("bulk_rows", 1000)
+    rnd = random.Random(7)
+    counter = [0]
+
+    def next_request(i):
+        counter[0] += 1
+        batch = [{
+            "emp_name": f"Bulk Bench {counter[0]}-{j}",
+            "emp_email": f"bulk{counter[0]}.{j}.{rnd.randrange(10 ** 6)}@bench.invalid",
+            "emp_phone": "9000000000",
+            "emp_designation": rnd.choice(DESIGNATIONS),
+        } for j in range(rows_per_request)]
+        return "POST", "/employees/bulk", batch
+
+    result = _run(base, next_request, settings, max_requests=settings.get("bulk_requests", 20))
+    result["rows_per_sec"] = round(result["rps"] * rows_per_request, 1)
+    return [_tag(result, "bulk_writes", f"{rows_per_request} rows/request")]
+
+
+SCENARIOS = {
+    "search": search,
+    "deep_pagination": deep_pagination,
+    "login_storm": login_storm,
+    "leave_listing": leave_listing,
+    "bulk_writes": bulk_writes,
+}
@@ -0,0 +1,107 @@
+"""Search latency: trigram index vs. a LIKE-style scan.
+
+    python benchmarks/search_bench.py --rows 1000000
+    python benchmarks/search_bench.py --api http://127.0.0.1:5000   # also time the live endpoint
+
+The in-process part generates synthetic employees, builds the trigram index
+and compares it with a linear substring scan over the same rows (what
+``LIKE '%x%'`` does inside the server).  With ``--api`` each query is also sent
+to GET /employees once per search_mode.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import urllib.parse
+import urllib.request
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from search_index import TrigramIndex  # noqa: E402
+
+SYLLABLES = ["ar", "jun", "pri", "ya", "ra", "hul", "sne", "ha", "vik", "ram", "ani", "ta", "ro",
+             "kav", "mit", "ne", "jo", "mar", "li", "fa", "om", "sa", "da", "vid", "el", "ken",
+             "shar", "ma", "pat", "el", "iy", "er", "red", "dy", "gup", "sin", "gh", "kh", "an"]
+TITLES = ["software engineer", "senior software engineer", "qa analyst", "hr manager",
+          "accountant", "sales executive", "product manager", "devops engineer",
+          "data scientist", "support associate"]
+QUERIES = ["sharma", "prija", "engineer", "devops", "vikram gupta", "zz", "data sci", "kenta"]
+
+
+def generate(n, seed=42):
+    rnd = random.Random(seed)
+    for emp_id in range(1, n + 1):
+        first = "".join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 3)))
+        last = "".join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 4)))
+        yield {
+            "emp_id": emp_id,
+            "emp_name": f"{first.title()} {last.title()}",
+            "emp_email": f"{first}.{last}{emp_id}@example.com",
+            "emp_designation": rnd.choice(TITLES).title(),
+        }
+
+
+def like_scan(rows, q):
+    q = q.lower()
+    return [r for r in rows if q in r[0] or q in r[1] or q in r[2]]
+
+
+def timed(fn, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples), result
+
+
+def bench_api(base, queries, repeat):
+    for q in queries:
+        for mode in ("like", "fulltext", "ngram"):
+            url = f"{base}/employees?" + urllib.parse.urlencode({"q": q, "search_mode": mode, "limit": 10})
+
+            def call():
+                with urllib.request.urlopen(url) as resp:
+                    return json.load(resp)
+
+            try:
+                ms, body = timed(call, repeat)
+                print(f"  api {mode:8s} {q!r:14s} {ms:9.2f} ms  total={body.get('total')}")
+            except Exception as e:
+                print(f"  api {mode:8s} {q!r:14s} failed: {e}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--api", help="base URL of a running backend to time as well")
+    args = ap.parse_args()
+
+    print(f"generating {args.rows:,} employees ...")
+    rows = list(generate(args.rows))
+    scan_rows = [(r["emp_name"].lower(), r["emp_email"].lower(), r["emp_designation"].lower()) for r in rows]
+
+    index = TrigramIndex()
+    t0 = time.perf_counter()
+    index.rebuild(rows)
+    print(f"index build: {time.perf_counter() - t0:.2f} s")
+    del rows
+
+    print(f"{'query':14s} {'like scan':>12s} {'trigram':>12s} {'hits':>9s}")
+    for q in QUERIES:
+        like_ms, like_hits = timed(lambda: like_scan(scan_rows, q), args.repeat)
+        idx_ms, idx_hits = timed(lambda: index.search(q), 1)  # first call: uncached
+        print(f"{q!r:14s} {like_ms:9.2f} ms {idx_ms:9.2f} ms {len(idx_hits):9,d}  (like: {len(like_hits):,})")
+
+    if args.api:
+        print(f"\nlive API at {args.api}:")
+        bench_api(args.api.rstrip("/"), QUERIES, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Cold start and steady-state throughput of the production server.
+
+    python benchmarks/startup_bench.py --workers 4 --duration 10
+    python benchmarks/startup_bench.py --workers 4 --no-warm      # compare without warm-up
+
+Starts ``gunicorn -c gunicorn.conf.py`` on a spare port, measures the time
+until the first successful response and the latency of the first requests
+each worker answers, then runs the load generator for ``--duration`` seconds
+and shuts the server down.
+"""
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BACKEND = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+from loadtest import DEFAULT_PATHS, run_level  # noqa: E402
+
+
+def wait_ready(url, timeout):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as resp:
+                if resp.status < 500:
+                    return True
+        except OSError:
+            time.sleep(0.02)
+    return False
+
+
+def first_request_ms(url, n):
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        with urllib.request.urlopen(url) as resp:
+            resp.read()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--port", type=int, default=5055)
+    ap.add_argument("--duration", type=float, default=10)
+    ap.add_argument("--concurrency", type=int, default=50)
+    ap.add_argument("--no-warm", action="store_true", help="skip per-worker warm-up")
+    args = ap.parse_args()
+
+    env = dict(os.environ, WEB_WORKERS=str(args.workers), WEB_BIND=f"127.0.0.1:{args.port}",
+               WEB_ACCESS_LOG="/dev/null")
+    # gunicorn refuses to start without a token signing key
+    env.setdefault("APP_SECRET_KEY", "startup-bench-secret")
+    cmd = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"]
+    if args.no_warm:
+        env["WEB_WARM_UP"] = "0"
+    base = f"http://127.0.0.1:{args.port}"
+
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=BACKEND, env=env)
+    try:
+        if not wait_ready(f"{base}/pool/stats", 60):
+            sys.exit("server did not come up within 60s")
+        ready = time.perf_counter() - t0
+        first = first_request_ms(f"{base}/designations", args.workers * 2)
+        print(f"cold start to first response: {ready * 1000:.0f} ms ({args.workers} workers)")
+        print("first requests (ms): " + ", ".join(f"{ms:.1f}" for ms in first))
+
+        requests = [("GET", p, None) for p in DEFAULT_PATHS]
+        r = asyncio.run(run_level(base, requests, args.concurrency, args.duration))
+        print(f"steady state @ {args.concurrency}: {r['rps']} req/s, p50 {r['p50_ms']} ms, "
+              f"p99 {r['p99_ms']} ms, errors {r['errors']}")
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
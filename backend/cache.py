@@ -0,0 +1,129 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after ``ttl`` seconds.
+
+    Keys may be tuples whose first element names a namespace, which lets a
+    write handler drop every entry of one kind with ``drop(namespace)``.
+    """
+
+    def __init__(self, ttl=30, maxsize=1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def drop(self, namespace):
+        with self._lock:
+            stale = [k for k in self._data if isinstance(k, tuple) and k and k[0] == namespace]
+            for k in stale:
+                del self._data[k]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._data)
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+class Generations:
+    """Cross-process invalidation for the in-process caches.
+
+    Every cache that several worker processes hold a copy of has a row in
+    cache_generations.  A write ``bump``s it (after its own commit); readers
+    call ``check`` before using their copy, which at most every ``interval``
+    seconds reads the table and runs the callbacks of the names whose
+    generation moved, so another worker's write is seen within ``interval``.
+    Callbacks get the time of the last change (``time.time()``).
+    """
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self._callbacks = {}
+        self._seen = {}
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.checks = 0
+
+    def watch(self, name, callback):
+        self._callbacks.setdefault(name, []).append(callback)
+
+    def bump(self, store, name):
+        store.execute("UPDATE cache_generations SET generation = generation + 1, changed_at = %s WHERE name = %s",
+                      (time.time(), name))
+        generation = store.fetch_value("SELECT generation FROM cache_generations WHERE name = %s", (name,))
+        store.commit()
+        with self._lock:
+            # the writer already updated its own copy: skip the callbacks
+            # unless another process changed it since the last check too
+            if self._seen.get(name) == generation - 1:
+                self._seen[name] = generation
+
+    def check(self, get_store):
+        # get_store is only called when a check is due, so hits between checks stay query-free
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at < self.interval:
+                return
+            self._checked_at = now
+        rows = get_store().fetch_all("SELECT name, generation, changed_at FROM cache_generations")
+        self.checks += 1
+        for row in rows:
+            with self._lock:
+                # first look in this process counts as a change: the caches
+                # may have been filled (warm-up) before it
+                if self._seen.get(row["name"]) == row["generation"]:
+                    continue
+                self._seen[row["name"]] = row["generation"]
+            for callback in self._callbacks.get(row["name"], ()):
+                callback(row["changed_at"])
@@ -1,10 +1,245 @@
-import mariadb
-
-def get_connection():
-    return mariadb.connect(
-        user="root",
-        password="root123",
-        host="127.0.0.1",
-        port=3306,
-        database="reactloginapp"
-    )
+import os
+import threading
+import time
+from collections import deque
+
+from flask import g, has_app_context
+
+import storage
+
+POOL_MIN_SIZE = int(os.environ.get("DB_POOL_MIN_SIZE", 2))
+POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", 10))
+POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", 5))            # seconds to wait for a free connection
+POOL_IDLE_TIMEOUT = float(os.environ.get("DB_POOL_IDLE_TIMEOUT", 300))  # close idle connections above min size
+POOL_MAX_LIFETIME = float(os.environ.get("DB_POOL_MAX_LIFETIME", 1800))  # recycle connections older than this
+
+
+class PoolExhausted(Exception):
+    pass
+
+
+class _PooledConn:
+    __slots__ = ("conn", "created_at", "last_used")
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class ConnectionPool:
+    """Thread-safe pool of connections to a storage backend.
+
+    Connections are health-checked (ping) on checkout, recycled once they
+    exceed ``max_lifetime`` and reaped when idle longer than ``idle_timeout``
+    while more than ``min_size`` are open.
+    """
+
+    def __init__(self, backend, min_size=POOL_MIN_SIZE, max_size=POOL_MAX_SIZE,
+                 timeout=POOL_TIMEOUT, idle_timeout=POOL_IDLE_TIMEOUT,
+                 max_lifetime=POOL_MAX_LIFETIME):
+        self.backend = backend
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+
+        self._lock = threading.Condition()
+        self._idle = deque()
+        self._in_use = {}
+        self._opened = 0
+
+        self._checkouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._exhausted = 0
+        self._created = 0
+        self._closed = 0
+        self._failed_checks = 0
+
+    # --- internal helpers (caller holds no lock unless noted) ---
+    def _connect(self):
+        conn = self.backend.connect()
+        with self._lock:
+            self._created += 1
+        return _PooledConn(conn)
+
+    def _discard(self, item):
+        try:
+            item.conn.close()
+        except self.backend.Error:
+            pass
+        with self._lock:
+            self._opened -= 1
+            self._closed += 1
+            self._lock.notify()
+
+    def _healthy(self, item, now):
+        if now - item.created_at > self.max_lifetime:
+            return False
+        try:
+            self.backend.ping(item.conn)
+            return True
+        except self.backend.Error:
+            with self._lock:
+                self._failed_checks += 1
+            return False
+
+    def _reap_idle(self, now):
+        # lock held; returns the connections that should be closed
+        stale = []
+        while len(self._idle) and self._opened - len(stale) > self.min_size:
+            oldest = self._idle[0]
+            if now - oldest.last_used <= self.idle_timeout:
+                break
+            stale.append(self._idle.popleft())
+        return stale
+
+    # --- public API ---
+    def acquire(self):
+        started = time.monotonic()
+        deadline = started + self.timeout
+        while True:
+            item = None
+            create = False
+            with self._lock:
+                while True:
+                    if self._idle:
+                        item = self._idle.pop()  # LIFO keeps hot connections hot
+                        break
+                    if self._opened < self.max_size:
+                        self._opened += 1
+                        create = True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._exhausted += 1
+                        raise PoolExhausted(
+                            f"no free connection after {self.timeout}s (max_size={self.max_size})"
+                        )
+                    self._lock.wait(remaining)
+
+            now = time.monotonic()
+            if create:
+                try:
+                    item = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._opened -= 1
+                        self._lock.notify()
+                    raise
+            elif not self._healthy(item, now):
+                self._discard(item)
+                continue
+
+            waited = time.monotonic() - started
+            with self._lock:
+                self._in_use[id(item.conn)] = item
+                self._checkouts += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+            return item.conn
+
+    def release(self, conn):
+        with self._lock:
+            item = self._in_use.pop(id(conn), None)
+        if item is None:
+            return
+
+        try:
+            # drop whatever the request left uncommitted
+            conn.rollback()
+        except self.backend.Error:
+            self._discard(item)
+            return
+
+        now = time.monotonic()
+        if now - item.created_at > self.max_lifetime:
+            self._discard(item)
+            return
+
+        item.last_used = now
+        with self._lock:
+            self._idle.append(item)
+            stale = self._reap_idle(now)
+            self._lock.notify()
+        for s in stale:
+            self._discard(s)
+
+    def prefill(self):
+        # Check out min_size connections at once (opening any that are missing,
+        # pinging the rest) so the first requests don't pay the handshake.
+        conns = []
+        try:
+            while len(conns) < self.min_size:
+                conns.append(self.acquire())
+        finally:
+            for conn in conns:
+                self.release(conn)
+
+    def close(self):
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+        for item in idle:
+            self._discard(item)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "open": self._opened,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "checkouts": self._checkouts,
+                "wait_avg_ms": round(self._wait_total / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                "wait_max_ms": round(self._wait_max * 1000, 3),
+                "exhausted": self._exhausted,
+                "created": self._created,
+                "closed": self._closed,
+                "failed_health_checks": self._failed_checks,
+            }
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    # pools must not be shared across fork(); rebuild one per process
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is None or _pool_pid != pid:
+        with _pool_lock:
+            if _pool is None or _pool_pid != pid:
+                _pool = ConnectionPool(storage.get_backend())
+                _pool_pid = pid
+    return _pool
+
+
+def get_db():
+    # Inside a request one connection is borrowed and shared by every call
+    # (as a storage.Store); it goes back to the pool on app-context teardown.
+    if has_app_context():
+        store = g.get("_db")
+        if store is None:
+            store = g._db = storage.Store(storage.get_backend(), get_pool().acquire())
+        return store
+    return storage.Store(storage.get_backend(), get_pool().acquire())
+
+
+def release_db(store):
+    get_pool().release(store.conn)
+
+
+def _teardown_db(exc=None):
+    store = g.pop("_db", None)
+    if store is not None:
+        release_db(store)
+
+
+def init_app(app):
+    app.teardown_appcontext(_teardown_db)
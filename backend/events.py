@@ -0,0 +1,278 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+
+EVENTS_DB_PATH = os.environ.get("EVENTS_DB_PATH", "events.db")        # shared by every worker process on the host
+EVENTS_BUFFER = int(os.environ.get("EVENTS_BUFFER", 1000))            # events kept for Last-Event-ID replay
+EVENTS_POLL = float(os.environ.get("EVENTS_POLL", 1))                 # seconds between checks for other processes' events
+EVENTS_HEARTBEAT = float(os.environ.get("EVENTS_HEARTBEAT", 15))      # seconds between keep-alive comments
+EVENTS_RETRY_MS = int(os.environ.get("EVENTS_RETRY_MS", 3000))        # client reconnect delay
+# GET /events from a thread-per-request server (Flask's own /events route);
+# gunicorn.conf.py turns it off, the feed is then served by asgi.py only
+EVENTS_THREADED = os.environ.get("EVENTS_THREADED", "1") == "1"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+  seq INTEGER PRIMARY KEY AUTOINCREMENT,
+  entity TEXT NOT NULL,
+  body TEXT NOT NULL,
+  at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events_meta (
+  name TEXT PRIMARY KEY,
+  value TEXT NOT NULL
+);
+"""
+
+
+class EventBus:
+    """Change feed for GET /events, shared by the worker processes.
+
+    Write handlers ``publish`` after they commit; the event is appended to a
+    change log in a local SQLite file (like the job queue), which numbers it
+    for every process at once.  Each process keeps the last ``buffer``
+    events in memory and a poller thread pulls in the ones other processes
+    wrote, so a client resumes from its Last-Event-ID on whichever worker it
+    reconnects to.  Ids are ``<epoch>-<seq>``; the epoch is stored with the
+    log and only changes when the file is recreated, so a client that missed
+    events (new log, or fell out of the buffer) is told to reload instead of
+    silently skipping or replaying them.
+
+    Thread consumers block in ``wait``; asyncio consumers await
+    ``wait_async``, which parks on one future per event loop, so idle
+    subscribers cost neither threads nor per-subscriber wake-ups.  All state
+    is (re)built on first use in each process, never inherited across a fork.
+    """
+
+    def __init__(self, path=None, buffer=EVENTS_BUFFER, dumps=json.dumps):
+        self.path = path or EVENTS_DB_PATH
+        self.buffer = buffer
+        self.dumps = dumps
+        self.epoch = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._refresh_lock = threading.Lock()
+        self._events = deque(maxlen=buffer)
+        self._seq = 0
+        self._loop_waiters = {}  # event loop -> future resolved by the next event
+        self._pid = None
+        self._poller_pid = None
+        self.published = 0
+
+    def _conn(self):
+        # one connection per thread (and per process, after a fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            conn.execute("INSERT OR IGNORE INTO events_meta (name, value) VALUES ('epoch', ?)",
+                         (uuid.uuid4().hex[:8],))
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _ensure_process(self):
+        # first use in this process: start from the log's tail
+        if self._pid == os.getpid():
+            return
+        with self._refresh_lock:
+            if self._pid == os.getpid():
+                return
+            conn = self._conn()
+            epoch = conn.execute("SELECT value FROM events_meta WHERE name='epoch'").fetchone()[0]
+            rows = conn.execute("SELECT seq, entity, body, at FROM events ORDER BY seq DESC LIMIT ?",
+                                (self.buffer,)).fetchall()
+            last = conn.execute("SELECT seq FROM sqlite_sequence WHERE name='events'").fetchone()
+            with self._lock:
+                self.epoch = epoch
+                self._events.clear()
+                self._events.extend(self._event(*row) for row in reversed(rows))
+                self._seq = last[0] if last else 0
+                self._loop_waiters = {}
+                self._pid = os.getpid()
+
+    def _event(self, seq, entity, body, at):
+        # body is the JSON payload without its id, which the log only knows after the insert
+        event_id = f"{self.epoch}-{seq}"
+        return {"seq": seq, "entity": entity, "at": at,
+                "sse": f'id: {event_id}\ndata: {{"id": "{event_id}", {body[1:]}\n\n'}
+
+    def publish(self, entity, action, data):
+        self._ensure_process()
+        conn = self._conn()
+        # encoded once here, not once per subscriber
+        body = self.dumps({"entity": entity, "action": action, "data": data})
+        at = time.time()
+        seq = conn.execute("INSERT INTO events (entity, body, at) VALUES (?, ?, ?)", (entity, body, at)).lastrowid
+        if seq % 100 == 0:
+            conn.execute("DELETE FROM events WHERE seq <= ?", (seq - self.buffer,))
+        self.published += 1
+        self.refresh()
+        return self._event(seq, entity, body, at)
+
+    def refresh(self):
+        # pull in events logged since the last look (ours and other processes')
+        self._ensure_process()
+        with self._refresh_lock:
+            rows = self._conn().execute("SELECT seq, entity, body, at FROM events WHERE seq > ? ORDER BY seq",
+                                        (self._seq,)).fetchall()
+            if not rows:
+                return
+            with self._lock:
+                if rows[0][0] > self._seq + 1:
+                    self._events.clear()  # the log was trimmed past us; anyone behind must reload
+                self._events.extend(self._event(*row) for row in rows)
+                self._seq = rows[-1][0]
+                waiters = list(self._loop_waiters.items())
+                self._loop_waiters.clear()
+                self._changed.notify_all()
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                pass  # loop already closed
+
+    def start_polling(self):
+        # one poller thread per process, started by the first subscriber
+        self._ensure_process()
+        with self._refresh_lock:
+            if self._poller_pid == os.getpid():
+                return
+            self._poller_pid = os.getpid()
+        threading.Thread(target=self._poll, name="events-poller", daemon=True).start()
+
+    def _poll(self):
+        while True:
+            time.sleep(EVENTS_POLL)
+            try:
+                self.refresh()
+            except sqlite3.Error as e:
+                print("Error reading change feed:", e)
+
+    @property
+    def last_seq(self):
+        self._ensure_process()
+        return self._seq
+
+    def resume_point(self, last_event_id):
+        # seq to resume after, or None when the client must reload (unknown or
+        # foreign id, or events it missed have left the buffer)
+        self._ensure_process()
+        if not last_event_id:
+            return self._seq
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        seq = int(seq)
+        with self._lock:
+            oldest = self._events[0]["seq"] if self._events else self._seq + 1
+            if seq > self._seq or seq < oldest - 1:
+                return None
+        return seq
+
+    def since(self, seq):
+        # events after seq, or None if some of them already left the buffer
+        with self._lock:
+            if self._seq <= seq:
+                return []
+            if not self._events or self._events[0]["seq"] > seq + 1:
+                return None
+            return [e for e in self._events if e["seq"] > seq]
+
+    def wait(self, seq, timeout):
+        with self._changed:
+            if self._seq <= seq:
+                self._changed.wait(timeout)
+
+    async def wait_async(self, seq, timeout):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._seq > seq:
+                return
+            future = self._loop_waiters.get(loop)
+            if future is None:
+                future = self._loop_waiters[loop] = loop.create_future()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def stats(self):
+        self._ensure_process()
+        with self._lock:
+            return {"epoch": self.epoch, "last_seq": self._seq, "buffered": len(self._events),
+                    "published": self.published, "path": self.path}
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+bus = EventBus()
+
+
+def publish(entity, action, data):
+    # called after the write committed; a feed that can't be written must not fail it
+    try:
+        return bus.publish(entity, action, data)
+    except sqlite3.Error as e:
+        print("Error publishing change event:", e)
+        return None
+
+
+def entity_filter(value):
+    # ?entity=designation,department -> set, or None for everything
+    names = {name.strip() for name in (value or "").split(",") if name.strip()}
+    return names or None
+
+
+def format_reset():
+    # resume point lost: the client reloads its lists, then applies deltas again
+    return f"retry: {EVENTS_RETRY_MS}\nid: {bus.epoch}-{bus.last_seq}\nevent: reset\ndata: {{}}\n\n"
+
+
+def start(last_event_id):
+    # (seq to stream after, first chunk)
+    bus.start_polling()
+    seq = bus.resume_point(last_event_id)
+    if seq is None:
+        return bus.last_seq, format_reset()
+    return seq, f"retry: {EVENTS_RETRY_MS}\n\n"
+
+
+def pending(seq, entities):
+    # (new seq, chunks to send); a reset when the subscriber fell behind the buffer
+    events = bus.since(seq)
+    if events is None:
+        return bus.last_seq, [format_reset()]
+    if not events:
+        return seq, []
+    return events[-1]["seq"], [e["sse"] for e in events if entities is None or e["entity"] in entities]
+
+
+def stream(last_event_id, entities, heartbeat=EVENTS_HEARTBEAT):
+    """SSE chunks for a thread-per-connection server (Flask dev server, gunicorn)."""
+    seq, first = start(last_event_id)
+    yield first
+    while True:
+        seq, chunks = pending(seq, entities)
+        if not chunks:
+            bus.wait(seq, heartbeat)
+            seq, chunks = pending(seq, entities)
+        if chunks:
+            yield "".join(chunks)
+        else:
+            yield ": ping\n\n"
+
+
+def init_app(app):
+    # event payloads hold rows with dates; encode them like the API does
+    bus.dumps = app.json.dumps
@@ -0,0 +1,72 @@
+# Production server:  gunicorn -c gunicorn.conf.py
+#
+# Pre-forks WEB_WORKERS processes from a preloaded app. Each worker builds its
+# own DB pool after fork and warms it (plus the master-data / dashboard caches)
+# before it accepts traffic.
+#   deploy new code without dropping requests (the app is preloaded in the
+#   master, so kill -HUP would restart workers on the old code):
+#     kill -USR2 <old master pid>    start a new master + workers on the new code
+#     kill -WINCH <old master pid>   let the old workers finish and exit
+#     kill -QUIT <old master pid>    once the new ones serve (-HUP it instead to roll back)
+#   kill -HUP only re-reads this file's settings; code changes are not picked up
+#   add / remove a worker:  kill -TTIN / -TTOU <master pid>
+#
+# GET /events is not served here: each subscriber would hold one of a
+# worker's few threads for as long as its page is open. Route /events on the
+# proxy to the ASGI server (uvicorn asgi:application), which shares the same
+# change log (EVENTS_DB_PATH) and parks subscribers on its event loop.
+import multiprocessing
+import os
+
+wsgi_app = "app:app"
+bind = os.environ.get("WEB_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.environ.get("WEB_THREADS", 4))
+
+# recycle workers after this many requests (with jitter so they don't all restart together)
+max_requests = int(os.environ.get("WEB_MAX_REQUESTS", 10000))
+max_requests_jitter = int(os.environ.get("WEB_MAX_REQUESTS_JITTER", max_requests // 10))
+
+graceful_timeout = int(os.environ.get("WEB_GRACEFUL_TIMEOUT", 30))
+timeout = int(os.environ.get("WEB_TIMEOUT", 60))
+keepalive = 5
+
+# import the app once in the master; workers fork from it copy-on-write
+preload_app = True
+
+accesslog = os.environ.get("WEB_ACCESS_LOG", "-")
+
+warm_up_workers = os.environ.get("WEB_WARM_UP", "1") == "1"
+
+# read by events.py when the preloaded app is imported, after this file
+os.environ.setdefault("EVENTS_THREADED", "0")
+
+
+def on_starting(server):
+    # once, in the master: no token signing key, no server; pending
+    # migrations and hot queries without an index are logged
+    # (MIGRATE_CHECK=strict refuses to start, =off skips it)
+    from auth import require_secret_key
+    from migrate import startup_check
+    require_secret_key()
+    startup_check()
+
+
+def post_fork(server, worker):
+    # never inherit the master's pool (db.get_pool also rebuilds on pid change)
+    import db
+    db._pool = None
+
+
+def post_worker_init(worker):
+    if not warm_up_workers:
+        return
+    from warmup import warm_up
+
+    try:
+        elapsed = warm_up()
+        worker.log.info("worker %s warmed up in %.3fs", worker.pid, elapsed)
+    except Exception as e:
+        # serve anyway; the caches fill on first use
+        worker.log.warning("worker %s warm-up failed: %s", worker.pid, e)
@@ -0,0 +1,302 @@
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+import events
+
+JOBS_DB_PATH = os.environ.get("JOBS_DB_PATH", "jobs.db")
+JOBS_ARTIFACT_DIR = os.environ.get("JOBS_ARTIFACT_DIR", "job_artifacts")
+JOBS_WORKERS = int(os.environ.get("JOBS_WORKERS", 2))              # worker threads per process; 0 = submit only
+JOBS_MAX_ATTEMPTS = int(os.environ.get("JOBS_MAX_ATTEMPTS", 3))
+JOBS_RETRY_BASE = float(os.environ.get("JOBS_RETRY_BASE", 5))      # seconds before the first retry, doubled after each
+JOBS_RETRY_MAX = float(os.environ.get("JOBS_RETRY_MAX", 300))
+JOBS_LEASE = float(os.environ.get("JOBS_LEASE", 300))              # a running job silent this long (worker died) is retried
+JOBS_POLL = float(os.environ.get("JOBS_POLL", 2))                  # idle workers look for due retries this often
+JOBS_RETENTION = float(os.environ.get("JOBS_RETENTION", 7 * 86400))  # finished jobs and their files are then purged
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+  id TEXT PRIMARY KEY,
+  kind TEXT NOT NULL,
+  params TEXT NOT NULL,
+  status TEXT NOT NULL DEFAULT 'queued',  -- queued, running, succeeded, failed
+  attempts INTEGER NOT NULL DEFAULT 0,
+  max_attempts INTEGER NOT NULL,
+  progress REAL,
+  message TEXT,
+  result TEXT,
+  artifact TEXT,
+  error TEXT,
+  run_after REAL NOT NULL,
+  lease_until REAL,
+  created_at REAL NOT NULL,
+  started_at REAL,
+  finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_due ON jobs (status, run_after);
+"""
+
+# kind -> (function, max_attempts); filled by @task in app.py
+TASKS = {}
+
+
+def task(kind, max_attempts=None):
+    # The function is called as fn(job, **params) inside an app context and
+    # returns the JSON result; raise JobFailed for errors a retry won't fix.
+    def register(fn):
+        TASKS[kind] = (fn, max_attempts)
+        return fn
+    return register
+
+
+class JobFailed(Exception):
+    pass
+
+
+class Job:
+    """What a running task sees of its job: progress reporting and artifact files."""
+
+    def __init__(self, queue, row):
+        self.queue = queue
+        self.id = row["id"]
+        self.kind = row["kind"]
+        self.attempt = row["attempts"]
+        self.artifact = None
+
+    def progress(self, fraction=None, message=None):
+        # also renews the lease, so long jobs should report now and then
+        self.queue._progress(self.id, fraction, message)
+
+    def artifact_path(self, filename):
+        os.makedirs(self.queue.artifact_dir, exist_ok=True)
+        self.artifact = os.path.join(self.queue.artifact_dir, f"{self.id}-{filename}")
+        return self.artifact
+
+
+class JobQueue:
+    """Persistent job queue in a local SQLite file.
+
+    Jobs are rows; worker threads claim the oldest due one inside a
+    BEGIN IMMEDIATE transaction, so several processes (gunicorn workers) can
+    share one file without running a job twice.  A failed attempt is
+    requeued with exponential backoff until ``max_attempts``; a worker that
+    dies mid-job stops renewing its lease and the job is picked up again.
+    Workers are started in the process that first uses the queue, never
+    before a fork.
+    """
+
+    def __init__(self, path=None, artifact_dir=None, workers=JOBS_WORKERS):
+        self.path = path or JOBS_DB_PATH
+        self.artifact_dir = artifact_dir or JOBS_ARTIFACT_DIR
+        self.workers = workers
+        self.runner = lambda fn, job, params: fn(job, **params)
+        self.dumps = json.dumps
+        self._local = threading.local()
+        self._wake = threading.Event()
+        self._start_lock = threading.Lock()
+        self._pid = None
+        self._purged_at = 0
+
+    def _conn(self):
+        # one connection per thread (and per process, after a fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def submit(self, kind, params=None, max_attempts=None):
+        # ValueError for an unknown kind, params the task doesn't accept or a
+        # bad max_attempts; it may lower the task's own limit, never raise it
+        params = params or {}
+        if kind not in TASKS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        fn, task_attempts = TASKS[kind]
+        try:
+            inspect.signature(fn).bind(None, **params)
+        except TypeError as e:
+            raise ValueError(f"Invalid params for {kind}: {e}")
+        limit = task_attempts or JOBS_MAX_ATTEMPTS
+        if max_attempts is None:
+            max_attempts = limit
+        elif type(max_attempts) is not int or max_attempts < 1:
+            raise ValueError("max_attempts must be a positive integer")
+
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._conn().execute(
+            "INSERT INTO jobs (id, kind, params, max_attempts, run_after, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, kind, self.dumps(params), min(max_attempts, limit), now, now),
+        )
+        self.start()
+        self._wake.set()
+        return job_id
+
+    def get(self, job_id):
+        row = self._conn().execute("SELECT * FROM jobs WHERE id=?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+    def start(self):
+        with self._start_lock:
+            if self._pid == os.getpid() or self.workers <= 0:
+                return
+            self._pid = os.getpid()
+            for i in range(self.workers):
+                threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True).start()
+
+    def _claim(self):
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # lease expired: its worker died; retry it if attempts are left
+            conn.execute("""
+              UPDATE jobs SET status='failed', error='Worker stopped during the last attempt',
+                              finished_at=?, lease_until=NULL
+              WHERE status = 'running' AND lease_until < ? AND attempts >= max_attempts
+            """, (now, now))
+            row = conn.execute("""
+              SELECT id FROM jobs
+              WHERE (status = 'queued' AND run_after <= ?) OR (status = 'running' AND lease_until < ?)
+              ORDER BY run_after LIMIT 1
+            """, (now, now)).fetchone()
+            if row is not None:
+                conn.execute("""
+                  UPDATE jobs SET status='running', attempts=attempts+1, lease_until=?, started_at=?
+                  WHERE id=?
+                """, (now + JOBS_LEASE, now, row["id"]))
+                row = conn.execute("SELECT * FROM jobs WHERE id=?", (row["id"],)).fetchone()
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return row
+
+    def _progress(self, job_id, fraction, message):
+        self._conn().execute(
+            "UPDATE jobs SET progress=COALESCE(?, progress), message=COALESCE(?, message), lease_until=? "
+            "WHERE id=? AND status='running'",
+            (fraction, message, time.time() + JOBS_LEASE, job_id),
+        )
+
+    def _run(self, row):
+        fn, _ = TASKS.get(row["kind"], (None, None))
+        job = Job(self, row)
+        try:
+            if fn is None:
+                raise JobFailed(f"Unknown job kind: {row['kind']}")
+            result = self.runner(fn, job, json.loads(row["params"]))
+        except Exception as e:
+            print("Error in job", row["id"], row["kind"], e)
+            try:
+                self._failed(row, e, retry=not isinstance(e, JobFailed))
+            except Exception as e:
+                print("Error recording job failure", row["id"], e)
+            return
+        self._conn().execute("""
+          UPDATE jobs SET status='succeeded', progress=1, result=?, artifact=?, error=NULL,
+                          finished_at=?, lease_until=NULL
+          WHERE id=?
+        """, (self.dumps(result), job.artifact, time.time(), row["id"]))
+        events.publish("job", "succeeded", {"id": row["id"], "kind": row["kind"]})
+
+    def _failed(self, row, error, retry):
+        now = time.time()
+        if retry and row["attempts"] < row["max_attempts"]:
+            delay = min(JOBS_RETRY_BASE * 2 ** (row["attempts"] - 1), JOBS_RETRY_MAX)
+            self._conn().execute(
+                "UPDATE jobs SET status='queued', run_after=?, error=?, lease_until=NULL WHERE id=?",
+                (now + delay, str(error), row["id"]),
+            )
+            return
+        self._conn().execute(
+            "UPDATE jobs SET status='failed', error=?, finished_at=?, lease_until=NULL WHERE id=?",
+            (str(error), now, row["id"]),
+        )
+        events.publish("job", "failed", {"id": row["id"], "kind": row["kind"], "error": str(error)})
+
+    def _work(self):
+        while True:
+            self._wake.clear()
+            try:
+                row = self._claim()
+            except sqlite3.Error as e:
+                print("Error claiming job:", e)
+                row = None
+            if row is not None:
+                try:
+                    self._run(row)
+                except Exception as e:
+                    # never let a bad row take the worker thread down; an
+                    # unfinished job comes back when its lease runs out
+                    print("Error running job", row["id"], e)
+                continue
+            self._purge()
+            self._wake.wait(JOBS_POLL)
+
+    def _purge(self):
+        now = time.time()
+        if now - self._purged_at < 3600:
+            return
+        self._purged_at = now
+        try:
+            conn = self._conn()
+            old = conn.execute("SELECT id, artifact FROM jobs WHERE finished_at < ?",
+                               (now - JOBS_RETENTION,)).fetchall()
+            for row in old:
+                if row["artifact"] and os.path.exists(row["artifact"]):
+                    os.remove(row["artifact"])
+            conn.executemany("DELETE FROM jobs WHERE id=?", [(row["id"],) for row in old])
+        except (sqlite3.Error, OSError) as e:
+            print("Error purging jobs:", e)
+
+    @property
+    def upload_dir(self):
+        # request bodies a job reads later (e.g. a CSV import) are parked here
+        return os.path.join(self.artifact_dir, "uploads")
+
+    def upload_path(self, suffix):
+        os.makedirs(self.upload_dir, exist_ok=True)
+        return os.path.join(self.upload_dir, uuid.uuid4().hex + suffix)
+
+
+job_queue = JobQueue()
+
+
+def submit(kind, params=None, max_attempts=None):
+    return job_queue.submit(kind, params, max_attempts)
+
+
+def init_app(app):
+    def run_in_app(fn, job, params):
+        # the task's get_db() borrows a pooled connection, released on teardown
+        with app.app_context():
+            return fn(job, **params)
+
+    job_queue.runner = run_in_app
+    job_queue.dumps = app.json.dumps
+    # start workers in the serving process (after gunicorn's fork), not at import
+    app.before_request(job_queue.start)
+
+
+if __name__ == "__main__":
+    # A dedicated worker process: python -m jobs (set JOBS_WORKERS=0 on the web servers)
+    import jobs
+    from app import app  # registers the tasks
+    jobs.job_queue.workers = max(jobs.job_queue.workers, 1)
+    jobs.job_queue.start()
+    print(f"Job worker running: {jobs.job_queue.workers} threads on {jobs.job_queue.path}")
+    threading.Event().wait()
@@ -0,0 +1,212 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+
+LEAVE_INDEX_MAX_AGE = float(os.environ.get("LEAVE_INDEX_MAX_AGE", 300))  # seconds before a full reload
+# days per calendar year by leave type; types not listed (e.g. unpaid) are unlimited
+LEAVE_ALLOWANCES = {"sick": 12, "casual": 12, "earned": 18, "maternity": 182}
+LEAVE_ALLOWANCES.update(json.loads(os.environ.get("LEAVE_ALLOWANCES", "{}")))
+
+_END = float("inf")
+
+
+class LeaveIndex:
+    """In-process interval index over leave_requests.
+
+    Dates are kept as ordinals. Each employee has its leaves sorted by start
+    date (balances, overlap listings), and all leaves share one list sorted by
+    start plus the longest interval seen: a window [a, b] only has to look at
+    starts in [a - max_len, b] instead of the whole history.  The leave write
+    endpoints keep it current and bump the "leaves" cache generation, which
+    marks the other workers' copies stale (``mark_stale``); it is also
+    reloaded once older than ``max_age``.  A reload
+    is built beside the live index and swapped in, with the writes made
+    meanwhile replayed on top, so it never blocks readers or writers.
+    """
+
+    def __init__(self, max_age=LEAVE_INDEX_MAX_AGE):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._loaded_at = None
+        self._stale_marks = 0
+        self._journal = None  # updates made while a reload is being built
+        self.loaded = False
+        self._leaves = {}     # leave_id -> (emp_id, start, end, leave_type, status)
+        self._by_emp = {}     # emp_id -> [(start, end, leave_id)] sorted
+        self._starts = []     # [(start, leave_id)] sorted
+        self._max_len = 0
+
+    @property
+    def fresh(self):
+        loaded_at = self._loaded_at
+        return loaded_at is not None and time.monotonic() - loaded_at <= self.max_age
+
+    def load(self, rows):
+        # fill a new instance without holding the lock, then swap its contents in
+        with self._lock:
+            self._journal = []
+            marks = self._stale_marks
+        try:
+            new = LeaveIndex()
+            for row in rows:
+                new._insert(row)
+            for intervals in new._by_emp.values():
+                intervals.sort()
+            new._starts.sort()
+            with self._lock:
+                self._leaves, self._by_emp = new._leaves, new._by_emp
+                self._starts, self._max_len = new._starts, new._max_len
+                for fn in self._journal:
+                    fn()
+                # marked stale while building: the rows read may predate that change
+                self._loaded_at = time.monotonic() if self._stale_marks == marks else None
+                self.loaded = True
+        finally:
+            with self._lock:
+                self._journal = None
+
+    def _insert(self, row, keep_sorted=False):
+        leave_id = row["leave_id"]
+        start, end = row["start_date"].toordinal(), row["end_date"].toordinal()
+        self._leaves[leave_id] = (row["emp_id"], start, end, row["leave_type"], row["status"])
+        intervals = self._by_emp.setdefault(row["emp_id"], [])
+        if keep_sorted:
+            insort(intervals, (start, end, leave_id))
+            insort(self._starts, (start, leave_id))
+        else:
+            intervals.append((start, end, leave_id))
+            self._starts.append((start, leave_id))
+        self._max_len = max(self._max_len, end - start)
+
+    def _delete(self, leave_id):
+        entry = self._leaves.pop(leave_id, None)
+        if entry is None:
+            return
+        emp_id, start, end = entry[:3]
+        intervals = self._by_emp[emp_id]
+        del intervals[bisect_left(intervals, (start, end, leave_id))]
+        if not intervals:
+            del self._by_emp[emp_id]
+        del self._starts[bisect_left(self._starts, (start, leave_id))]
+
+    def _adjust(self, fn):
+        # incremental updates only make sense on top of a loaded index
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(fn)
+            if self.loaded:
+                fn()
+
+    def add(self, row):
+        # replayed after a reload whose rows may already hold it: same as update
+        self.update(row)
+
+    def remove(self, leave_id):
+        self._adjust(lambda: self._delete(leave_id))
+
+    def remove_employee(self, emp_id):
+        # leave rows deleted by the employee_master cascade
+        def apply():
+            for _, _, leave_id in list(self._by_emp.get(emp_id, ())):
+                self._delete(leave_id)
+        self._adjust(apply)
+
+    def update(self, row):
+        def apply():
+            self._delete(row["leave_id"])
+            self._insert(row, keep_sorted=True)
+        self._adjust(apply)
+
+    def mark_stale(self):
+        with self._lock:
+            self._loaded_at = None
+            self._stale_marks += 1
+
+    def _entry(self, leave_id):
+        emp_id, start, end, leave_type, status = self._leaves[leave_id]
+        return {
+            "leave_id": leave_id,
+            "emp_id": emp_id,
+            "leave_type": leave_type,
+            "status": status,
+            "start_date": date.fromordinal(start),
+            "end_date": date.fromordinal(end),
+        }
+
+    def employee_leaves(self, emp_id, start=None, end=None):
+        # the employee's leaves overlapping [start, end], by start date
+        a = start.toordinal() if start else 0
+        b = end.toordinal() if end else _END
+        with self._lock:
+            intervals = self._by_emp.get(emp_id, ())
+            hi = bisect_right(intervals, (b, _END, _END))
+            return [self._entry(i) for s, e, i in intervals[:hi] if e >= a]
+
+    def window(self, start, end, emp_ids=None, statuses=None):
+        """Leaves overlapping [start, end], optionally for a set of employees."""
+        a, b = start.toordinal(), end.toordinal()
+        with self._lock:
+            if emp_ids is not None and len(emp_ids) < 64:
+                # a handful of employees: walk their own lists
+                ids = [i for emp_id in emp_ids
+                       for s, e, i in self._by_emp.get(emp_id, ()) if s <= b and e >= a]
+            else:
+                lo = bisect_left(self._starts, (a - self._max_len,))
+                hi = bisect_right(self._starts, (b, _END))
+                ids = [i for s, i in self._starts[lo:hi] if self._leaves[i][2] >= a]
+                if emp_ids is not None:
+                    ids = [i for i in ids if self._leaves[i][0] in emp_ids]
+            rows = [self._entry(i) for i in ids]
+        if statuses:
+            rows = [r for r in rows if r["status"] in statuses]
+        rows.sort(key=lambda r: (r["start_date"], r["leave_id"]))
+        return rows
+
+    def balance(self, emp_id, year, allowances=LEAVE_ALLOWANCES):
+        # days taken per leave type within the calendar year (clipped to it)
+        first, last = date(year, 1, 1).toordinal(), date(year, 12, 31).toordinal()
+        used = {}
+        for leave in self.employee_leaves(emp_id, date(year, 1, 1), date(year, 12, 31)):
+            if leave["status"] == "rejected":
+                continue
+            days = min(leave["end_date"].toordinal(), last) - max(leave["start_date"].toordinal(), first) + 1
+            counts = used.setdefault(leave["leave_type"], {"approved": 0, "pending": 0})
+            counts["approved" if leave["status"] == "approved" else "pending"] += days
+
+        types = []
+        for leave_type in sorted(set(allowances) | set(used)):
+            counts = used.get(leave_type, {"approved": 0, "pending": 0})
+            allowance = allowances.get(leave_type)
+            types.append({
+                "leave_type": leave_type,
+                "allowance": allowance,
+                "approved_days": counts["approved"],
+                "pending_days": counts["pending"],
+                "remaining": None if allowance is None else allowance - counts["approved"],
+            })
+        return types
+
+
+leave_index = LeaveIndex()
+
+
+def ensure_leave_index(store):
+    if leave_index.fresh:
+        return leave_index
+    # one reload at a time; once there is an index, other requests use it meanwhile
+    if not leave_index._build_lock.acquire(blocking=not leave_index.loaded):
+        return leave_index
+    try:
+        if not leave_index.fresh:
+            batches = store.stream(
+                "SELECT leave_id, emp_id, leave_type, start_date, end_date, status FROM leave_requests",
+                dictionary=True,
+            )
+            leave_index.load(row for batch in batches for row in batch)
+    finally:
+        leave_index._build_lock.release()
+    return leave_index
@@ -0,0 +1,230 @@
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+
+from flask import has_request_context, request
+
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", 200))
+SLOW_QUERY_EXPLAIN = os.environ.get("SLOW_QUERY_EXPLAIN", "0") == "1"
+SLOW_QUERY_KEEP = 100  # recent slow queries kept for /metrics/slow-queries
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+slow_log = logging.getLogger("slow_query")
+
+_statement_re = re.compile(
+    r"^\s*(SELECT|INSERT|UPDATE|DELETE|REPLACE|EXPLAIN)\b.*?\b(?:FROM|INTO|UPDATE)\s+`?(\w+)",
+    re.IGNORECASE | re.DOTALL,
+)
+_space_re = re.compile(r"\s+")
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    """Route and query metrics, rendered in Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.routes = {}        # (method, route, status) -> Histogram
+        self.queries = {}       # statement label -> Histogram
+        self.query_rows = {}    # statement label -> rows returned / affected
+        self.slow_total = 0
+        self.slow_queries = deque(maxlen=SLOW_QUERY_KEEP)
+
+    def observe_route(self, method, route, status, seconds):
+        key = (method, route, str(status))
+        with self._lock:
+            hist = self.routes.get(key)
+            if hist is None:
+                hist = self.routes[key] = Histogram()
+            hist.observe(seconds)
+
+    def observe_query(self, label, seconds):
+        with self._lock:
+            hist = self.queries.get(label)
+            if hist is None:
+                hist = self.queries[label] = Histogram()
+            hist.observe(seconds)
+
+    def add_rows(self, label, rows):
+        if rows > 0:
+            with self._lock:
+                self.query_rows[label] = self.query_rows.get(label, 0) + rows
+
+    def record_slow(self, entry):
+        with self._lock:
+            self.slow_total += 1
+            self.slow_queries.append(entry)
+
+    def recent_slow(self):
+        with self._lock:
+            return list(self.slow_queries)
+
+    def render(self, gauges=()):
+        lines = []
+        with self._lock:
+            _render_histograms(lines, "http_request_duration_seconds",
+                               "Request latency by route", ("method", "route", "status"), self.routes)
+            _render_histograms(lines, "db_query_duration_seconds",
+                               "Query latency by statement", ("statement",), {(k,): v for k, v in self.queries.items()})
+            lines.append("# HELP db_query_rows_total Rows fetched or affected by statement")
+            lines.append("# TYPE db_query_rows_total counter")
+            for label, rows in sorted(self.query_rows.items()):
+                lines.append(f'db_query_rows_total{{statement="{_escape(label)}"}} {rows}')
+            lines.append(f"# HELP db_slow_queries_total Queries slower than {SLOW_QUERY_MS:g} ms")
+            lines.append("# TYPE db_slow_queries_total counter")
+            lines.append(f"db_slow_queries_total {self.slow_total}")
+        for name, help_text, value in gauges:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_histograms(lines, name, help_text, label_names, histograms):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for key, hist in sorted(histograms.items()):
+        labels = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(label_names, key))
+        cumulative = 0
+        for bound, count in zip(hist.buckets, hist.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {hist.count}')
+        lines.append(f"{name}_sum{{{labels}}} {hist.sum:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+
+registry = Registry()
+
+
+def statement_label(sql):
+    # "SELECT employee_master" etc.; keeps label cardinality bounded
+    m = _statement_re.match(sql)
+    if m:
+        return f"{m.group(1).upper()} {m.group(2)}"
+    return (sql.strip().split(None, 1) or ["?"])[0].upper()
+
+
+class InstrumentedCursor:
+    """Times execute()/executemany() and counts fetched rows; delegates the rest."""
+
+    def __init__(self, cursor, explain, buffered):
+        self._cursor = cursor
+        self._explain_fn = explain
+        self._buffered = buffered
+        self._label = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        for row in self._cursor:
+            registry.add_rows(self._label, 1)
+            yield row
+
+    def _timed(self, fn, sql, params):
+        self._label = statement_label(sql)
+        started = time.perf_counter()
+        try:
+            return fn(sql, params)
+        finally:
+            elapsed = time.perf_counter() - started
+            registry.observe_query(self._label, elapsed)
+            if elapsed * 1000 >= SLOW_QUERY_MS:
+                self._log_slow(sql, params, elapsed)
+
+    def execute(self, sql, params=()):
+        result = self._timed(self._cursor.execute, sql, params)
+        if not sql.lstrip().upper().startswith("SELECT"):
+            registry.add_rows(self._label, max(self._cursor.rowcount or 0, 0))
+        return result
+
+    def executemany(self, sql, seq_params):
+        result = self._timed(self._cursor.executemany, sql, seq_params)
+        registry.add_rows(self._label, max(self._cursor.rowcount or 0, 0))
+        return result
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            registry.add_rows(self._label, 1)
+        return row
+
+    def fetchmany(self, *args):
+        rows = self._cursor.fetchmany(*args)
+        registry.add_rows(self._label, len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        registry.add_rows(self._label, len(rows))
+        return rows
+
+    def _log_slow(self, sql, params, elapsed):
+        statement = _space_re.sub(" ", sql).strip()
+        entry = {
+            "at": time.time(),
+            "ms": round(elapsed * 1000, 2),
+            "statement": statement,
+            "route": request.path if has_request_context() else None,
+        }
+        # EXPLAIN needs the connection free; unbuffered cursors still hold it
+        if SLOW_QUERY_EXPLAIN and self._buffered and statement.upper().startswith("SELECT"):
+            entry["explain"] = self._explain(sql, params)
+        registry.record_slow(entry)
+        slow_log.warning("slow query %.1f ms on %s: %s", entry["ms"], entry["route"], statement[:500])
+
+    def _explain(self, sql, params):
+        try:
+            return self._explain_fn(sql, params)
+        except Exception as e:
+            return str(e)
+
+
+def instrument(cursor, explain, buffered=True):
+    # explain(sql, params) returns the query plan for the slow-query log
+    return InstrumentedCursor(cursor, explain, buffered) if METRICS_ENABLED else cursor
+
+
+def _start_timer():
+    # kept in the request's environ, not g: /batch sub-requests share the
+    # outer request's app context (and g) but each has its own environ
+    request.environ["metrics.started"] = time.perf_counter()
+
+
+def _observe_request(response):
+    started = request.environ.pop("metrics.started", None)
+    if started is not None:
+        rule = request.url_rule.rule if request.url_rule else "unmatched"
+        registry.observe_route(request.method, rule, response.status_code, time.perf_counter() - started)
+    return response
+
+
+def init_app(app):
+    if METRICS_ENABLED:
+        app.before_request(_start_timer)
+        app.after_request(_observe_request)
@@ -0,0 +1,249 @@
+"""Schema migrations and query-plan checks.
+
+    python -m migrate up        apply pending migrations/NNN_*.sql, in order
+    python -m migrate status    list applied / pending / edited-since-applied
+    python -m migrate verify    EXPLAIN the hot queries; exit 1 if one scans or sorts
+
+Applied versions are recorded in schema_migrations with a checksum of the
+file.  Every migration is re-runnable (IF NOT EXISTS), so ``up`` against a
+database that was built by hand just records what is already there, and a
+migration that failed half-way can simply be run again (MariaDB commits each
+DDL statement on its own).
+
+The embedded SQLite backend builds and upgrades its file from
+storage/sqlite_schema.sql on connect, so ``up`` and ``status`` only concern
+MariaDB; ``verify`` checks both.
+"""
+import argparse
+import hashlib
+import os
+import re
+import sys
+
+import storage
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "migrations")
+MIGRATE_CHECK = os.environ.get("MIGRATE_CHECK", "warn")           # startup check: off, warn or strict
+VERIFY_MIN_ROWS = int(os.environ.get("VERIFY_MIN_ROWS", 1000))    # MariaDB scans smaller tables on purpose
+
+MIGRATION_FILE = re.compile(r"^(\d{3})_(\w+)\.sql$")
+
+SCHEMA_MIGRATIONS = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+  version CHAR(3) PRIMARY KEY,
+  name VARCHAR(255) NOT NULL,
+  checksum CHAR(64) NOT NULL,
+  applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+# (name, sql, params, allowed) for the queries app.py runs on every page view.
+# The listings come from app.py's own builders with sample filters; every
+# one must be answered from an index unless `allowed` names the exception:
+#   "scan"  reads the table in primary-key order and stops at the LIMIT (or
+#           the whole, small table is the answer)
+#   "sort"  sorts a range that is already bounded by an index
+FIXED_QUERIES = [
+    ("login", "SELECT password, full_name, email, phone FROM users WHERE username=%s", ("admin",), ()),
+    ("employee by id", "SELECT * FROM employee_master WHERE emp_id=%s", (1,), ()),
+    ("leave by id", "SELECT l.*, e.emp_name FROM leave_requests l "
+                    "LEFT JOIN employee_master e ON e.emp_id = l.emp_id WHERE l.leave_id = %s", (1,), ()),
+    ("leave overlap check",
+     "SELECT leave_id, leave_type, start_date, end_date, status FROM leave_requests "
+     "WHERE emp_id = %s AND start_date <= %s AND end_date >= %s AND status <> 'rejected' ORDER BY start_date",
+     (1, "2025-12-31", "2025-12-01"), ()),
+    ("dashboard leave counts", "SELECT status, leave_type, COUNT(*) FROM leave_requests GROUP BY status, leave_type",
+     (), ()),
+    ("designations", "SELECT desig_id, title, description, created_at FROM designation_master "
+                     "ORDER BY desig_id DESC", (), ("scan",)),
+    ("departments", "SELECT dept_id, dept_name, description, created_at FROM department_master "
+                    "ORDER BY dept_id DESC", (), ("scan",)),
+]
+
+EMPLOYEE_SEARCHES = [{"q": "smith"}, {"name": "smith"}, {"email": "example"}, {"designation": "engineer"}]
+LEAVE_FILTERS = [
+    {}, {"emp_id": "1"}, {"status": "pending"}, {"status": "pending", "leave_type": "sick"},
+    {"emp_id": "1", "status": "pending"},
+    {"start_date": "2025-03-01", "end_date": "2025-03-31"},
+    {"start_date": "2025-03-01", "end_date": "2025-03-31", "status": "approved"},
+    {"start_date": "2025-03-01", "end_date": "2025-03-31", "emp_id": "1"},
+]
+
+
+def hot_queries(store):
+    # imported here: app imports this module
+    from werkzeug.datastructures import MultiDict
+    import app
+
+    queries = list(FIXED_QUERIES)
+    for sort_by in sorted(app.EMPLOYEE_SORT_COLUMNS):
+        walk = ("scan",) if sort_by == "emp_id" else ()
+        queries.append((f"employees sorted by {sort_by}",
+                        app.employee_page_sql([], sort_by, "desc", offset=True), [50, 0], walk))
+        cond, params = app.keyset_condition(sort_by, "desc", "m", 100)
+        queries.append((f"employees keyset by {sort_by}",
+                        app.employee_page_sql([cond], sort_by, "desc"), params + [51], ()))
+    for args in EMPLOYEE_SEARCHES:
+        where_clauses, params = app.employee_filters(MultiDict(args))
+        label = ", ".join(f"{k}=" for k in args)
+        # LIKE '%term%' cannot seek: the page is read in sort order until full
+        queries.append((f"employees filtered by {label}",
+                        app.employee_page_sql(where_clauses, "emp_id", "desc", offset=True), params + [50, 0],
+                        ("scan",)))
+        queries.append((f"employees filtered by {label} sorted by emp_name",
+                        app.employee_page_sql(where_clauses, "emp_name", "asc", offset=True), params + [50, 0],
+                        ()))
+    if store.supports_fulltext:
+        where_clauses, params = app.employee_filters(MultiDict({"q": "smith", "search_mode": "fulltext"}))
+        queries.append(("employees fulltext search",
+                        app.employee_page_sql(where_clauses, "emp_id", "desc", offset=True), params + [50, 0],
+                        ()))
+    for args in LEAVE_FILTERS:
+        where_clauses, params = app.leave_filters(MultiDict(args))
+        label = ", ".join(f"{k}=" for k in args) or "no filter"
+        # sorted into leave_id order: a date range, or one status's rows
+        # (idx_leave_status_type is ordered by leave_type within a status)
+        ranged = "start_date" in args or set(args) == {"status"}
+        queries.append((f"leaves page ({label})", app.leave_page_sql(where_clauses), params + [51],
+                        ("sort",) if ranged else () if where_clauses else ("scan",)))
+        queries.append((f"leaves after cursor ({label})",
+                        app.leave_page_sql(where_clauses + ["l.leave_id < %s"]), params + [1000, 51],
+                        ("sort",) if ranged else ()))
+    return queries
+
+
+def migrations():
+    # [(version, name, path, checksum)] in version order
+    found = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = MIGRATION_FILE.match(filename)
+        if match:
+            path = os.path.join(MIGRATIONS_DIR, filename)
+            with open(path, "rb") as f:
+                checksum = hashlib.sha256(f.read()).hexdigest()
+            found.append((match.group(1), match.group(2), path, checksum))
+    return found
+
+
+def statements(path):
+    # split on ';' at the end of a line; the files hold plain DDL only
+    with open(path) as f:
+        lines = [line for line in f if not line.lstrip().startswith("--")]
+    return [s.strip() for s in re.split(r";\s*$", "".join(lines), flags=re.M) if s.strip()]
+
+
+def applied(store):
+    store.execute(SCHEMA_MIGRATIONS)
+    rows = store.fetch_all("SELECT version, name, checksum, applied_at FROM schema_migrations")
+    return {row["version"]: row for row in rows}
+
+
+def status(store):
+    done = applied(store)
+    report = []
+    for version, name, path, checksum in migrations():
+        row = done.get(version)
+        if row is None:
+            state = "pending"
+        elif row["checksum"] != checksum:
+            state = "changed"  # edited after it was applied; write a new migration instead
+        else:
+            state = "applied"
+        report.append({"version": version, "name": name, "state": state,
+                       "applied_at": row["applied_at"] if row else None})
+    return report
+
+
+def up(store):
+    done = applied(store)
+    ran = []
+    for version, name, path, checksum in migrations():
+        if version in done:
+            continue
+        print(f"Applying {version}_{name}")
+        for sql in statements(path):
+            store.execute(sql)
+        store.execute("INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                      (version, name, checksum))
+        store.commit()
+        ran.append(version)
+    return ran
+
+
+def verify(store, min_rows=VERIFY_MIN_ROWS):
+    # ([(name, [issues])] for every hot query whose plan scans a table or sorts, number checked)
+    failures = []
+    queries = hot_queries(store)
+    for name, sql, params, allowed in queries:
+        plan = store.explain(store.backend.translate(sql), params)
+        issues = store.backend.plan_issues(plan, min_rows, allow_scan="scan" in allowed,
+                                           allow_sort="sort" in allowed)
+        if issues:
+            failures.append((name, issues))
+    return failures, len(queries)
+
+
+def schema_problems(store):
+    problems = []
+    if store.backend.name == "mariadb":
+        for entry in status(store):
+            if entry["state"] != "applied":
+                problems.append(f"migration {entry['version']}_{entry['name']} is {entry['state']}")
+    failures, _ = verify(store)
+    for name, issues in failures:
+        problems.append(f"{name}: {'; '.join(issues)}")
+    return problems
+
+
+def startup_check(mode=MIGRATE_CHECK):
+    """Called once as the server starts: warn about (or, in strict mode,
+    refuse to start with) pending migrations and hot queries without an index."""
+    if mode == "off":
+        return []
+    try:
+        store = storage.connect()
+        try:
+            problems = schema_problems(store)
+        finally:
+            store.close()
+    except Exception as e:
+        problems = [f"could not check the schema: {e}"]
+    for problem in problems:
+        print("Schema check:", problem)
+    if problems and mode == "strict":
+        raise SystemExit("Schema check failed; run `python -m migrate up` / `python -m migrate verify`")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m migrate", description="Schema migrations")
+    parser.add_argument("command", choices=("up", "status", "verify"))
+    args = parser.parse_args(argv)
+
+    store = storage.connect()
+    try:
+        if args.command != "verify" and store.backend.name != "mariadb":
+            print(f"{store.backend.name}: the schema is applied from storage/sqlite_schema.sql on connect; "
+                  "nothing to migrate")
+            return 0
+        if args.command == "up":
+            ran = up(store)
+            print(f"Applied {len(ran)} migration(s)" if ran else "Schema is up to date")
+        elif args.command == "status":
+            entries = status(store)
+            for entry in entries:
+                print(f"{entry['version']}_{entry['name']:<28} {entry['state']:<8} {entry['applied_at'] or ''}")
+            return 1 if any(entry["state"] == "changed" for entry in entries) else 0
+        else:
+            failures, checked = verify(store)
+            for name, issues in failures:
+                print(f"{name}: {'; '.join(issues)}")
+            print(f"{checked - len(failures)}/{checked} hot queries use an index")
+            return 1 if failures else 0
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
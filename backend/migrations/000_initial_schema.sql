@@ -0,0 +1,48 @@
+-- The tables app.py was written against, as they were first created by hand.
+-- IF NOT EXISTS: on an existing database `python -m migrate up` only records it.
+CREATE TABLE IF NOT EXISTS users (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  username VARCHAR(100) NOT NULL,
+  password VARCHAR(255) NOT NULL,
+  full_name VARCHAR(150),
+  email VARCHAR(150),
+  phone VARCHAR(20)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS designation_master (
+  desig_id INT AUTO_INCREMENT PRIMARY KEY,
+  title VARCHAR(150) NOT NULL,
+  description VARCHAR(255),
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS department_master (
+  dept_id INT AUTO_INCREMENT PRIMARY KEY,
+  dept_name VARCHAR(150) NOT NULL,
+  description VARCHAR(255),
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS employee_master (
+  emp_id INT AUTO_INCREMENT PRIMARY KEY,
+  emp_name VARCHAR(150) NOT NULL,
+  emp_email VARCHAR(150),
+  emp_phone VARCHAR(20),
+  emp_designation VARCHAR(100),
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- DELETE /employees/<id> relies on the cascade to drop the employee's leaves
+CREATE TABLE IF NOT EXISTS leave_requests (
+  leave_id INT AUTO_INCREMENT PRIMARY KEY,
+  emp_id INT NOT NULL,
+  leave_type VARCHAR(50) NOT NULL,
+  start_date DATE NOT NULL,
+  end_date DATE NOT NULL,
+  reason TEXT,
+  status VARCHAR(20) NOT NULL DEFAULT 'pending',
+  applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  updated_at TIMESTAMP NULL DEFAULT NULL,
+  CONSTRAINT fk_leave_employee FOREIGN KEY (emp_id)
+    REFERENCES employee_master (emp_id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
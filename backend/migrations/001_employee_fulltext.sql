@@ -0,0 +1,5 @@
+-- FULLTEXT index backing GET /employees?search_mode=fulltext.
+-- Note: InnoDB ignores words shorter than innodb_ft_min_token_size (default 3)
+-- unless the server is configured otherwise; search_mode=ngram has no such limit.
+ALTER TABLE employee_master
+  ADD FULLTEXT INDEX IF NOT EXISTS ft_employee_search (emp_name, emp_email, emp_designation);
@@ -0,0 +1,9 @@
+-- Indexes for GET /leaves: keyset pagination on leave_id combined with the
+-- emp_id / status / leave_type filters and the start_date/end_date overlap window.
+-- InnoDB appends the primary key (leave_id) to every secondary index, so each
+-- equality filter below can walk leave_id in order without a filesort
+-- (status alone uses idx_leave_status_type and sorts that status's rows).
+CREATE INDEX IF NOT EXISTS idx_leave_emp_dates ON leave_requests (emp_id, start_date, end_date);
+CREATE INDEX IF NOT EXISTS idx_leave_type ON leave_requests (leave_type);
+CREATE INDEX IF NOT EXISTS idx_leave_status_type ON leave_requests (status, leave_type);
+CREATE INDEX IF NOT EXISTS idx_leave_dates ON leave_requests (start_date, end_date);
@@ -0,0 +1,9 @@
+-- Row versions for optimistic concurrency on PUT/PATCH/DELETE /employees/<id>
+-- and /leaves/<id>: every write bumps `version`, which is served as the ETag
+-- and checked against If-Match (412 on mismatch).
+ALTER TABLE employee_master
+  ADD COLUMN IF NOT EXISTS version INT UNSIGNED NOT NULL DEFAULT 1,
+  ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP NULL DEFAULT NULL;
+
+ALTER TABLE leave_requests
+  ADD COLUMN IF NOT EXISTS version INT UNSIGNED NOT NULL DEFAULT 1;
@@ -0,0 +1,25 @@
+-- Indexes for the hot queries listed in migrate.py (`python -m migrate verify`).
+
+-- POST /login and GET /me look users up by name; it must also be unique.
+-- Remove duplicate usernames first if this fails.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_username ON users (username);
+
+-- GET /employees and /employees/export: ORDER BY <sort_by>, emp_id for every
+-- column in EMPLOYEE_SORT_COLUMNS (emp_id is the primary key), by offset or
+-- keyset. Each index leads with its sort column and carries the other listed
+-- columns, and InnoDB appends emp_id, so a page (or a LIKE filter, which
+-- cannot seek) is read from the index alone in sort order.
+CREATE INDEX IF NOT EXISTS idx_emp_sort_name
+  ON employee_master (emp_name, emp_email, emp_phone, emp_designation, created_at);
+CREATE INDEX IF NOT EXISTS idx_emp_sort_email
+  ON employee_master (emp_email, emp_name, emp_phone, emp_designation, created_at);
+CREATE INDEX IF NOT EXISTS idx_emp_sort_phone
+  ON employee_master (emp_phone, emp_name, emp_email, emp_designation, created_at);
+CREATE INDEX IF NOT EXISTS idx_emp_sort_designation
+  ON employee_master (emp_designation, emp_name, emp_email, emp_phone, created_at);
+CREATE INDEX IF NOT EXISTS idx_emp_sort_created
+  ON employee_master (created_at, emp_name, emp_email, emp_phone, emp_designation);
+
+-- GET /leaves?emp_id= (alone or with status / leave_type): the employee's
+-- leaves in leave_id order, where idx_leave_emp_dates would need a sort.
+CREATE INDEX IF NOT EXISTS idx_leave_emp ON leave_requests (emp_id);
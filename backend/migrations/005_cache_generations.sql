@@ -0,0 +1,11 @@
+-- Generation stamps for the per-process caches (cache.Generations): a write
+-- bumps its cache's row and the other gunicorn workers drop their copy when
+-- they see the new value.
+CREATE TABLE IF NOT EXISTS cache_generations (
+  name VARCHAR(50) PRIMARY KEY,
+  generation BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  changed_at DOUBLE NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+INSERT IGNORE INTO cache_generations (name) VALUES
+  ('designations'), ('departments'), ('employee_counts'), ('profiles');
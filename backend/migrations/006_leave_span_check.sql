@@ -0,0 +1,24 @@
+-- GET /leaves?start_date= only searches start_dates within 366 days of the
+-- window (idx_leave_dates), so no leave may be longer than that: split the
+-- longer ones into consecutive 366-day requests, then enforce the limit.
+-- The INSERT and UPDATE commit together when the ALTER starts.
+INSERT INTO leave_requests (emp_id, leave_type, start_date, end_date, reason, status, applied_at, updated_at)
+SELECT l.emp_id, l.leave_type, p.part_start, LEAST(l.end_date, p.part_start + INTERVAL 365 DAY),
+       l.reason, l.status, l.applied_at, l.updated_at
+FROM (
+  WITH RECURSIVE parts (leave_id, part_start, end_date) AS (
+    SELECT leave_id, start_date + INTERVAL 366 DAY, end_date FROM leave_requests
+    WHERE DATEDIFF(end_date, start_date) >= 366
+    UNION ALL
+    SELECT leave_id, part_start + INTERVAL 366 DAY, end_date FROM parts
+    WHERE part_start + INTERVAL 366 DAY <= end_date
+  )
+  SELECT leave_id, part_start FROM parts
+) p
+JOIN leave_requests l ON l.leave_id = p.leave_id;
+
+UPDATE leave_requests SET end_date = start_date + INTERVAL 365 DAY
+WHERE DATEDIFF(end_date, start_date) >= 366;
+
+ALTER TABLE leave_requests DROP CONSTRAINT IF EXISTS chk_leave_span;
+ALTER TABLE leave_requests ADD CONSTRAINT chk_leave_span CHECK (DATEDIFF(end_date, start_date) < 366);
@@ -0,0 +1,3 @@
+-- Generation stamp for the per-process leave index (leave_index.py): leave
+-- writes bump it, so the other workers reload their copy.
+INSERT IGNORE INTO cache_generations (name) VALUES ('leaves');
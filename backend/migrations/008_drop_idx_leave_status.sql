@@ -0,0 +1,4 @@
+-- idx_leave_status_type (status, leave_type) answers every status-only lookup,
+-- so idx_leave_status only cost writes. 002 no longer creates it; this drops it
+-- where an earlier 002 did.
+DROP INDEX IF EXISTS idx_leave_status ON leave_requests;
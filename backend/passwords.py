@@ -0,0 +1,109 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import bcrypt
+
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", 12))
+HASH_WORKERS = int(os.environ.get("HASH_WORKERS", os.cpu_count() or 2))
+HASH_QUEUE_DEPTH = int(os.environ.get("HASH_QUEUE_DEPTH", HASH_WORKERS * 4))  # waiting jobs beyond the busy workers
+HASH_TIMEOUT = float(os.environ.get("HASH_TIMEOUT", 10))
+
+
+class HashPoolSaturated(Exception):
+    pass
+
+
+class HashPool:
+    """Bounded worker pool for bcrypt work.
+
+    bcrypt releases the GIL, so plain threads give real parallelism while the
+    request threads stay free.  At most ``workers + queue_depth`` jobs are
+    admitted; beyond that callers get HashPoolSaturated straight away instead
+    of piling up behind a slow queue, and so does a caller whose job is not
+    done within ``timeout``.
+    """
+
+    def __init__(self, workers=HASH_WORKERS, queue_depth=HASH_QUEUE_DEPTH, timeout=HASH_TIMEOUT):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(workers + queue_depth)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timed_out = 0
+
+    def _done(self, _future):
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+        self._slots.release()
+
+    def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HashPoolSaturated("password hashing pool is saturated")
+        with self._lock:
+            self._pending += 1
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._done)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            future.cancel()  # still queued: don't hash for a caller that gave up
+            with self._lock:
+                self._timed_out += 1
+            raise HashPoolSaturated(f"password hashing took longer than {self.timeout:g}s")
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_depth": self.queue_depth,
+                "pending": self._pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+            }
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_hash_pool():
+    # executor threads don't survive fork(); build one per process
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is None or _pool_pid != pid:
+        with _pool_lock:
+            if _pool is None or _pool_pid != pid:
+                _pool = HashPool()
+                _pool_pid = pid
+    return _pool
+
+
+def check_password(password, stored_hash):
+    return get_hash_pool().run(bcrypt.checkpw, password, stored_hash)
+
+
+def hash_password(password, rounds=BCRYPT_ROUNDS):
+    return get_hash_pool().run(lambda: bcrypt.hashpw(password, bcrypt.gensalt(rounds)))
+
+
+def hash_rounds(stored_hash):
+    # "$2b$12$..." -> 12
+    try:
+        return int(stored_hash.split(b"$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def needs_rehash(stored_hash, rounds=BCRYPT_ROUNDS):
+    return hash_rounds(stored_hash) != rounds
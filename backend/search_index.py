@@ -0,0 +1,244 @@
+import os
+import re
+import threading
+import time
+from array import array
+
+SEARCH_INDEX_MAX_AGE = float(os.environ.get("SEARCH_INDEX_MAX_AGE", 300))  # seconds before a full reload
+
+# field order matches the tuple stored per document; weights feed the relevance score
+SEARCH_FIELDS = ("emp_name", "emp_designation", "emp_email")
+FIELD_WEIGHTS = (3, 2, 1)
+
+_word_re = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text):
+    return _word_re.findall((text or "").lower())
+
+
+def _normalize(text):
+    # " word word " so " term" / " term " lookups find word prefixes / whole words
+    return " " + " ".join(tokenize(text)) + " "
+
+
+def _doc_grams(fields):
+    grams = set()
+    for field in fields:
+        for word in field.split():
+            padded = "  " + word
+            for i in range(len(padded) - 2):
+                grams.add(padded[i:i + 3])
+    return grams
+
+
+def _term_grams(term):
+    if len(term) < 3:
+        # short terms only match word prefixes: "  a", " ab"
+        return [("  " + term)[-3:]]
+    return [term[i:i + 3] for i in range(len(term) - 2)]
+
+
+class TrigramIndex:
+    """In-process trigram inverted index over employee name / designation / email.
+
+    Every query term must occur in the document (terms under three characters
+    must start a word).  Hits are ranked by where each term matched: whole
+    word > word prefix > substring, weighted by field.  Postings are append-only
+    arrays; removed or re-added documents leave garbage that is compacted once
+    it outgrows a quarter of the live documents.  Ranked results are memoised
+    per query until the next write, so paging through one search is cheap.
+
+    The employee write endpoints keep it current and bump the
+    "employee_counts" cache generation, which invalidates the other workers'
+    copies; it is also reloaded once older than ``max_age``.  A reload is built beside the live index and swapped in, with
+    the writes made meanwhile replayed on top, so searches and writes never
+    wait for it.
+    """
+
+    RESULT_CACHE_SIZE = 256
+
+    def __init__(self, max_age=SEARCH_INDEX_MAX_AGE):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._docs = {}
+        self._postings = {}
+        self._garbage = 0
+        self._results = {}
+        self._journal = None  # [(emp_id, fields or None)] written during a rebuild
+        self._loaded_at = None
+        self._stale_marks = 0
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._docs)
+
+    @property
+    def fresh(self):
+        loaded_at = self._loaded_at
+        return loaded_at is not None and time.monotonic() - loaded_at <= self.max_age
+
+    def _index(self, emp_id, fields):
+        self._results.clear()
+        self._docs[emp_id] = fields
+        for gram in _doc_grams(fields):
+            posting = self._postings.get(gram)
+            if posting is None:
+                posting = self._postings[gram] = array("I")
+            posting.append(emp_id)
+
+    def add(self, emp_id, row):
+        fields = tuple(_normalize(row.get(f)) for f in SEARCH_FIELDS)
+        with self._lock:
+            self._write(emp_id, fields)
+
+    def remove(self, emp_id):
+        with self._lock:
+            self._write(emp_id, None)
+
+    def _write(self, emp_id, fields):
+        # fields None removes; a rebuild in progress replays it on the new index
+        if self._journal is not None:
+            self._journal.append((emp_id, fields))
+        elif not self.loaded:
+            return  # the first load will read it from the table
+        self._apply(emp_id, fields)
+
+    def _apply(self, emp_id, fields):
+        if emp_id in self._docs:
+            self._garbage += 1
+            if fields is None:
+                del self._docs[emp_id]
+                self._results.clear()
+        if fields is not None:
+            self._index(emp_id, fields)
+        self._maybe_compact()
+
+    def _maybe_compact(self):
+        if self._garbage <= max(1000, len(self._docs) // 4):
+            return
+        docs = self._docs
+        self._docs = {}
+        self._postings = {}
+        self._garbage = 0
+        for emp_id, fields in docs.items():
+            self._index(emp_id, fields)
+
+    def rebuild(self, rows):
+        # index rows into a new instance without holding the lock, then swap
+        with self._lock:
+            self._journal = []
+            marks = self._stale_marks
+        try:
+            new = TrigramIndex()
+            for row in rows:
+                new._index(row["emp_id"], tuple(_normalize(row.get(f)) for f in SEARCH_FIELDS))
+            with self._lock:
+                self._docs = new._docs
+                self._postings = new._postings
+                self._garbage = 0
+                self._results.clear()
+                for emp_id, fields in self._journal:
+                    self._apply(emp_id, fields)
+                # invalidated while building: the rows read may predate that change
+                self._loaded_at = time.monotonic() if self._stale_marks == marks else None
+                self.loaded = True
+        finally:
+            with self._lock:
+                self._journal = None
+
+    def invalidate(self):
+        # reload on the next search; the current entries are served until then
+        with self._lock:
+            self._loaded_at = None
+            self._stale_marks += 1
+
+    def search(self, q):
+        """Return [(emp_id, score)] ordered by score desc, emp_id desc."""
+        terms = tokenize(q)
+        if not terms:
+            return []
+
+        key = " ".join(terms)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                return cached
+
+            # walk the rarest gram's posting list and verify each candidate
+            shortest = None
+            for term in terms:
+                for gram in _term_grams(term):
+                    posting = self._postings.get(gram)
+                    if posting is None:
+                        return []
+                    if shortest is None or len(posting) < len(shortest):
+                        shortest = posting
+
+            hits = []
+            seen = set()
+            docs = self._docs
+            for emp_id in shortest:
+                if emp_id in seen:
+                    continue
+                seen.add(emp_id)
+                fields = docs.get(emp_id)
+                if fields is None:
+                    continue
+                score = _score(fields, terms)
+                if score:
+                    hits.append((emp_id, score))
+
+            hits.sort(key=lambda h: (-h[1], -h[0]))
+            if len(self._results) >= self.RESULT_CACHE_SIZE:
+                self._results.pop(next(iter(self._results)))
+            self._results[key] = hits
+        return hits
+
+
+def _score(fields, terms):
+    total = 0
+    for term in terms:
+        word = " " + term + " "
+        prefix = " " + term
+        best = 0
+        for field, weight in zip(fields, FIELD_WEIGHTS):
+            if word in field:
+                s = 3 * weight
+            elif prefix in field:
+                s = 2 * weight
+            elif len(term) >= 3 and term in field:
+                s = weight
+            else:
+                continue
+            if s > best:
+                best = s
+        if not best:
+            return 0
+        total += best
+    return total
+
+
+def fulltext_query(q):
+    # "+term*" per word: every term required, prefix-matched (BOOLEAN MODE)
+    return " ".join(f"+{t}*" for t in tokenize(q))
+
+
+employee_index = TrigramIndex()
+
+
+def ensure_loaded(store):
+    if employee_index.fresh:
+        return employee_index
+    # one reload at a time; once there is an index, other searches use it meanwhile
+    if not employee_index._build_lock.acquire(blocking=not employee_index.loaded):
+        return employee_index
+    try:
+        if not employee_index.fresh:
+            batches = store.stream("SELECT emp_id, emp_name, emp_email, emp_designation FROM employee_master",
+                                   dictionary=True)
+            employee_index.rebuild(row for batch in batches for row in batch)
+    finally:
+        employee_index._build_lock.release()
+    return employee_index
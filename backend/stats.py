@@ -0,0 +1,147 @@
+import os
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime
+
+STATS_MAX_AGE = float(os.environ.get("DASHBOARD_STATS_MAX_AGE", 300))  # seconds before a full recompute
+HIRE_MONTHS = 12
+
+
+def _month(value):
+    if value is None:
+        value = datetime.now()
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return f"{value.year:04d}-{value.month:02d}"
+
+
+def _recent_months(n, today=None):
+    today = today or date.today()
+    year, month = today.year, today.month
+    months = []
+    for _ in range(n):
+        months.append(f"{year:04d}-{month:02d}")
+        month -= 1
+        if month == 0:
+            year, month = year - 1, 12
+    return months[::-1]
+
+
+class DashboardStats:
+    """In-memory dashboard aggregates.
+
+    Loaded with one set of GROUP BY queries, then kept current by the write
+    endpoints through the ``*_added`` / ``*_removed`` / ``leave_changed``
+    hooks.  A full recompute happens when the snapshot is older than
+    ``max_age`` (which also bounds drift from writes made outside this
+    process) or when a refresh is forced.
+    """
+
+    def __init__(self, max_age=STATS_MAX_AGE):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._employees = 0
+        self._departments = 0
+        self._designations = 0
+        self._hires = Counter()   # "YYYY-MM" -> employees created that month
+        self._leaves = Counter()  # (status, leave_type) -> count
+
+    def mark_stale(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def load(self, store):
+        employees = store.fetch_value("SELECT COUNT(*) FROM employee_master")
+        departments = store.fetch_value("SELECT COUNT(*) FROM department_master")
+        designations = store.fetch_value("SELECT COUNT(*) FROM designation_master")
+        hires = Counter()
+        for year, month, count in store.fetch_all("""
+          SELECT YEAR(created_at), MONTH(created_at), COUNT(*)
+          FROM employee_master
+          GROUP BY YEAR(created_at), MONTH(created_at)
+        """, dictionary=False):
+            if year is not None:
+                hires[f"{int(year):04d}-{int(month):02d}"] = count
+        leaves = Counter({(status, leave_type): count for status, leave_type, count in store.fetch_all("""
+          SELECT status, leave_type, COUNT(*)
+          FROM leave_requests
+          GROUP BY status, leave_type
+        """, dictionary=False)})
+
+        with self._lock:
+            self._employees = employees
+            self._departments = departments
+            self._designations = designations
+            self._hires = hires
+            self._leaves = leaves
+            self._loaded_at = time.monotonic()
+
+    def _adjust(self, fn):
+        # incremental updates only make sense on top of a loaded snapshot
+        with self._lock:
+            if self._loaded_at is not None:
+                fn()
+
+    def employee_added(self, created_at=None, count=1):
+        def apply():
+            self._employees += count
+            self._hires[_month(created_at)] += count
+        self._adjust(apply)
+
+    def department_added(self, delta=1):
+        def apply():
+            self._departments += delta
+        self._adjust(apply)
+
+    def designation_added(self, delta=1):
+        def apply():
+            self._designations += delta
+        self._adjust(apply)
+
+    def leave_added(self, leave_type, status="pending"):
+        def apply():
+            self._leaves[(status, leave_type)] += 1
+        self._adjust(apply)
+
+    def leave_removed(self, leave_type, status):
+        def apply():
+            self._leaves[(status, leave_type)] -= 1
+        self._adjust(apply)
+
+    def leave_changed(self, leave_type, old_status, new_status, new_type=None):
+        def apply():
+            self._leaves[(old_status, leave_type)] -= 1
+            self._leaves[(new_status, new_type or leave_type)] += 1
+        self._adjust(apply)
+
+    def snapshot(self, store, refresh=False):
+        with self._lock:
+            loaded_at = self._loaded_at
+        if refresh or loaded_at is None or time.monotonic() - loaded_at > self.max_age:
+            self.load(store)
+
+        with self._lock:
+            by_status = Counter()
+            by_type = Counter()
+            for (status, leave_type), count in self._leaves.items():
+                if count:
+                    by_status[status] += count
+                    by_type[leave_type] += count
+            return {
+                "total_employees": self._employees,
+                "total_departments": self._departments,
+                "total_designations": self._designations,
+                "pending_approvals": by_status.get("pending", 0),
+                "monthly_hires": [
+                    {"month": m, "count": self._hires.get(m, 0)} for m in _recent_months(HIRE_MONTHS)
+                ],
+                "leaves_by_status": dict(by_status),
+                "leaves_by_type": [{"name": t, "value": c} for t, c in sorted(by_type.items(), key=lambda i: str(i[0]))],
+                "age_seconds": round(time.monotonic() - self._loaded_at, 3),
+                "max_age_seconds": self.max_age,
+            }
+
+
+dashboard_stats = DashboardStats()
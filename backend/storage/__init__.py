@@ -0,0 +1,49 @@
+"""Storage backends.
+
+The route handlers talk to a :class:`Store` (one pooled connection plus query
+helpers) and never to a driver directly.  ``DB_BACKEND`` picks the engine:
+
+* ``mariadb`` (default): DB_HOST, DB_PORT, DB_USER, DB_PASSWORD, DB_NAME
+* ``sqlite``: embedded, WAL mode, file at SQLITE_PATH; the schema is created
+  on first connect, so single-node deployments and CI benchmarks need no
+  database server
+"""
+import os
+import threading
+
+from storage.base import Store
+
+DB_BACKEND = os.environ.get("DB_BACKEND", "mariadb").lower()
+BACKENDS = ("mariadb", "sqlite")
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def create_backend(name=DB_BACKEND, **options):
+    # drivers are imported only for the engine in use
+    if name == "mariadb":
+        from storage.mariadb_backend import MariaDBBackend
+        return MariaDBBackend(**options)
+    if name == "sqlite":
+        from storage.sqlite_backend import SQLiteBackend
+        return SQLiteBackend(**options)
+    raise ValueError(f"Unknown DB_BACKEND {name!r}, expected one of {', '.join(BACKENDS)}")
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend()
+    return _backend
+
+
+def connect(backend=None):
+    # A Store on a fresh, unpooled connection, for scripts and benchmarks
+    backend = backend or get_backend()
+    return Store(backend, backend.connect())
+
+
+__all__ = ["BACKENDS", "DB_BACKEND", "Store", "connect", "create_backend", "get_backend"]
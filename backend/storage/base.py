@@ -0,0 +1,107 @@
+import metrics
+
+
+class Store:
+    """A database connection plus the query helpers the route handlers use.
+
+    SQL is written once in the MariaDB dialect (``%s`` placeholders,
+    ``NOW()``); the backend rewrites it for its own engine.  Rows come back
+    as dicts unless ``dictionary=False``.
+    """
+
+    def __init__(self, backend, conn):
+        self.backend = backend
+        self.conn = conn
+        self.lastrowid = None
+
+    @property
+    def supports_fulltext(self):
+        return self.backend.supports_fulltext
+
+    def cursor(self, dictionary=False, buffered=True):
+        cur = self.backend.cursor(self.conn, dictionary, buffered)
+        return metrics.instrument(cur, self.explain, buffered)
+
+    def _run(self, sql, params, dictionary, buffered=True):
+        cur = self.cursor(dictionary, buffered)
+        cur.execute(self.backend.translate(sql), params)
+        return cur
+
+    def fetch_all(self, sql, params=(), dictionary=True):
+        cur = self._run(sql, params, dictionary)
+        try:
+            return cur.fetchall()
+        finally:
+            cur.close()
+
+    def fetch_one(self, sql, params=(), dictionary=True):
+        cur = self._run(sql, params, dictionary)
+        try:
+            return cur.fetchone()
+        finally:
+            cur.close()
+
+    def fetch_value(self, sql, params=()):
+        row = self.fetch_one(sql, params, dictionary=False)
+        return row[0] if row else None
+
+    def execute(self, sql, params=()):
+        # returns the affected row count; the new id is left in self.lastrowid
+        cur = self._run(sql, params, dictionary=False)
+        try:
+            self.lastrowid = cur.lastrowid
+            return cur.rowcount
+        finally:
+            cur.close()
+
+    def execute_many(self, sql, seq_params):
+        cur = self.cursor()
+        try:
+            cur.executemany(self.backend.translate(sql), seq_params)
+            return cur.rowcount
+        finally:
+            cur.close()
+
+    def stream(self, sql, params=(), batch_size=1000, dictionary=False):
+        # Unbuffered: rows are pulled from the server batch by batch instead
+        # of materialising the whole result set client-side.
+        cur = self._run(sql, params, dictionary, buffered=False)
+        try:
+            while True:
+                batch = cur.fetchmany(batch_size)
+                if not batch:
+                    break
+                yield batch
+        finally:
+            cur.close()
+
+    def lock_row(self, table, key_column, key):
+        # Start a transaction that holds a write lock on one row (MariaDB:
+        # SELECT ... FOR UPDATE; SQLite: the database write lock) until
+        # commit/rollback, so a check-then-write by two requests can't
+        # interleave. Ends any transaction already open first, so the reads
+        # after it see what others committed. False when the row is missing.
+        self.conn.commit()
+        return self.backend.lock_row(self, table, key_column, key)
+
+    def approx_count(self, table):
+        # cheap row estimate from the engine's statistics, or None
+        return self.backend.approx_count(self, table)
+
+    def explain(self, sql, params=()):
+        # sql is already in the backend's dialect (called from the slow-query log)
+        cur = self.backend.cursor(self.conn, True, True)
+        try:
+            cur.execute(self.backend.explain_prefix + sql, params)
+            return cur.fetchall()
+        finally:
+            cur.close()
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,58 @@
+import os
+
+import mariadb
+
+DB_CONFIG = {
+    "user": os.environ.get("DB_USER", "root"),
+    "password": os.environ.get("DB_PASSWORD", "root123"),
+    "host": os.environ.get("DB_HOST", "127.0.0.1"),
+    "port": int(os.environ.get("DB_PORT", 3306)),
+    "database": os.environ.get("DB_NAME", "reactloginapp"),
+}
+
+
+class MariaDBBackend:
+    name = "mariadb"
+    Error = mariadb.Error
+    supports_fulltext = True
+    explain_prefix = "EXPLAIN "
+
+    def __init__(self, config=None):
+        self.config = config or DB_CONFIG
+
+    def connect(self):
+        return mariadb.connect(**self.config)
+
+    def ping(self, conn):
+        conn.ping()
+
+    def cursor(self, conn, dictionary=False, buffered=True):
+        return conn.cursor(dictionary=dictionary, buffered=buffered)
+
+    def translate(self, sql):
+        return sql
+
+    def lock_row(self, store, table, key_column, key):
+        return store.fetch_one(f"SELECT {key_column} FROM {table} WHERE {key_column} = %s FOR UPDATE",
+                               (key,)) is not None
+
+    def approx_count(self, store, table):
+        # InnoDB's table statistics: free, but only an estimate
+        row = store.fetch_one("""
+          SELECT TABLE_ROWS AS total FROM information_schema.TABLES
+          WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """, (table,))
+        return row["total"] if row else None
+
+    def plan_issues(self, plan, min_rows=0, allow_scan=False, allow_sort=False):
+        # EXPLAIN rows; the optimiser scans small tables on purpose, so only
+        # steps estimated at min_rows or more count
+        issues = []
+        for row in plan:
+            if (row["rows"] or 0) < min_rows:
+                continue
+            if row["type"] == "ALL" and not allow_scan:
+                issues.append(f"full scan of {row['table']}")
+            if "Using filesort" in (row["Extra"] or "") and not allow_sort:
+                issues.append(f"filesort on {row['table']}")
+        return issues
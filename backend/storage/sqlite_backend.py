@@ -0,0 +1,116 @@
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, datetime
+from functools import lru_cache
+
+SQLITE_PATH = os.environ.get("SQLITE_PATH", "reactloginapp.db")
+SQLITE_BUSY_TIMEOUT = float(os.environ.get("SQLITE_BUSY_TIMEOUT", 5))  # seconds a writer waits for the lock
+SCHEMA_FILE = os.path.join(os.path.dirname(__file__), "sqlite_schema.sql")
+
+# Columns added after a table's first version (see migrations/), for files
+# created before them. CREATE TABLE IF NOT EXISTS leaves existing tables as they are.
+ADDED_COLUMNS = (
+    ("employee_master", "updated_at", "TIMESTAMP"),
+    ("employee_master", "version", "INTEGER NOT NULL DEFAULT 1"),
+    ("leave_requests", "version", "INTEGER NOT NULL DEFAULT 1"),
+)
+
+# Dates are stored as ISO text and parsed back by declared column type, so
+# rows carry the same date/datetime values the mariadb driver returns.
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(sep=" "))
+sqlite3.register_converter("DATE", lambda raw: date.fromisoformat(raw.decode()[:10]))
+sqlite3.register_converter("TIMESTAMP", lambda raw: datetime.fromisoformat(raw.decode()))
+sqlite3.register_converter("DATETIME", lambda raw: datetime.fromisoformat(raw.decode()))
+
+
+def _date_part(start, end):
+    # YEAR() / MONTH() over the ISO text of a DATE or TIMESTAMP column
+    def part(value):
+        if value is None:
+            return None
+        return int(str(value)[start:end])
+    return part
+
+
+def _dict_row(cursor, row):
+    return {col[0]: value for col, value in zip(cursor.description, row)}
+
+
+@lru_cache(maxsize=1024)
+def translate(sql):
+    return sql.replace("%s", "?").replace("NOW()", "datetime('now', 'localtime')")
+
+
+class SQLiteBackend:
+    """Embedded SQLite in WAL mode: readers never block the (single) writer."""
+
+    name = "sqlite"
+    Error = sqlite3.Error
+    supports_fulltext = False
+    explain_prefix = "EXPLAIN QUERY PLAN "
+
+    def __init__(self, path=None):
+        self.path = path or SQLITE_PATH
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def connect(self):
+        # pooled connections move between threads, one borrower at a time
+        conn = sqlite3.connect(self.path, timeout=SQLITE_BUSY_TIMEOUT,
+                               detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.create_function("YEAR", 1, _date_part(0, 4), deterministic=True)
+        conn.create_function("MONTH", 1, _date_part(5, 7), deterministic=True)
+        self._ensure_schema(conn)
+        return conn
+
+    def _ensure_schema(self, conn):
+        if self._schema_ready:
+            return
+        with self._schema_lock:
+            if not self._schema_ready:
+                with open(SCHEMA_FILE) as f:
+                    conn.executescript(f.read())
+                for table, column, decl in ADDED_COLUMNS:
+                    columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                    if column not in columns:
+                        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+                conn.commit()
+                self._schema_ready = True
+
+    def lock_row(self, store, table, key_column, key):
+        # no row locks: take the database's write lock now rather than at the first write
+        store.execute("BEGIN IMMEDIATE")
+        return store.fetch_one(f"SELECT {key_column} FROM {table} WHERE {key_column} = %s", (key,)) is not None
+
+    def ping(self, conn):
+        conn.execute("SELECT 1")
+
+    def cursor(self, conn, dictionary=False, buffered=True):
+        # sqlite steps through results lazily either way, so `buffered` is moot
+        cur = conn.cursor()
+        if dictionary:
+            cur.row_factory = _dict_row
+        return cur
+
+    translate = staticmethod(translate)
+
+    def approx_count(self, store, table):
+        # no cheap statistics to read; callers fall back to a cached COUNT(*)
+        return None
+
+    def plan_issues(self, plan, min_rows=0, allow_scan=False, allow_sort=False):
+        # EXPLAIN QUERY PLAN rows; sqlite has no row estimates, so min_rows is moot
+        issues = []
+        for row in plan:
+            detail = row["detail"]
+            if re.fullmatch(r"SCAN \w+", detail) and not allow_scan:
+                issues.append(f"full scan of {detail[5:]}")
+            elif detail.startswith("USE TEMP B-TREE FOR ORDER BY") and not allow_sort:
+                issues.append("sorts the result")
+        return issues
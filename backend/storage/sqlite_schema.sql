@@ -0,0 +1,108 @@
+-- SQLite equivalent of the MariaDB schema (migrations/000_initial_schema.sql),
+-- including the indexes from the later migrations. Applied on first connect,
+-- so every statement is idempotent.
+-- Timestamps default to local time, like MariaDB's CURRENT_TIMESTAMP.
+CREATE TABLE IF NOT EXISTS users (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  username TEXT NOT NULL UNIQUE,
+  password TEXT NOT NULL,
+  full_name TEXT,
+  email TEXT,
+  phone TEXT
+);
+
+CREATE TABLE IF NOT EXISTS designation_master (
+  desig_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  title TEXT NOT NULL,
+  description TEXT,
+  created_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE TABLE IF NOT EXISTS department_master (
+  dept_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  dept_name TEXT NOT NULL,
+  description TEXT,
+  created_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE TABLE IF NOT EXISTS employee_master (
+  emp_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  emp_name TEXT NOT NULL,
+  emp_email TEXT,
+  emp_phone TEXT,
+  emp_designation TEXT,
+  created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+  updated_at TIMESTAMP,
+  version INTEGER NOT NULL DEFAULT 1
+);
+
+CREATE TABLE IF NOT EXISTS leave_requests (
+  leave_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  emp_id INTEGER NOT NULL REFERENCES employee_master (emp_id) ON DELETE CASCADE,
+  leave_type TEXT NOT NULL,
+  start_date DATE NOT NULL,
+  end_date DATE NOT NULL,
+  reason TEXT,
+  status TEXT NOT NULL DEFAULT 'pending',
+  applied_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+  updated_at TIMESTAMP,
+  version INTEGER NOT NULL DEFAULT 1
+);
+
+-- 002_leave_request_indexes.sql; SQLite also appends the rowid (leave_id)
+CREATE INDEX IF NOT EXISTS idx_leave_emp_dates ON leave_requests (emp_id, start_date, end_date);
+DROP INDEX IF EXISTS idx_leave_status;  -- idx_leave_status_type covers status alone
+CREATE INDEX IF NOT EXISTS idx_leave_type ON leave_requests (leave_type);
+CREATE INDEX IF NOT EXISTS idx_leave_status_type ON leave_requests (status, leave_type);
+CREATE INDEX IF NOT EXISTS idx_leave_dates ON leave_requests (start_date, end_date);
+
+-- 004_query_indexes.sql (users.username is UNIQUE above); the rowid (emp_id,
+-- leave_id) is part of every index
+CREATE INDEX IF NOT EXISTS idx_emp_sort_name
+  ON employee_master (emp_name, emp_email, emp_phone, emp_designation, created_at);
+CREATE INDEX IF NOT EXISTS idx_emp_sort_email
+  ON employee_master (emp_email, emp_name, emp_phone, emp_designation, created_at);
+CREATE INDEX IF NOT EXISTS idx_emp_sort_phone
+  ON employee_master (emp_phone, emp_name, emp_email, emp_designation, created_at);
+CREATE INDEX IF NOT EXISTS idx_emp_sort_designation
+  ON employee_master (emp_designation, emp_name, emp_email, emp_phone, created_at);
+CREATE INDEX IF NOT EXISTS idx_emp_sort_created
+  ON employee_master (created_at, emp_name, emp_email, emp_phone, emp_designation);
+CREATE INDEX IF NOT EXISTS idx_leave_emp ON leave_requests (emp_id);
+
+-- 005_cache_generations.sql
+CREATE TABLE IF NOT EXISTS cache_generations (
+  name TEXT PRIMARY KEY,
+  generation INTEGER NOT NULL DEFAULT 0,
+  changed_at REAL NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO cache_generations (name) VALUES
+  ('designations'), ('departments'), ('employee_counts'), ('profiles');
+
+-- 006_leave_span_check.sql; SQLite cannot add a CHECK to an existing table,
+-- so triggers enforce the limit
+INSERT INTO leave_requests (emp_id, leave_type, start_date, end_date, reason, status, applied_at, updated_at)
+SELECT l.emp_id, l.leave_type, p.part_start, min(l.end_date, date(p.part_start, '+365 days')),
+       l.reason, l.status, l.applied_at, l.updated_at
+FROM (
+  WITH RECURSIVE parts (leave_id, part_start, end_date) AS (
+    SELECT leave_id, date(start_date, '+366 days'), end_date FROM leave_requests
+    WHERE julianday(end_date) - julianday(start_date) >= 366
+    UNION ALL
+    SELECT leave_id, date(part_start, '+366 days'), end_date FROM parts
+    WHERE date(part_start, '+366 days') <= end_date
+  )
+  SELECT leave_id, part_start FROM parts
+) p
+JOIN leave_requests l ON l.leave_id = p.leave_id;
+UPDATE leave_requests SET end_date = date(start_date, '+365 days')
+WHERE julianday(end_date) - julianday(start_date) >= 366;
+CREATE TRIGGER IF NOT EXISTS chk_leave_span_insert BEFORE INSERT ON leave_requests
+WHEN julianday(NEW.end_date) - julianday(NEW.start_date) >= 366
+BEGIN SELECT RAISE(ABORT, 'CHECK constraint failed: chk_leave_span'); END;
+CREATE TRIGGER IF NOT EXISTS chk_leave_span_update BEFORE UPDATE OF start_date, end_date ON leave_requests
+WHEN julianday(NEW.end_date) - julianday(NEW.start_date) >= 366
+BEGIN SELECT RAISE(ABORT, 'CHECK constraint failed: chk_leave_span'); END;
+
+-- 007_leave_index_generation.sql
+INSERT OR IGNORE INTO cache_generations (name) VALUES ('leaves');
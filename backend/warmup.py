@@ -0,0 +1,29 @@
+import os
+import time
+
+import db
+from app import app
+from search_index import ensure_loaded
+
+# build the trigram search index up front (slow on large tables, so opt-in)
+WARM_SEARCH_INDEX = os.environ.get("WARM_SEARCH_INDEX", "0") == "1"
+WARM_PATHS = ["/designations", "/departments", "/dashboard/stats"]
+
+
+def warm_up():
+    # Open the pool's min_size connections and fill the in-process caches so the
+    # first real requests hit a hot worker. Returns the time spent, in seconds.
+    started = time.perf_counter()
+    db.get_pool().prefill()
+
+    client = app.test_client()
+    for path in WARM_PATHS:
+        response = client.get(path)
+        if response.status_code >= 400:
+            print(f"Warm-up of {path} failed with {response.status_code}")
+
+    if WARM_SEARCH_INDEX:
+        with app.app_context():
+            ensure_loaded(db.get_db())
+
+    return time.perf_counter() - started
@@ -27,8 +27,17 @@ export default function EmployeeEdit() {
     setForm({ ...form, [e.target.name]: e.target.value });
 
   const updateData = async () => {
-    await axios.put(`http://127.0.0.1:5000/employees/${id}`, form);
-    nav("/employees");
+    try {
+      // If-Match: the API answers 412 instead of overwriting someone else's edit
+      await axios.put(`http://127.0.0.1:5000/employees/${id}`, form, {
+        headers: { "If-Match": `"${form.version}"` },
+      });
+      nav("/employees");
+    } catch (err) {
+      if (err?.response?.status !== 412) throw err;
+      alert("This employee was changed by someone else; the latest details have been loaded.");
+      setForm(err.response.data.current);
+    }
   };
 
   return (
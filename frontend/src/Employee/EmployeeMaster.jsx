@@ -101,29 +101,28 @@ export default function EmployeeMaster() {
   };
   
 
-  const exportToCsv = () => {
-    const csvRows = [];
-    // header
-    csvRows.push(["ID","Name","Email","Phone","Designation"]);
-    // data
-    employees.forEach(emp => {
-      csvRows.push([
-        emp.emp_id,
-        emp.emp_name,
-        emp.emp_email,
-        emp.emp_phone,
-        emp.emp_designation
-      ]);
-    });
-    // build csv string
-    const csvContent = csvRows.map(e => e.map(v => `"${v}"`).join(",")).join("\n");
-    const blob = new Blob([csvContent], { type: "text/csv;charset=utf-8;" });
-    const url = URL.createObjectURL(blob);
-
-    const link = document.createElement("a");
-    link.href = url;
-    link.setAttribute("download", "employees_export.csv");
-    link.click();
+  // full export is streamed by the server with the current search/filter/sort
+  const exportToCsv = async () => {
+    try {
+      const params = { format: "csv", sort_by: sortBy, order: sortOrder };
+      if (searchQ) params.q = searchQ;
+      else {
+        if (filterName) params.name = filterName;
+        if (filterEmail) params.email = filterEmail;
+        if (filterDesignation) params.designation = filterDesignation;
+      }
+
+      const res = await api.get("/employees/export", { params, responseType: "blob" });
+      const url = URL.createObjectURL(res.data);
+
+      const link = document.createElement("a");
+      link.href = url;
+      link.setAttribute("download", "employees_export.csv");
+      link.click();
+      URL.revokeObjectURL(url);
+    } catch (err) {
+      console.error("Export failed:", err);
+    }
   };
 
   // simple validation
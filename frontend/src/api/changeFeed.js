@@ -0,0 +1,35 @@
+import { useEffect, useRef } from "react";
+import api from "./axios";
+
+// Subscribe to the API's change feed (GET /events, Server-Sent Events).
+// onEvent gets {entity, action, data} for every write to the given entities;
+// onReset is called when events were missed (server restart, too far behind)
+// and the page should reload its list once. EventSource reconnects and
+// resumes from the last event id by itself.
+export function useChangeFeed(entities, onEvent, onReset) {
+  const handlers = useRef({ onEvent, onReset });
+  handlers.current = { onEvent, onReset };
+  const key = entities.join(",");
+
+  useEffect(() => {
+    const source = new EventSource(`${api.defaults.baseURL}/events?entity=${encodeURIComponent(key)}`);
+    source.onmessage = (e) => handlers.current.onEvent(JSON.parse(e.data));
+    source.addEventListener("reset", () => handlers.current.onReset?.());
+    return () => source.close();
+  }, [key]);
+}
+
+// Apply one change event to a list of rows keyed by `key` (newest first).
+export function applyChange(rows, event, key) {
+  const id = event.data[key];
+  switch (event.action) {
+    case "created":
+      return rows.some((r) => r[key] === id) ? rows : [event.data, ...rows];
+    case "updated":
+      return rows.map((r) => (r[key] === id ? { ...r, ...event.data } : r));
+    case "deleted":
+      return rows.filter((r) => r[key] !== id);
+    default:
+      return rows;
+  }
+}
@@ -45,29 +45,29 @@ export default function Dashboard() {
       <Grid container spacing={{ xs: 2, md: 3 }} columns={{ xs: 4, sm: 8, md: 12 }}>
         <Grid item xs={12} sm={6} md={4}>
           <Card><CardContent>
-            <Typography variant="h6">Total Users</Typography>
-            <Typography variant="h5">{stats.total_users}</Typography>
+            <Typography variant="h6">Employees</Typography>
+            <Typography variant="h5">{stats.total_employees}</Typography>
           </CardContent></Card>
         </Grid>
 
         <Grid item xs={12} sm={6} md={3}>
           <Card><CardContent>
-            <Typography variant="h6">Today's Sales</Typography>
-            <Typography variant="h5">{stats.today_sales}</Typography>
+            <Typography variant="h6">Departments</Typography>
+            <Typography variant="h5">{stats.total_departments}</Typography>
           </CardContent></Card>
         </Grid>
 
         <Grid item xs={12} sm={6} md={3}>
           <Card><CardContent>
-            <Typography variant="h6">Total Revenue</Typography>
-            <Typography variant="h5">₹{stats.total_revenue}</Typography>
+            <Typography variant="h6">Designations</Typography>
+            <Typography variant="h5">{stats.total_designations}</Typography>
           </CardContent></Card>
         </Grid>
 
         <Grid item xs={12} sm={6} md={3}>
           <Card><CardContent>
-            <Typography variant="h6">Pending Tasks</Typography>
-            <Typography variant="h5">{stats.pending_tasks}</Typography>
+            <Typography variant="h6">Pending Approvals</Typography>
+            <Typography variant="h5">{stats.pending_approvals}</Typography>
           </CardContent></Card>
         </Grid>
       </Grid>
@@ -81,14 +81,14 @@ export default function Dashboard() {
         {/* LINE CHART */}
         <Grid item xs={12} md={6}>
           <Card><CardContent>
-            <Typography variant="h6">Monthly Sales</Typography>
+            <Typography variant="h6">Monthly Hires</Typography>
             <ResponsiveContainer width="100%" height={300}>
-              <LineChart data={stats.monthly_sales.map((v, i) => ({ month: i+1, sales: v }))}>
+              <LineChart data={stats.monthly_hires}>
                 <CartesianGrid strokeDasharray="3 3" />
                 <XAxis dataKey="month" />
                 <YAxis />
                 <Tooltip />
-                <Line type="monotone" dataKey="sales" stroke="#8884d8" />
+                <Line type="monotone" dataKey="count" stroke="#8884d8" />
               </LineChart>
             </ResponsiveContainer>
           </CardContent></Card>
@@ -97,14 +97,14 @@ export default function Dashboard() {
         {/* BAR CHART */}
         <Grid item xs={12} md={6}>
           <Card><CardContent>
-            <Typography variant="h6">Users Joined Per Month</Typography>
+            <Typography variant="h6">Leaves By Status</Typography>
             <ResponsiveContainer width="100%" height={300}>
-              <BarChart data={stats.users_per_month.map((v, i) => ({ month: i+1, users: v }))}>
+              <BarChart data={Object.entries(stats.leaves_by_status).map(([status, count]) => ({ status, count }))}>
                 <CartesianGrid strokeDasharray="3 3" />
-                <XAxis dataKey="month" />
+                <XAxis dataKey="status" />
                 <YAxis />
                 <Tooltip />
-                <Bar dataKey="users" fill="#82ca9d" />
+                <Bar dataKey="count" fill="#82ca9d" />
               </BarChart>
             </ResponsiveContainer>
           </CardContent></Card>
@@ -113,11 +113,11 @@ export default function Dashboard() {
         {/* PIE CHART */}
         <Grid item xs={12} md={6}>
           <Card><CardContent>
-            <Typography variant="h6">Revenue Split</Typography>
+            <Typography variant="h6">Leaves By Type</Typography>
             <ResponsiveContainer width="100%" height={300}>
               <PieChart>
                 <Pie
-                  data={stats.revenue_split}
+                  data={stats.leaves_by_type}
                   dataKey="value"
                   nameKey="name"
                   cx="50%"
@@ -125,7 +125,7 @@ export default function Dashboard() {
                   outerRadius={100}
                   label
                 >
-                  {stats.revenue_split.map((entry, index) => (
+                  {stats.leaves_by_type.map((entry, index) => (
                     <Cell key={index} fill={COLORS[index % COLORS.length]} />
                   ))}
                 </Pie>
@@ -8,6 +8,7 @@ import {
 import EditIcon from "@mui/icons-material/Edit";
 import DeleteIcon from "@mui/icons-material/Delete";
 import api from "../api/axios";
+import { useChangeFeed, applyChange } from "../api/changeFeed";
 
 export default function DepartmentMaster() {
   const [list, setList] = useState([]);
@@ -23,6 +24,10 @@ export default function DepartmentMaster() {
 
   useEffect(() => { load(); }, []);
 
+  // other clients' writes arrive here; our own still refetch below, so the
+  // list is right even when the feed is down or lagging
+  useChangeFeed(["department"], (e) => setList((rows) => applyChange(rows, e, "dept_id")), load);
+
   const validate = () => {
     const err = {};
     if (!form.dept_name.trim()) err.dept_name = "Name is required";
@@ -9,6 +9,7 @@ import {
 import EditIcon from "@mui/icons-material/Edit";
 import DeleteIcon from "@mui/icons-material/Delete";
 import api from "../api/axios";
+import { useChangeFeed, applyChange } from "../api/changeFeed";
 
 export default function DesignationMaster() {
   const [designations, setDesignations] = useState([]);
@@ -30,6 +31,10 @@ export default function DesignationMaster() {
     load();
   }, []);
 
+  // other clients' writes arrive here; our own still refetch below, so the
+  // list is right even when the feed is down or lagging
+  useChangeFeed(["designation"], (e) => setDesignations((rows) => applyChange(rows, e, "desig_id")), load);
+
   const validate = () => {
     const temp = {};
     if (!form.title || form.title.trim() === "") temp.title = "Title is required";
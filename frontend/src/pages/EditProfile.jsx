@@ -12,9 +12,11 @@ import { getProfile } from "../services/profileService";
 import { updateProfile } from "../services/profileService";
 import MainLayout from "../layouts/MainLayout";
 import { useNavigate } from "react-router-dom";
+import { useAuth } from "../context/AuthContext";
 
 export default function EditProfile() {
   const navigate = useNavigate();
+  const { login } = useAuth();
   const [loading, setLoading] = useState(true);
   const [saving, setSaving] = useState(false);
 
@@ -52,6 +54,8 @@ export default function EditProfile() {
     const res = await updateProfile(form);
 
     if (res.status === "success") {
+      // the server re-issues the token because it carries the profile
+      if (res.token) login(res.token);
       setMessage("Profile updated successfully!");
       setTimeout(() => navigate("/profile"), 1200); // auto redirect
     } else {
@@ -20,6 +20,7 @@ import {
 } from "@mui/material";
 import DeleteIcon from "@mui/icons-material/Delete";
 import api from "../api/axios";
+import { useChangeFeed, applyChange } from "../api/changeFeed";
 
 // If using MUI X date pickers
 import { LocalizationProvider } from "@mui/x-date-pickers/LocalizationProvider";
@@ -28,6 +29,7 @@ import { DesktopDatePicker } from "@mui/x-date-pickers/DesktopDatePicker";
 
 export default function LeaveRequest() {
   const [leaves, setLeaves] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [form, setForm] = useState({
     emp_id: "",        // you may have a select dropdown instead
     leave_type: "",
@@ -38,10 +40,13 @@ export default function LeaveRequest() {
   const [errors, setErrors] = useState({});
   const [message, setMessage] = useState("");
 
-  const loadLeaves = async () => {
+  // /leaves is paginated newest-first; pass the last cursor to append the next page
+  const loadLeaves = async (after = null) => {
     try {
-      const res = await api.get("/leaves");
-      setLeaves(res.data);
+      const params = after ? { after } : {};
+      const res = await api.get("/leaves", { params });
+      setLeaves((prev) => (after ? [...prev, ...res.data.data] : res.data.data));
+      setNextCursor(res.data.next_cursor);
     } catch (err) {
       console.error("Failed to load leaves:", err);
     }
@@ -51,6 +56,13 @@ export default function LeaveRequest() {
     loadLeaves();
   }, []);
 
+  // other clients' writes arrive here; our own still refetch below, so the
+  // list is right even when the feed is down or lagging
+  useChangeFeed(["leave", "employee"], (e) => {
+    if (e.entity === "leave") setLeaves((rows) => applyChange(rows, e, "leave_id"));
+    else if (e.action === "deleted") setLeaves((rows) => rows.filter((r) => r.emp_id !== e.data.emp_id));
+  }, () => loadLeaves());
+
   const validate = () => {
     const temp = {};
     if (!form.emp_id) temp.emp_id = "Employee ID is required";
@@ -78,7 +90,8 @@ export default function LeaveRequest() {
       await loadLeaves();
     } catch (err) {
       console.error("Error submitting leave:", err);
-      setMessage("Failed to submit leave");
+      // 409: overlaps one of the employee's existing leave requests
+      setMessage(err?.response?.data?.message || "Failed to submit leave");
     }
     setTimeout(() => setMessage(""), 3000);
   };
@@ -224,6 +237,12 @@ export default function LeaveRequest() {
             </TableBody>
           </Table>
         </TableContainer>
+
+        {nextCursor && (
+          <Box mt={2} textAlign="center">
+            <Button variant="outlined" onClick={() => loadLeaves(nextCursor)}>Load more</Button>
+          </Box>
+        )}
       </Box>
     </MainLayout>
   );
@@ -8,5 +8,5 @@ export async function getProfile() {
 
 export async function updateProfile(data) {
   const res = await api.put("/profile/update", data);
-  return res.data; // {status, message}
+  return res.data; // {status, message, token}
 }